@@ -0,0 +1,317 @@
+"""
+Times the library's hot paths on realistic inputs::
+
+    python benchmarks/bench.py                       # run everything
+    python benchmarks/bench.py clip offset           # only matching names
+    python benchmarks/bench.py --json baseline.json  # save the results
+    python benchmarks/bench.py --compare baseline.json
+
+Each benchmark is run in batches, enough to take a little while, and the
+fastest of several batches is reported as the time per call, which is the
+figure least disturbed by whatever else the machine is doing. With
+``--compare``, each result is shown against the same benchmark in a
+previously saved file, and the exit status is 1 if any has slowed down by
+more than the ``--threshold`` ratio.
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+
+from beziers.cubicbezier import CubicBezier
+from beziers.path import BezierPath
+from beziers.path.geometricshapes import Circle, Rectangle
+from beziers.point import Point
+from beziers.utils.curvedistance import curveDistance
+from beziers.utils import numpy
+from beziers.utils.curvefitter import CurveFit, NumpyCurveFit, StreamingCurveFit
+
+# The benchmarks, as (name, setup function) pairs in the order they run.
+# The setup function builds the fixtures and returns the function to time.
+BENCHMARKS = []
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+
+    return register
+
+
+def smoothContour(points):
+    """Returns a closed path of cubics passing smoothly through `points`,
+    using Catmull-Rom tangents."""
+    segs = []
+    n = len(points)
+    for i in range(0, n):
+        p0, p1, p2, p3 = [points[(i + j) % n] for j in (-1, 0, 1, 2)]
+        segs.append(CubicBezier(p1, p1 + (p2 - p0) / 6.0, p2 - (p3 - p1) / 6.0, p2))
+    return BezierPath.fromSegments(segs)
+
+
+def glyphContour(segments=300, loops=0):
+    """A wobbly, glyph-sized closed contour with the given number of
+    segments. With `loops`, the outline winds round its centre that many
+    extra times, so it overlaps itself like an unprocessed variable font
+    outline."""
+    turns = 1 + loops
+    points = []
+    for i in range(0, segments):
+        a = 2 * math.pi * turns * i / segments
+        r = 300 + 40 * math.sin(7 * a / turns) + 15 * math.sin(23 * a) + 60 * loops
+        r -= 120 * loops * i / segments
+        points.append(Point(500 + r * math.cos(a), 400 + r * math.sin(a)))
+    return smoothContour(points)
+
+
+def pointCloud(count=2000, seed=1):
+    """Noisy samples along a stroke with a couple of sharp corners, like
+    the output of a pencil tool or a scanned outline."""
+    rnd = random.Random(seed)
+    points = []
+    for i in range(0, count):
+        t = i / float(count)
+        if t < 0.4:
+            p = Point(1000 * t, 200 * math.sin(8 * t))
+        elif t < 0.7:
+            p = Point(400 + 300 * (t - 0.4), 200 * math.sin(3.2) + 1000 * (t - 0.4))
+        else:
+            p = Point(490 - 1000 * (t - 0.7), 300 + 100 * math.cos(12 * t))
+        points.append(Point(p.x + rnd.gauss(0, 0.5), p.y + rnd.gauss(0, 0.5)))
+    return points
+
+
+def fresh(path):
+    """Returns a copy of `path` which shares no segment objects (and so no
+    cached lengths or bounds) with it, as if it had just been loaded."""
+    coords, verbs = path.asPacked()
+    return BezierPath.fromPacked(coords, verbs, path.closed)
+
+
+def _cubic():
+    return CubicBezier(Point(100, 25), Point(10, 90), Point(110, 100), Point(132, 192))
+
+
+@benchmark("cubic.pointAtTime")
+def _pointAtTime():
+    c = _cubic()
+    ts = [i / 100.0 for i in range(0, 101)]
+    return lambda: [c.pointAtTime(t) for t in ts]
+
+
+@benchmark("cubic.length")
+def _cubicLength():
+    c = _cubic()
+    # Segments cache their length, so time a fresh copy each time
+    return lambda: c.clone().length
+
+
+@benchmark("path.length")
+def _pathLength():
+    p = glyphContour()
+    return lambda: fresh(p).length
+
+
+@benchmark("path.regularSample")
+def _regularSample():
+    p = glyphContour()
+    return lambda: fresh(p).regularSample(500)
+
+
+@benchmark("cubic.intersections")
+def _intersections():
+    c1 = _cubic()
+    c2 = CubicBezier(Point(5, 150), Point(180, 20), Point(80, 250), Point(210, 190))
+    return lambda: c1.intersections(c2)
+
+
+@benchmark("path.getSelfIntersections")
+def _selfIntersections():
+    p = glyphContour(loops=1)
+    return p.getSelfIntersections
+
+
+@benchmark("path.removeOverlap")
+def _removeOverlap():
+    p = glyphContour(100, loops=1)
+    return lambda: fresh(p).removeOverlap()
+
+
+@benchmark("path.clip.circles")
+def _clipCircles():
+    a = Circle(200, origin=Point(0, 0))
+    b = Circle(200, origin=Point(150, 50))
+    return lambda: a.union(b)
+
+
+@benchmark("path.clip.glyph")
+def _clipGlyph():
+    a = glyphContour()
+    b = Rectangle(600, 300, origin=Point(500, 400))
+    return lambda: a.intersection(b)
+
+
+@benchmark("path.offset")
+def _offset():
+    p = glyphContour(60)
+    return lambda: p.offset(Point(10, 10))
+
+
+@benchmark("path.offset.tillerhanson")
+def _offsetTillerHanson():
+    p = glyphContour(60)
+    return lambda: p.offset(Point(10, 10), method="tillerhanson")
+
+
+@benchmark("CurveFit.fitCurve")
+def _fitCurve():
+    points = pointCloud()
+    return lambda: CurveFit.fitCurve(points, 50.0, 20.0, 200)
+
+
+@benchmark("StreamingCurveFit.stroke")
+def _streamingFit():
+    points = pointCloud(500)
+
+    def run():
+        fitter = StreamingCurveFit(50.0, 20.0)
+        for point in points:
+            fitter.addPoint(point)
+        return fitter.path
+
+    return run
+
+
+if numpy():
+
+    @benchmark("NumpyCurveFit.fitCurve")
+    def _numpyFitCurve():
+        points = pointCloud()
+        return lambda: NumpyCurveFit.fitCurve(points, 50.0, 20.0, 200)
+
+
+@benchmark("curveDistance")
+def _curveDistance():
+    c1 = _cubic()
+    c2 = CubicBezier(Point(309, 159), Point(178, 159), Point(215, 408), Point(309, 408))
+    return lambda: curveDistance(c1, c2)
+
+
+@benchmark("path.asNodelist")
+def _asNodelist():
+    p = glyphContour()
+    return lambda: fresh(p).asNodelist()
+
+
+@benchmark("path.fromNodelist")
+def _fromNodelist():
+    nodes = glyphContour().asNodelist()
+    return lambda: BezierPath.fromNodelist(nodes).asSegments()
+
+
+@benchmark("path.asPacked")
+def _asPacked():
+    segs = glyphContour().asSegments()
+    return lambda: BezierPath.fromSegments(segs).asPacked()
+
+
+def timeIt(function, minTime=0.2, repeat=5):
+    """Returns the fastest time per call of `function`, over `repeat` batches
+    of calls each taking at least `minTime` seconds."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(0, number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= minTime:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(minTime / elapsed * 1.2))
+    best = elapsed / number
+    for _ in range(1, repeat):
+        start = time.perf_counter()
+        for _ in range(0, number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _format(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return "%8.2f %-2s" % (seconds / scale, unit)
+    return "%8.2f ns" % (seconds / 1e-9)
+
+
+def run(names=None, minTime=0.2, repeat=5, out=sys.stdout):
+    """Runs the benchmarks whose names contain any of `names` (or all of
+    them), returning a dictionary of times per call in seconds."""
+    results = {}
+    for name, setup in BENCHMARKS:
+        if names and not any(n in name for n in names):
+            continue
+        results[name] = timeIt(setup(), minTime, repeat)
+        out.write("%-28s %s\n" % (name, _format(results[name])))
+        out.flush()
+    return results
+
+
+def compare(results, baseline, threshold, out=sys.stdout):
+    """Prints each result against the baseline, returning the names of
+    those which are slower by more than the ratio `threshold`."""
+    slower = []
+    out.write("\n%-28s %11s %11s %7s\n" % ("", "baseline", "now", "ratio"))
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        ratio = seconds / baseline[name]
+        flag = ""
+        if ratio > threshold:
+            slower.append(name)
+            flag = "  SLOWER"
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        out.write(
+            "%-28s %s %s %6.2fx%s\n"
+            % (name, _format(baseline[name]), _format(seconds), ratio, flag)
+        )
+    return slower
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("names", nargs="*", help="only run benchmarks matching")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="compare against results in this file")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    options = parser.parse_args(args)
+    results = run(options.names, options.min_time, options.repeat)
+    if options.json:
+        with open(options.json, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, options.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Measures how long it takes a fresh interpreter to import beziers modules,
+and checks that importing them does not load any optional dependency::
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 20 beziers.point beziers.path
+
+Each import is timed in a new process, so that nothing is already cached
+in `sys.modules`; the time of starting an interpreter which imports
+nothing is subtracted.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = ["beziers.point", "beziers.cubicbezier", "beziers.path"]
+
+# Packages which beziers uses for some operations only
+OPTIONAL = ["pyclipper", "numpy", "shapely", "scipy", "matplotlib", "fontTools"]
+
+_probe = """
+import sys
+import %s
+print(",".join(m for m in %r if m in sys.modules))
+"""
+
+
+def timeImport(module, repeat):
+    """Returns the median time in seconds taken to import `module` in a new
+    interpreter, and the optional dependencies the import loaded."""
+    times = []
+    loaded = ""
+    for _ in range(0, repeat):
+        start = time.perf_counter()
+        loaded = subprocess.check_output(
+            [sys.executable, "-c", _probe % (module, OPTIONAL)], text=True
+        ).strip()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), loaded.split(",") if loaded else []
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=10)
+    options = parser.parse_args(args)
+    baseline, _ = timeImport("sys", options.repeat)
+    failed = False
+    for module in options.modules:
+        elapsed, loaded = timeImport(module, options.repeat)
+        line = "%-24s %7.1f ms" % (module, (elapsed - baseline) * 1000)
+        if loaded:
+            failed = True
+            line += "  loaded optional: %s" % ", ".join(loaded)
+        print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Runs a `BezierPath` operation over many paths (say, every contour of every
+glyph in a font) across a pool of worker processes::
+
+    from beziers.batch import batchMap
+
+    for result in batchMap("removeOverlap", paths):
+        if result.error:
+            print("Path %i failed: %s" % (result.index, result.error))
+        else:
+            paths[result.index] = result.value
+
+The operation is the name of a `BezierPath` method. Operations which work
+in place and return nothing (``removeOverlap``, ``addExtremes``, ``tidy``)
+yield the modified path; the others yield whatever the method returns.
+Any other positional or keyword arguments are passed on to the method, so
+``batchMap("union", paths, other)`` unions each path with `other`.
+
+Paths cross between processes in a packed form (a buffer of coordinates,
+a buffer of verbs and a closed flag) rather than as pickled trees of
+segment and point objects, so the cost of sending a path to a worker is
+little more than the cost of copying its coordinates.
+"""
+
+import math
+import os
+import traceback
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from beziers.path import BezierPath
+
+
+class PackedPath(object):
+    """The form in which a `BezierPath` is passed between processes."""
+
+    __slots__ = ("coords", "verbs", "closed")
+
+    def __init__(self, coords, verbs, closed):
+        self.coords = coords
+        self.verbs = verbs
+        self.closed = closed
+
+    def __getstate__(self):
+        return (self.coords.tobytes(), self.verbs.tobytes(), self.closed)
+
+    def __setstate__(self, state):
+        coords, verbs, self.closed = state
+        self.coords = array("d")
+        self.coords.frombytes(coords)
+        self.verbs = array("B")
+        self.verbs.frombytes(verbs)
+
+
+def packPath(path):
+    """Returns a compact, picklable `PackedPath` holding a copy of the
+    geometry of a path. The path itself is left as it was."""
+    coords, verbs = path.packedCopy()
+    return PackedPath(coords, verbs, path.closed)
+
+
+def unpackPath(packed):
+    """Rebuilds a `BezierPath` from a `PackedPath`."""
+    return BezierPath.fromPacked(packed.coords, packed.verbs, packed.closed)
+
+
+def _pack(value):
+    # Packs paths, including those in lists and tuples, leaving anything else
+    if isinstance(value, BezierPath):
+        return packPath(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_pack(v) for v in value)
+    return value
+
+
+def _unpack(value):
+    if isinstance(value, PackedPath):
+        return unpackPath(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unpack(v) for v in value)
+    return value
+
+
+class BatchResult(object):
+    """The outcome of running the operation on one path. `index` is the
+    position of the path in the input; `value` is the result, or None if
+    the operation raised an exception, in which case `error` holds the
+    formatted exception and `traceback` the full traceback."""
+
+    __slots__ = ("index", "value", "error", "traceback")
+
+    def __init__(self, index, value=None, error=None, traceback=None):
+        self.index = index
+        self.value = value
+        self.error = error
+        self.traceback = traceback
+
+    def __repr__(self):
+        if self.error:
+            return "<BatchResult %i: error %s>" % (self.index, self.error)
+        return "<BatchResult %i: %r>" % (self.index, self.value)
+
+
+def _runOne(operation, path, args, kwargs):
+    result = getattr(path, operation)(*args, **kwargs)
+    if result is None:
+        return path
+    return result
+
+
+def _runChunk(operation, chunk, args, kwargs):
+    # Runs in the worker: returns a list of (index, packed value, error, traceback)
+    args, kwargs = _unpack(args), {k: _unpack(v) for k, v in kwargs.items()}
+    results = []
+    for index, packed in chunk:
+        try:
+            value = _runOne(operation, unpackPath(packed), args, kwargs)
+            results.append((index, _pack(value), None, None))
+        except Exception as e:
+            error = "%s: %s" % (e.__class__.__name__, e)
+            results.append((index, None, error, traceback.format_exc()))
+    return results
+
+
+def _results(chunkResults):
+    for index, value, error, tb in chunkResults:
+        yield BatchResult(index, _unpack(value), error, tb)
+
+
+def batchMap(
+    operation, paths, *args, processes=None, chunksize=None, ordered=True, **kwargs
+):
+    """Applies the `BezierPath` method named `operation` to each of `paths`
+    in a pool of worker processes, returning an iterator over a
+    `BatchResult` for each path. An `operation` which is not a public
+    method of `BezierPath` raises `AttributeError` straight away.
+
+    Args:
+        operation (str): The name of the method to call.
+        paths: The paths to operate on. These are not modified; the
+            workers operate on copies.
+        processes (int): The number of worker processes; by default, one
+            per CPU. With ``processes=1`` the operation is run in this
+            process, which is handy for debugging.
+        chunksize (int): The number of paths sent to a worker at a time.
+            By default the paths are divided into about four chunks per
+            worker, so that a few slow paths do not hold up the rest.
+        ordered (bool): If true, results are yielded in the order of
+            `paths`; if false, they are yielded as soon as they are ready.
+
+    Exceptions raised by the operation are captured in the result for
+    that path rather than stopping the batch."""
+    if operation.startswith("_") or not callable(getattr(BezierPath, operation, None)):
+        raise AttributeError("BezierPath has no operation %s" % operation)
+    items = [(i, packPath(p)) for i, p in enumerate(paths)]
+    args = _pack(args)
+    kwargs = {k: _pack(v) for k, v in kwargs.items()}
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, int(math.ceil(len(items) / float(processes * 4))))
+    chunks = [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+    return _batchResults(operation, chunks, args, kwargs, processes, ordered)
+
+
+def _batchResults(operation, chunks, args, kwargs, processes, ordered):
+    # The generator behind batchMap, which checks its arguments (and takes
+    # its copies of the paths) when it is called rather than when iterated
+    if processes == 1 or not chunks:
+        for chunk in chunks:
+            for result in _results(_runChunk(operation, chunk, args, kwargs)):
+                yield result
+        return
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(_runChunk, operation, chunk, args, kwargs)
+            for chunk in chunks
+        ]
+        for future in futures if ordered else as_completed(futures):
+            for result in _results(future.result()):
+                yield result
+
+
+def batchApply(operation, paths, *args, **kwargs):
+    """Like `batchMap`, but returns a list of the results' values in the
+    order of `paths`, raising a `BatchError` if any path failed."""
+    kwargs["ordered"] = True
+    results = list(batchMap(operation, paths, *args, **kwargs))
+    failures = [r for r in results if r.error]
+    if failures:
+        raise BatchError(failures)
+    return [r.value for r in results]
+
+
+class BatchError(Exception):
+    """Raised by `batchApply` when the operation failed on some paths. The
+    `failures` attribute holds their `BatchResult` objects."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        super().__init__(
+            "%i path(s) failed; first was path %i: %s"
+            % (len(failures), failures[0].index, failures[0].error)
+        )
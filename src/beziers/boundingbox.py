@@ -91,6 +91,15 @@ class BoundingBox:
             # Try getting its bb
             self.extend(other.bounds())
 
+    def clone(self) -> "BoundingBox":
+        """Returns a new BoundingBox which is a copy of this one."""
+        bb2 = BoundingBox()
+        if self.bl:
+            bb2.bl = self.bl.clone()
+        if self.tr:
+            bb2.tr = self.tr.clone()
+        return bb2
+
     def translated(self, point: Point) -> "BoundingBox":
         """Returns a new BoundingBox translated by the vector"""
         bb2 = BoundingBox()
@@ -0,0 +1,192 @@
+"""
+An opt-in, persistent cache of values derived from paths (their length,
+bounds, area and so on), so that a pipeline which runs over the same
+outlines again and again only computes them once::
+
+    from beziers.cache import caching
+
+    with caching("~/.cache/beziers"):
+        for path in paths:
+            print(path.length, path.bounds())
+
+While a cache is active, the `BezierPath` methods marked with
+:py:func:`cached` look their result up by the path's
+:py:meth:`BezierPath.fingerprint` (a hash of its coordinates, segment
+types and closedness), the method name and its arguments, and store it if
+it is not there. Outside a ``caching`` block the methods behave exactly as
+before.
+
+The store is a single SQLite file in the given directory. When it grows
+beyond its size limit, the least recently used entries are discarded.
+"""
+
+import functools
+import os
+import pickle
+import time
+from contextlib import contextmanager
+
+# Bumped whenever a cached method's results change, so old entries are ignored
+CACHE_VERSION = 1
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+# How many cache hits to remember before writing their use times to disk
+TOUCH_BATCH = 256
+
+# The caches entered with `caching`, innermost last
+_active = []
+
+
+class DiskCache(object):
+    """A size-bounded store of picklable values on disk, keyed by string.
+
+    Args:
+        directory (str): The directory holding the cache file. It is created
+            if it does not exist.
+        maxSize (int): The total size in bytes of the pickled values beyond
+            which the least recently used entries are discarded.
+    """
+
+    def __init__(self, directory, maxSize=DEFAULT_MAX_SIZE):
+        directory = os.path.expanduser(directory)
+        os.makedirs(directory, exist_ok=True)
+        self.filename = os.path.join(directory, "beziers-cache.sqlite")
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        # Use times of entries read since the last write, by key
+        self._touched = {}
+        # Imported here so that importing beziers.path doesn't load sqlite
+        import sqlite3
+
+        self._db = sqlite3.connect(self.filename, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB, size INTEGER, used REAL)"
+        )
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __contains__(self, key):
+        row = self._db.execute("SELECT 1 FROM entries WHERE key = ?", (key,))
+        return row.fetchone() is not None
+
+    @property
+    def size(self):
+        """The total size in bytes of the values held."""
+        row = self._db.execute("SELECT TOTAL(size) FROM entries").fetchone()
+        return int(row[0])
+
+    def get(self, key, default=None):
+        """Returns the value stored under `key`, or `default`."""
+        row = self._db.execute(
+            "SELECT value FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_BATCH:
+            self._flushTouched()
+        return pickle.loads(row[0])
+
+    def _flushTouched(self):
+        # Records the use times of recent hits in one transaction, rather
+        # than writing to the database on every read
+        if not self._touched:
+            return
+        touched = [(used, key) for key, used in self._touched.items()]
+        self._touched = {}
+        self._db.execute("BEGIN")
+        self._db.executemany("UPDATE entries SET used = ? WHERE key = ?", touched)
+        self._db.execute("COMMIT")
+
+    def set(self, key, value):
+        """Stores `value` under `key`, evicting old entries if the cache
+        has grown too large."""
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+            (key, data, len(data), time.time()),
+        )
+        self.evict()
+
+    def evict(self):
+        """Discards the least recently used entries until the cache is
+        within its size limit."""
+        excess = self.size - self.maxSize
+        if excess <= 0:
+            return
+        self._flushTouched()
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY used")
+        doomed = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def clear(self):
+        """Discards every entry."""
+        self._touched = {}
+        self._db.execute("DELETE FROM entries")
+
+    def close(self):
+        self._flushTouched()
+        self._db.close()
+
+
+@contextmanager
+def caching(cache, maxSize=DEFAULT_MAX_SIZE):
+    """Makes `cache` (a `DiskCache`, or the name of a directory in which to
+    open one) the active cache for the duration of a ``with`` block, and
+    yields it."""
+    opened = not isinstance(cache, DiskCache)
+    if opened:
+        cache = DiskCache(cache, maxSize)
+    _active.append(cache)
+    try:
+        yield cache
+    finally:
+        _active.pop()
+        if opened:
+            cache.close()
+
+
+def activeCache():
+    """Returns the innermost active `DiskCache`, or None."""
+    return _active[-1] if _active else None
+
+
+def cached(method):
+    """Decorates a `BezierPath` method whose result depends only on the
+    path's geometry and the method's arguments, so that its result is
+    looked up in the active cache (if any) before being computed."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not _active:
+            return method(self, *args, **kwargs)
+        cache = _active[-1]
+        key = "%i:%s:%s:%r:%r" % (
+            CACHE_VERSION,
+            self.fingerprint(),
+            name,
+            args,
+            sorted(kwargs.items()),
+        )
+        missing = wrapper  # a sentinel no cached value can be
+        value = cache.get(key, missing)
+        if value is missing:
+            value = method(self, *args, **kwargs)
+            cache.set(key, value)
+        return value
+
+    return wrapper
@@ -53,14 +53,25 @@ class CubicBezier(ArcLengthMixin, Segment):
         )
         return Point(x, y)
 
+    def _basis(self, t):
+        return (
+            (1 - t) * (1 - t) * (1 - t),
+            3 * (1 - t) * (1 - t) * t,
+            3 * (1 - t) * t * t,
+            t * t * t,
+        )
+
     def tOfPoint(self, p: Point) -> float:
         """Returns the time t (0->1) of a point on the curve."""
         precision = 1.0 / 50.0
         bestDist = float("inf")
         bestT = -1
         samples = self.regularSampleTValue(50)
-        for t in samples:
-            dist = self.pointAtTime(t).distanceFrom(p)
+        coords = self.pointsAtTimes(samples)
+        if hasattr(coords, "tolist"):
+            coords = coords.tolist()
+        for t, (x, y) in zip(samples, coords):
+            dist = math.hypot(x - p.x, y - p.y)
             if dist < bestDist:
                 bestDist = dist
                 bestT = t
@@ -101,17 +112,29 @@ class CubicBezier(ArcLengthMixin, Segment):
         raise NotImplementedError
 
     def derivative(self) -> QuadraticBezier:
-        """Returns a `QuadraticBezier` representing the derivative of this curve."""
-        return QuadraticBezier(
-            (self[1] - self[0]) * 3, (self[2] - self[1]) * 3, (self[3] - self[2]) * 3
+        """Returns a `QuadraticBezier` representing the derivative of this curve.
+        The result is cached, so treat it as read-only."""
+        return self._derived(
+            "derivative",
+            lambda: QuadraticBezier(
+                (self[1] - self[0]) * 3,
+                (self[2] - self[1]) * 3,
+                (self[3] - self[2]) * 3,
+            ),
         )
 
-    def flatten(self, degree=8) -> List[Line]:
+    def flatten(self, degree=8, tolerance=None) -> List[Line]:
         """Flattens the curve into a list of `Line` segments.
 
         Args:
             degree (int): The degree of flattening to perform.
+            tolerance (float): If given, flatten adaptively instead, using as
+                few lines as possible while keeping within this distance of
+                the curve. Each line's ``_tRange`` holds the range of times
+                on this curve which it covers.
         """
+        if tolerance is not None:
+            return self._flattenToTolerance(tolerance)
         ss = []
         if self.length < degree:
             return [Line(self[0], self[3])]
@@ -196,11 +219,15 @@ class CubicBezier(ArcLengthMixin, Segment):
 
     def findExtremes(self, inflections=False) -> List[float]:
         """Returns a list of time `t` values for extremes of the curve."""
-        r = self._findDRoots()
-        if inflections:
-            r.extend(self.derivative()._findDRoots())
-        r.sort()
-        return [root for root in r if root >= 0.01 and root <= 0.99]
+
+        def compute():
+            r = self._findDRoots()
+            if inflections:
+                r.extend(self.derivative()._findDRoots())
+            r.sort()
+            return [root for root in r if root >= 0.01 and root <= 0.99]
+
+        return list(self._derived(("extremes", inflections), compute))
 
     def curvatureAtTime(self, t: float) -> float:
         """Returns the C curvature at time `t`."""
@@ -0,0 +1,199 @@
+"""
+Counts the calls to, and measures the time spent in, the library's hot
+paths, to find out where a slow operation is spending its time::
+
+    from beziers.instrument import profile
+
+    with profile() as report:
+        path.removeOverlap()
+    print(report)
+
+which prints something like::
+
+    function                                     calls    time (s)  depth
+    BezierPath.windingNumberOfPoint                 48      0.2140
+    IntersectionsMixin.intersections               310      0.1632
+    bezierclipping._intersect                     2216      0.1201     14
+    ...
+
+Instrumentation works by temporarily wrapping the functions listed in
+`TARGETS` for the duration of the ``with`` block, so there is no cost at
+all outside it. Times are inclusive (they include the time spent in any
+instrumented functions called from inside), and a recursive function's
+time is only counted at its outermost call; ``depth`` is the deepest
+recursion seen. As the wrapping is global, calls from every thread are
+counted while a profile is active.
+"""
+
+import functools
+import importlib
+import time
+from contextlib import contextmanager
+
+# The functions instrumented, as (module, qualified name) pairs
+TARGETS = [
+    ("beziers.line", "Line.pointAtTime"),
+    ("beziers.quadraticbezier", "QuadraticBezier.pointAtTime"),
+    ("beziers.cubicbezier", "CubicBezier.pointAtTime"),
+    ("beziers.path", "BezierPath.pointAtTime"),
+    ("beziers.line", "Line.splitAtTime"),
+    ("beziers.quadraticbezier", "QuadraticBezier.splitAtTime"),
+    ("beziers.cubicbezier", "CubicBezier.splitAtTime"),
+    ("beziers.segment", "Segment.bounds"),
+    ("beziers.path", "BezierPath.bounds"),
+    ("beziers.line", "Line.length"),
+    ("beziers.utils.arclengthmixin", "ArcLengthMixin.length"),
+    ("beziers.path", "BezierPath.length"),
+    ("beziers.utils.intersectionsmixin", "IntersectionsMixin.intersections"),
+    (
+        "beziers.utils.intersectionsmixin",
+        "IntersectionsMixin._curve_curve_intersections_t",
+    ),
+    ("beziers.utils.bezierclipping", "_intersect"),
+    ("beziers.path", "BezierPath.windingNumberOfPoint"),
+    ("beziers.utils.curvefitter", "CurveFit._fitCurve"),
+]
+
+# Whether a profile is in progress
+_active = False
+
+
+class Stat(object):
+    """The figures for one instrumented function."""
+
+    __slots__ = ("calls", "time", "depth", "maxDepth")
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+        self.depth = 0
+        self.maxDepth = 0
+
+    def __repr__(self):
+        return "<Stat calls=%i time=%f maxDepth=%i>" % (
+            self.calls,
+            self.time,
+            self.maxDepth,
+        )
+
+
+class Report(object):
+    """The result of a `profile`: a mapping from the name of each
+    instrumented function (such as ``"CubicBezier.pointAtTime"``) to a
+    `Stat` giving its number of calls, total time in seconds and maximum
+    recursion depth."""
+
+    def __init__(self):
+        self.stats = {}
+        self.elapsed = 0.0
+
+    def __getitem__(self, name):
+        return self.stats[name]
+
+    def __contains__(self, name):
+        return name in self.stats
+
+    def __iter__(self):
+        return iter(self.stats)
+
+    def calls(self, name):
+        """Returns the number of calls to the named function."""
+        return self.stats[name].calls if name in self.stats else 0
+
+    def asDict(self):
+        """Returns the figures as plain dictionaries, for serializing."""
+        return {
+            name: {"calls": s.calls, "time": s.time, "maxDepth": s.maxDepth}
+            for name, s in self.stats.items()
+        }
+
+    def __str__(self):
+        lines = ["%-48s %8s %11s %6s" % ("function", "calls", "time (s)", "depth")]
+        for name, s in sorted(
+            self.stats.items(), key=lambda item: item[1].time, reverse=True
+        ):
+            if not s.calls:
+                continue
+            depth = "%6i" % s.maxDepth if s.maxDepth > 1 else ""
+            line = "%-48s %8i %11.4f %s" % (name, s.calls, s.time, depth)
+            lines.append(line.rstrip())
+        lines.append("%-48s %8s %11.4f" % ("(total elapsed)", "", self.elapsed))
+        return "\n".join(lines)
+
+
+def _label(module, qualname):
+    if "." in qualname:
+        return qualname
+    return "%s.%s" % (module.rsplit(".", 1)[-1], qualname)
+
+
+def _wrap(function, stat):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        stat.calls += 1
+        stat.depth += 1
+        if stat.depth > stat.maxDepth:
+            stat.maxDepth = stat.depth
+        if stat.depth > 1:
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stat.depth -= 1
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stat.time += time.perf_counter() - start
+            stat.depth -= 1
+
+    return wrapper
+
+
+def _instrumented(original, stat):
+    # Wraps a function, method, classmethod or property
+    if isinstance(original, property):
+        return property(_wrap(original.fget, stat), original.fset, original.fdel)
+    if isinstance(original, classmethod):
+        return classmethod(_wrap(original.__func__, stat))
+    if isinstance(original, staticmethod):
+        return staticmethod(_wrap(original.__func__, stat))
+    return _wrap(original, stat)
+
+
+def _patch(targets, report, patched):
+    # Replaces each target with an instrumented version, adding what was
+    # replaced to `patched` so that it can be put back
+    for module, qualname in targets:
+        owner = importlib.import_module(module)
+        path = qualname.split(".")
+        for name in path[:-1]:
+            owner = getattr(owner, name)
+        name = path[-1]
+        original = vars(owner)[name]
+        stat = report.stats.setdefault(_label(module, qualname), Stat())
+        setattr(owner, name, _instrumented(original, stat))
+        patched.append((owner, name, original))
+
+
+@contextmanager
+def profile(targets=None):
+    """Instruments the functions in `targets` (by default, `TARGETS`) for
+    the duration of a ``with`` block, and yields the `Report` which
+    collects their figures. Profiles cannot be nested."""
+    global _active
+    if _active:
+        raise RuntimeError("A profile is already active")
+    report = Report()
+    _active = True
+    patched = []
+    try:
+        _patch(TARGETS if targets is None else targets, report, patched)
+        start = time.perf_counter()
+        try:
+            yield report
+        finally:
+            report.elapsed = time.perf_counter() - start
+    finally:
+        for owner, name, original in reversed(patched):
+            setattr(owner, name, original)
+        _active = False
@@ -19,6 +19,7 @@ class Line(Segment):
         """
         self.points = [start, end]
         self._orig = None
+        self._tRange = None
 
     def __repr__(self):
         return "L<%s--%s>" % (self.points[0], self.points[1])
@@ -36,6 +37,9 @@ class Line(Segment):
         """Returns the point at time t (0->1) along the line."""
         return self.start.lerp(self.end, t)
 
+    def _basis(self, t):
+        return (1 - t, t)
+
     # XXX One of these is wrong
     def tangentAtTime(self, t: float) -> Point:
         """Returns the tangent at time t (0->1) along the line."""
@@ -92,7 +96,7 @@ class Line(Segment):
             return t
         return -1
 
-    def flatten(self, _degree=8) -> List["Line"]:
+    def flatten(self, _degree=8, tolerance=None) -> List["Line"]:
         return [self]
 
     @property
@@ -113,6 +117,15 @@ class Line(Segment):
         """Returns the length of the line."""
         return self[0].distanceFrom(self[1])
 
+    def tAtLength(self, length: float) -> float:
+        """Returns the time t (0->1) at which the line has the given length from its start."""
+        total = self.length
+        if total == 0 or length >= total:
+            return 1.0
+        if length <= 0:
+            return 0.0
+        return length / total
+
     def findExtremes(self) -> List[Point]:
         """Returns the extrema of the line."""
         return []
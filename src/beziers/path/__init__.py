@@ -1,15 +1,21 @@
+import hashlib
 import math
+from array import array
+from bisect import bisect_right
 from typing import Iterator, List, Optional, Tuple
 
 from beziers.boundingbox import BoundingBox
+from beziers.cache import cached
 from beziers.cubicbezier import CubicBezier
 from beziers.line import Line
 from beziers.path.representations.Nodelist import Node, NodelistRepresentation
+from beziers.path.representations.Packed import PackedRepresentation
 from beziers.path.representations.Segment import SegmentRepresentation
 from beziers.point import Point
 from beziers.segment import Segment
+from beziers.utils import numpy
 from beziers.utils.booleanoperationsmixin import BooleanOperationsMixin
-from beziers.utils.samplemixin import SampleMixin
+from beziers.utils.samplemixin import SampleMixin, pointsFromCoords
 
 if not hasattr(math, "isclose"):
 
@@ -49,12 +55,97 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
 
     """
 
+    # Counts of representation conversions avoided ("hits") and performed
+    # ("misses") across all paths, for checking the conversion cache is working
+    conversionStats = {"hits": 0, "misses": 0}
+
     def __init__(self):
-        self.activeRepresentation = None
+        self.version = 0
+        self._activeRepresentation = None
+        self._representations = {}
+        self._snapshots = {}
         self.closed = True
+        self._lengthIndexCache = None
+        self._segmentIndexCache = None
+        self._containmentIndexCache = None
+        self._momentsCache = None
+        self._fingerprintCache = None
+
+    @property
+    def activeRepresentation(self):
+        """The representation currently holding this path's geometry.
+
+        Other representations converted from it are cached alongside it,
+        so switching back and forth between (say) `asSegments` and
+        `asNodelist` only converts the path once. Assigning a new
+        representation discards the cached conversions and bumps the
+        path's `version`."""
+        return self._activeRepresentation
+
+    @activeRepresentation.setter
+    def activeRepresentation(self, representation):
+        self._activeRepresentation = representation
+        self.changed()
+
+    def changed(self) -> None:
+        """Tells the path that its geometry has been modified, discarding
+        any cached conversions of the active representation and any derived
+        data. Call this after editing the segments, nodes or buffers
+        returned by `asSegments`, `asNodelist` or `asPacked` in place, so
+        that cached lengths, indexes and areas are recomputed. (Converting
+        to another representation notices such edits by itself.)"""
+        self.version += 1
+        self._representations = {}
+        self._snapshots = {}
+        if self._activeRepresentation is not None:
+            rep = self._activeRepresentation
+            self._representations[type(rep)] = rep
+
+    def _unedited(self, rep):
+        # Whether `rep` still holds what it did when it was last converted
+        # to or from, as the lists we hand out may be edited in place
+        return self._snapshots.get(type(rep)) == rep.snapshot()
+
+    def _convertedRepresentation(self, klass, convert):
+        rep = self._representations.get(klass)
+        active = self._activeRepresentation
+        if rep is active:
+            return rep.data()
+        if type(active) in self._snapshots and not self._unedited(active):
+            self.changed()
+            rep = None
+        elif rep is not None and not self._unedited(rep):
+            # Edits to a representation which is no longer active are lost,
+            # just as if it had never been cached
+            del self._representations[klass]
+            rep = None
+        if rep is None:
+            BezierPath.conversionStats["misses"] += 1
+            rep = convert(active)
+            if not isinstance(active, (SegmentRepresentation, PackedRepresentation)):
+                # Node lists from outside may not be in canonical form (they
+                # may start on an off-curve point, say), so don't hand them
+                # back out once we have a canonical representation
+                self._representations = {}
+                self._snapshots = {}
+            elif type(active) not in self._snapshots:
+                self._snapshots[type(active)] = active.snapshot()
+            self._representations[klass] = rep
+            self._snapshots[klass] = rep.snapshot()
+        else:
+            BezierPath.conversionStats["hits"] += 1
+        self._activeRepresentation = rep
+        return rep.data()
 
     @classmethod
-    def fromPoints(self, points, error=50.0, cornerTolerance=20.0, maxSegments=20):
+    def fromPoints(
+        self,
+        points,
+        error=50.0,
+        cornerTolerance=20.0,
+        maxSegments=20,
+        backend="python",
+    ):
         """Fit a poly-bezier curve to the points given. This operation should be familiar
             from 'pencil' tools in a vector drawing application: the application samples points
             where your mouse pointer has been dragged, and then turns the sketch into a Bezier
@@ -74,10 +165,17 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
             :scale: 75 %
             :alt: curvefit1
 
+            Pass ``backend="numpy"`` to fit with `NumpyCurveFit`, which
+            gives the same result but is much faster on long runs of points.
+            To fit points as they arrive, use `StreamingCurveFit`; for very
+            large numbers of points, such as scanned outlines, see
+            `fitLargeCurve`.
         """
-        from beziers.utils.curvefitter import CurveFit
+        from beziers.utils.curvefitter import fitters
 
-        segs = CurveFit.fitCurve(points, error, cornerTolerance, maxSegments)
+        if backend not in fitters:
+            raise ValueError("Unknown curve fitting backend %s" % backend)
+        segs = fitters[backend].fitCurve(points, error, cornerTolerance, maxSegments)
         path = BezierPath()
         path.closed = False
         path.activeRepresentation = SegmentRepresentation(path, segs)
@@ -99,8 +197,19 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
         for a in array:
             assert isinstance(a, Node)
         self.closed = closed
-        self.activeRepresentation = NodelistRepresentation(self, array)
-        self.asSegments()  # Resolves a few problems
+        # Go straight to segments; this resolves a few problems
+        self.activeRepresentation = SegmentRepresentation.fromNodelist(self, array)
+        return self
+
+    @classmethod
+    def fromPacked(klass, coords, verbs, closed=True):
+        """Construct a path from a packed coordinate buffer and verb array,
+        as returned by :py:meth:`asPacked`. If `coords` and `verbs` are
+        already `array.array` or `memoryview` objects they are used
+        directly, not copied."""
+        self = klass()
+        self.closed = closed
+        self.activeRepresentation = PackedRepresentation(self, coords, verbs)
         return self
 
     @classmethod
@@ -138,19 +247,51 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
     def asSegments(self) -> List[Segment]:
         """Return the path as a list of segments (either Line, CubicBezier,
         or, if you are exceptionally unlucky, QuadraticBezier objects)."""
-        if not isinstance(self.activeRepresentation, SegmentRepresentation):
-            nl = self.activeRepresentation.toNodelist()
+
+        def convert(rep):
+            if isinstance(rep, PackedRepresentation):
+                return SegmentRepresentation(self, rep.toSegments())
+            nl = rep.toNodelist()
             assert isinstance(nl, list)
-            self.activeRepresentation = SegmentRepresentation.fromNodelist(self, nl)
-        return self.activeRepresentation.data()
+            return SegmentRepresentation.fromNodelist(self, nl)
+
+        return self._convertedRepresentation(SegmentRepresentation, convert)
 
     def asNodelist(self) -> List[Node]:
         """Return the path as a list of Node objects."""
-        if not isinstance(self.activeRepresentation, NodelistRepresentation):
-            nl = self.activeRepresentation.toNodelist()
+
+        def convert(rep):
+            nl = rep.toNodelist()
             assert isinstance(nl, list)
-            self.activeRepresentation = NodelistRepresentation(self, nl)
-        return self.activeRepresentation.data()
+            return NodelistRepresentation(self, nl)
+
+        return self._convertedRepresentation(NodelistRepresentation, convert)
+
+    def asPacked(self) -> Tuple[array, array]:
+        """Return the path as a tuple of a flat `array.array` of coordinates
+        and an `array.array` of verbs (2 for a line, 3 for a quadratic, 4 for
+        a cubic). See :py:class:`PackedRepresentation` for the layout."""
+
+        def convert(rep):
+            if isinstance(rep, SegmentRepresentation):
+                return PackedRepresentation.fromSegments(self, rep.data())
+            nl = rep.toNodelist()
+            assert isinstance(nl, list)
+            return PackedRepresentation.fromNodelist(self, nl)
+
+        return self._convertedRepresentation(PackedRepresentation, convert)
+
+    def packedCopy(self) -> Tuple[array, array]:
+        """Return copies of the buffers returned by `asPacked`, without
+        making the packed representation the active one. This is for
+        handing a path's geometry elsewhere (to another process, say)
+        while leaving the path itself just as it was."""
+        active = self._activeRepresentation
+        coords, verbs = self.asPacked()
+        if active is not None and active is not self._activeRepresentation:
+            self._representations[type(active)] = active
+            self._activeRepresentation = active
+        return array("d", coords), array("B", verbs)
 
     def asSVGPath(self) -> str:
         """Return the path as a string suitable for a SVG <path d="..."? element."""
@@ -277,6 +418,24 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
             s.round()
         self.activeRepresentation = SegmentRepresentation(self, segs)
 
+    def fingerprint(self) -> str:
+        """Returns a hash of the path's coordinates, segment types and
+        closedness, which is the same for any two paths with the same
+        geometry. This is used as the key for cached derived values; see
+        :py:mod:`beziers.cache`. The hash is worked out once per version of
+        the path, so call `changed` after editing the path in place."""
+        key = (self.version, self.closed)
+        cache = self._fingerprintCache
+        if cache is None or cache[0] != key:
+            coords, verbs = self.asPacked()
+            h = hashlib.sha1(b"closed" if self.closed else b"open")
+            h.update(verbs)
+            h.update(coords)
+            cache = (key, h.hexdigest())
+            self._fingerprintCache = cache
+        return cache[1]
+
+    @cached
     def bounds(self) -> BoundingBox:
         """Determine the bounding box of the path, returned as a
         `BoundingBox` object."""
@@ -335,13 +494,87 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
         return self
 
     @property
+    @cached
     def length(self) -> float:
         """Returns the length of the whole path."""
+        return self._lengthIndex()[1][-1]
+
+    def _lengthIndex(self):
+        """Returns the path's segments along with a list of the cumulative
+        lengths of the path at the start of each segment (and, as the final
+        entry, the total length). This is built once and reused until the
+        path is changed."""
         segs = self.asSegments()
-        length = 0
-        for s in segs:
-            length += s.length
-        return length
+        cache = self._lengthIndexCache
+        if cache is None or cache[0] != self.version:
+            prefix = [0]
+            for s in segs:
+                prefix.append(prefix[-1] + s.length)
+            cache = (self.version, segs, prefix)
+            self._lengthIndexCache = cache
+        return cache[1:]
+
+    def segmentIndex(self):
+        """Returns a `BVH` spatial index over the path's segments, for
+        finding the segments near a box, line or point without scanning
+        them all. This is built once and reused until the path is changed."""
+        from beziers.utils.bvh import BVH
+
+        self.asSegments()
+        cache = self._segmentIndexCache
+        if cache is None or cache[0] != self.version:
+            cache = (self.version, BVH.fromPath(self))
+            self._segmentIndexCache = cache
+        return cache[1]
+
+    def _segmentAtLength(self, length: float, index=None) -> Tuple[int, float]:
+        segs, prefix = index or self._lengthIndex()
+        i = bisect_right(prefix, length) - 1
+        i = min(max(i, 0), len(segs) - 1)
+        return i, segs[i].tAtLength(length - prefix[i])
+
+    def lengthAtTime(self, t: float) -> float:
+        """Returns the length of the subset of the path from the start
+        up to the point t (0->1), where 1 is the end of the whole curve."""
+        segs, prefix = self._lengthIndex()
+        if t >= 1.0:
+            return prefix[-1]
+        t *= len(segs)
+        i = int(math.floor(t))
+        return prefix[i] + segs[i].lengthAtTime(t - i)
+
+    def timeAtLength(self, length: float) -> float:
+        """Returns the time t (0->1) along the path at which the path has
+        the given length from its start. This is the inverse of `lengthAtTime`."""
+        index = self._lengthIndex()
+        i, t = self._segmentAtLength(length, index)
+        return (i + t) / len(index[0])
+
+    def pointAtLength(self, length: float) -> Point:
+        """Returns the point which lies the given distance along the path
+        from its start."""
+        index = self._lengthIndex()
+        i, t = self._segmentAtLength(length, index)
+        return index[0][i].pointAtTime(t)
+
+    def regularSampleTValue(self, samples):
+        """Returns a list of time values regularly spaced along the length of
+        the path. See :py:meth:`SampleMixin.regularSampleTValue`."""
+        # As the mixin's version, but looking up the length index just once
+        index = self._lengthIndex()
+        segs, prefix = index
+        length = prefix[-1]
+        if length == 0:
+            return []
+        desiredLength = 0.0
+        rSamples = []
+        while desiredLength < length:
+            i, t = self._segmentAtLength(desiredLength, index)
+            rSamples.append((i + t) / len(segs))
+            desiredLength += length / samples
+        if rSamples[-1] != 1.0:
+            rSamples.append(1.0)
+        return rSamples
 
     def pointAtTime(self, t: float) -> Point:
         """Returns the point at time t (0->1) along the curve, where 1 is the end of the whole curve."""
@@ -352,20 +585,39 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
         seg = segs[int(math.floor(t))]
         return seg.pointAtTime(t - math.floor(t))
 
-    def lengthAtTime(self, t: float) -> float:
-        """Returns the length of the subset of the path from the start
-        up to the point t (0->1), where 1 is the end of the whole curve."""
+    def pointsAtTimes(self, ts):
+        """Returns the points at each of the times (0->1) in the sequence `ts`,
+        where 1 is the end of the whole curve. As with `Segment.pointsAtTimes`,
+        this returns an N x 2 numpy array if numpy is installed, or a list of
+        (x, y) tuples otherwise."""
         segs = self.asSegments()
-        t *= len(segs)
-        length = 0
-        for s in segs[: int(math.floor(t))]:
-            length += s.length
-        seg = segs[int(math.floor(t))]
-        s1, s2 = seg.splitAtTime(t - math.floor(t))
-        length += s1.length
-        return length
-
-    def offset(self, vector: Point, rotateVector=True) -> "BezierPath":
+        # Group the times by segment so each segment is evaluated in one batch
+        bySegment = {}
+        for ix, t in enumerate(ts):
+            if t == 1.0:
+                segIx, localT = len(segs) - 1, 1.0
+            else:
+                t *= len(segs)
+                segIx = int(math.floor(t))
+                localT = t - math.floor(t)
+            bySegment.setdefault(segIx, ([], []))
+            bySegment[segIx][0].append(ix)
+            bySegment[segIx][1].append(localT)
+        np = numpy()
+        if np is None:
+            coords = [None] * len(ts)
+            for segIx, (indices, localTs) in bySegment.items():
+                for ix, xy in zip(indices, segs[segIx].pointsAtTimes(localTs)):
+                    coords[ix] = xy
+            return coords
+        coords = np.empty((len(ts), 2))
+        for segIx, (indices, localTs) in bySegment.items():
+            coords[indices] = segs[segIx].pointsAtTimes(localTs)
+        return coords
+
+    def offset(
+        self, vector: Point, rotateVector=True, method="fit", tolerance=0.1
+    ) -> "BezierPath":
         """Returns a new BezierPath which approximates offsetting the
             current Bezier path by the given vector. Note that the vector
             will be rotated around the normal of the curve so that the
@@ -383,7 +635,35 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
             :scale: 75 %
             :alt: offset1
 
+            By default the offset is found by sampling points along each
+            curve, moving them, and fitting a new curve through them
+            (``method="fit"``). With ``method="tillerhanson"``, each segment's
+            control polygon is offset directly instead, and split wherever
+            the result strays more than about `tolerance` from the true
+            offset. This follows the true offset far more closely, as
+            fitting is limited to a handful of segments and can stray a
+            long way from it on a detailed path. It is faster too, and more
+            so the more segments there are: on wobbly glyph outlines it
+            measured 1.1 to 1.8 times faster than fitting at 60 segments,
+            and 2.5 to 5 times faster at 300. The price is the segment count:
+            up to about one for each segment of the original path (more
+            where it bends tightly), against the handful that fitting
+            produces.
+            The offsets of segments which meet at a corner are joined with
+            a line. With either method, lines are offset exactly (by the
+            rotated vector, if `rotateVector` is true).
         """
+        from beziers.utils.offset import offsetSegment, offsetSegments
+
+        if method == "tillerhanson":
+            newsegs = offsetSegments(
+                self.asSegments(), vector, rotateVector, tolerance, self.closed
+            )
+            newpath = BezierPath.fromSegments(newsegs)
+            newpath.closed = self.closed
+            return newpath
+        if method != "fit":
+            raise ValueError("Unknown offset method %s" % method)
         # Method 1 - curve fit
         newsegs = []
         points = []
@@ -398,19 +678,23 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
         for seg in self.asSegments():
             if isinstance(seg, Line):
                 finishPoints(newsegs, points)
-                newsegs.append(seg.translated(vector))
+                newsegs.extend(offsetSegment(seg, vector, rotateVector))
             else:
+                ts = []
                 t = 0.0
                 while t < 1.0:
-                    if rotateVector:
-                        points.append(
-                            seg.pointAtTime(t)
-                            + vector.rotated(Point(0, 0), seg.normalAtTime(t).angle)
-                        )
-                    else:
-                        points.append(seg.pointAtTime(t) + vector)
+                    ts.append(t)
                     step = max(abs(seg.curvatureAtTime(t)), 0.1)
                     t = t + min(seg.length / step, 0.1)
+                onCurve = pointsFromCoords(seg.pointsAtTimes(ts))
+                if rotateVector:
+                    # Normal is the derivative rotated by 90 degrees
+                    derivs = pointsFromCoords(seg.derivative().pointsAtTimes(ts))
+                    for p, d in zip(onCurve, derivs):
+                        normal = Point(-d.y, d.x)
+                        points.append(p + vector.rotated(Point(0, 0), normal.angle))
+                else:
+                    points.extend(p + vector for p in onCurve)
         finishPoints(newsegs, points)
         newpath = BezierPath()
         newpath.activeRepresentation = SegmentRepresentation(newpath, newsegs)
@@ -498,11 +782,28 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
         """
         if not gapLength:
             gapLength = lineLength
-        granularity = self.length
+        # Sample roughly every unit along the path, using each segment's
+        # arc length table to find the sample positions
+        samples = []
+        segStart = 0.0
+        for seg in self.asSegments():
+            segLength = seg.length
+            distances = []
+            d = math.ceil(segStart) - segStart
+            while d < segLength:
+                distances.append(d)
+                d += 1.0
+            ts = [seg.tAtLength(d) for d in distances]
+            points = pointsFromCoords(seg.pointsAtTimes(ts))
+            samples.extend(zip([segStart + d for d in distances], points))
+            segStart += segLength
+        segs = self.asSegments()
+        if segs:
+            samples.append((segStart, segs[-1].end))
+
         newpaths = []
         points = []
-        for t in self.regularSampleTValue(granularity):
-            lenSoFar = self.lengthAtTime(t)  # Super inefficient. But simple!
+        for lenSoFar, point in samples:
             lenSoFar = lenSoFar % (lineLength + gapLength)
             if lenSoFar >= lineLength and len(points) > 0:
                 # When all you have is a hammer...
@@ -511,7 +812,7 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
                 if len(bp.asSegments()) > 0:
                     newpaths.append(bp)
             elif lenSoFar <= lineLength:
-                points.append(self.pointAtTime(t))
+                points.append(point)
         return newpaths
 
     def segpairs(self) -> Iterator[Tuple[Segment, Segment]]:
@@ -536,14 +837,28 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
         fixup = seg2.start - newA3
         seg1[2] += fixup
         seg2[1] += fixup
+        self.changed()
 
-    def flatten(self, degree=8) -> "BezierPath":
-        """Returns a Path made up of line segments that approximate the path."""
+    def flatten(self, degree=8, tolerance=None) -> "BezierPath":
+        """Returns a Path made up of line segments that approximate the path.
+        If `tolerance` is given, the path is flattened adaptively instead,
+        using as few lines as possible while keeping within that distance
+        of the original curves."""
         segs = []
         for s in self.asSegments():
-            segs.extend(s.flatten(degree))
+            segs.extend(s.flatten(degree, tolerance=tolerance))
         return BezierPath.fromSegments(segs)
 
+    @cached
+    def flattenedCoords(self, tolerance: float):
+        """Flattens the path adaptively to within `tolerance`, returning
+        the polyline as a flat array of co-ordinates together with arrays
+        giving the index of the segment each vertex lies on and its time
+        along that segment. See :py:func:`beziers.utils.flatten.flattenSegments`."""
+        from beziers.utils.flatten import flattenSegments
+
+        return flattenSegments(self.asSegments(), tolerance)
+
     def windingNumberOfPoint(self, pt: Point) -> int:
         """Returns the winding number of a point with respect to the path."""
         bounds = self.bounds()
@@ -554,53 +869,76 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
         rightIntersections = {}
         leftWinding = 0
         rightWinding = 0
-        for s in self.asSegments():
-            for i in s.intersections(ray1):
-                # print("Found left intersection with %s: %s" % (ray1, i.point))
-                leftIntersections[i.point] = i
-
-            for i in s.intersections(ray2):
-                rightIntersections[i.point] = i
+        index = self.segmentIndex()
+        for i in index.rayIntersections(ray1):
+            leftIntersections[i.point] = i
+        for i in index.rayIntersections(ray2):
+            rightIntersections[i.point] = i
 
         for i in leftIntersections.values():
-            # XXX tangents here are all positive? Really?
-            # print(i.seg1, i.t1, i.point)
-            tangent = s.tangentAtTime(i.t1)
-            # print("Tangent at left intersection %s is %f" % (i.point,tangent.y))
+            tangent = i.seg1.tangentAtTime(i.t1)
             leftWinding += int(math.copysign(1, tangent.y))
 
         for i in rightIntersections.values():
-            tangent = s.tangentAtTime(i.t1)
-            # print("Tangent at right intersection %s is %f" % (i.point,tangent.y))
+            tangent = i.seg1.tangentAtTime(i.t1)
             rightWinding += int(math.copysign(1, tangent.y))
 
         # print("Left winding: %i right winding: %i " % (leftWinding,rightWinding))
         return max(abs(leftWinding), abs(rightWinding))
 
-    def pointIsInside(self, pt: Point) -> bool:
-        """Returns true if the given point lies on the "inside" of the path,
-        assuming an 'even-odd' winding rule where self-intersections are considered
-        outside."""
-        li = self.windingNumberOfPoint(pt)
-        return li % 2 == 1
+    def pointIsInside(self, pt: Point, rule: str = "evenodd") -> bool:
+        """Returns true if the given point lies on the "inside" of the path.
+        By default this assumes an 'even-odd' winding rule where self-intersections
+        are considered outside; pass ``rule="nonzero"`` to use the nonzero rule."""
+        winding = self.containmentIndex().windingNumber(pt)
+        if rule == "nonzero":
+            return winding != 0
+        return winding % 2 == 1
+
+    def containmentIndex(self):
+        """Returns a `ContainmentIndex` for answering point-in-path queries
+        against this path. This is built once and reused until the path is
+        changed."""
+        from beziers.utils.containment import ContainmentIndex
+
+        self.asSegments()
+        cache = self._containmentIndexCache
+        if cache is None or cache[0] != self.version:
+            cache = (self.version, ContainmentIndex(self))
+            self._containmentIndexCache = cache
+        return cache[1]
+
+    def containsPoints(self, points, rule: str = "nonzero"):
+        """Tests many points for lying inside the path at once, under either
+        the ``"nonzero"`` or the ``"evenodd"`` fill rule. `points` may be a
+        sequence of `Point` objects or (x, y) pairs, or an N x 2 numpy array.
+        Returns a numpy array of booleans if numpy is installed, or a list
+        otherwise."""
+        return self.containmentIndex().containsPoints(points, rule)
+
+    def _moments(self):
+        # The moments of area of the path, as returned by `pathMoments`.
+        # These are computed once and reused until the path is changed.
+        segs = self.asSegments()
+        cache = self._momentsCache
+        if cache is None or cache[0] != self.version:
+            from beziers.utils.moments import pathMoments
+
+            cache = (self.version, pathMoments(segs))
+            self._momentsCache = cache
+        return cache[1]
 
     @property
+    @cached
     def signed_area(self) -> float:
-        """Approximates the area under a closed path by flattening and treating as a polygon.
-        Returns the signed area; positive means the path is counter-clockwise,
-        negative means it is clockwise."""
-        flat = self.flatten()
-        area = 0
-        for s in flat.asSegments():
-            area = area + (s.start.x * s.end.y) - (s.start.y * s.end.x)
-        area = area / 2.0
-        return area
+        """Returns the exact signed area of a closed path; positive means the
+        path is counter-clockwise, negative means it is clockwise."""
+        return self._moments()[0]
 
     @property
     def area(self) -> float:
-        """Approximates the area under a closed path by flattening and treating as a
-        polygon. Returns the unsigned area. Use :py:meth:`signed_area` if you want
-        the signed area."""
+        """Returns the exact unsigned area of a closed path. Use
+        :py:meth:`signed_area` if you want the signed area."""
         return abs(self.signed_area)
 
     @property
@@ -610,20 +948,46 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
 
     @property
     def centroid(self) -> Optional[Point]:
-        """Returns the centroid of the path's bounding box, or
-        None if the path is open.
+        """Returns the centroid (center of area) of the path, or
+        None if the path is open. If the path encloses no area,
+        the centroid of its bounding box is returned instead.
         """
         if not self.closed:
             return None
-        return self.bounds().centroid  # Really?
+        a, mx, my = self._moments()[0:3]
+        if a == 0:
+            return self.bounds().centroid
+        return Point(mx / a, my / a)
+
+    @property
+    def secondMomentsOfArea(self) -> Optional[Tuple[float, float, float]]:
+        """Returns the second moments of area of a closed path about its
+        centroid, as a tuple ``(Ixx, Iyy, Ixy)``: the integrals over the
+        enclosed area of the squared distance from the horizontal axis, the
+        squared distance from the vertical axis, and their product. Returns
+        None if the path is open or encloses no area."""
+        a, mx, my, xx, yy, xy = self._moments()
+        if not self.closed or a == 0:
+            return None
+        # Moments of a clockwise path come out negated, like its area
+        sign = math.copysign(1, a)
+        cx, cy = mx / a, my / a
+        return (
+            sign * (yy - a * cy * cy),
+            sign * (xx - a * cx * cx),
+            sign * (xy - a * cx * cy),
+        )
 
-    def drawWithBrush(self, other: "BezierPath") -> List["BezierPath"]:
+    def drawWithBrush(
+        self, other: "BezierPath", tolerance: float = 0.5
+    ) -> List["BezierPath"]:
         """Assuming that `other` is a closed Bezier path representing a pen or
         brush of a certain shape and that `self` is an open path, this method
         traces the brush along the path, returning an array of Bezier paths.
 
         `other` may also be a function which, given a time `t` (0-1), returns a closed
-        path representing the shape of the brush at the given time.
+        path representing the shape of the brush at the given time. The brush
+        is flattened to within `tolerance` of its outline.
 
         This requires the `shapely` library to be installed.
         """
@@ -650,7 +1014,7 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
 
         t = 0
         for n in samples:
-            brushHere = brush(t).clone().flatten()
+            brushHere = brush(t).clone().flatten(tolerance=tolerance)
             brushHere.translate(n - brushHere.centroid)
             polys.append(Polygon([(x[0].x, x[0].y) for x in brushHere.asSegments()]))
             t = t + 1.0 / len(samples)
@@ -674,6 +1038,7 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
         for i, s in enumerate(segs):
             if len(s) == 3:
                 segs[i] = s.toCubicBezier()
+        self.activeRepresentation = SegmentRepresentation(self, segs)
         return self
 
     def thicknessAtX(path, x: float) -> Optional[float]:
@@ -681,9 +1046,7 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
         bounds = path.bounds()
         bounds.addMargin(10)
         ray = Line(Point(x - 0.1, bounds.bottom), Point(x + 0.1, bounds.top))
-        intersections = []
-        for seg in path.asSegments():
-            intersections.extend(seg.intersections(ray))
+        intersections = path.segmentIndex().rayIntersections(ray)
         if len(intersections) < 2:
             return None
         intersections = list(sorted(intersections, key=lambda i: i.point.y))
@@ -719,18 +1082,13 @@ class BezierPath(BooleanOperationsMixin, SampleMixin, object):
         Returns: ``distance, t1, t2, seg1, seg2``."""
         from beziers.utils.curvedistance import curveDistance
 
-        segs1 = self.asSegments()
-        segs2 = other.asSegments()
+        index = other.segmentIndex()
         minDistance = None
         # Find closest segment pair.
-        for s1 in segs1:
-            samples1 = s1.sample(samples)
-            for s2 in segs2:
-                samples2 = s2.sample(samples)
-                d = min(
-                    [p1.squareDistanceFrom(p2) for p1 in samples1 for p2 in samples2]
-                )
-                if not minDistance or d < minDistance:
+        for s1 in self.asSegments():
+            for p1 in s1.sample(samples):
+                s2, _, d = index.nearest(p1)
+                if minDistance is None or d < minDistance:
                     minDistance = d
                     closestPair = (s1, s2)
         c = curveDistance(closestPair[0], closestPair[1])
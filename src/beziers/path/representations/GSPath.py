@@ -12,5 +12,8 @@ class GSPathRepresentation(object):
             self.nodes = gspath.nodes
             path.closed = gspath.closed
 
+    def snapshot(self):
+        return [(n.position.x, n.position.y, n.type) for n in self.nodes]
+
     def toNodelist(self):
         return list(map(lambda n: Node(n.position.x, n.position.y, n.type), self.nodes))
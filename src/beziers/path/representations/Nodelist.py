@@ -31,6 +31,11 @@ class NodelistRepresentation(object):
     def data(self):
         return self.nodes
 
+    def snapshot(self):
+        """Returns the co-ordinates and type of every node, for noticing
+        when the nodes have been edited in place."""
+        return [(n.point.x, n.point.y, n.type) for n in self.nodes]
+
     def toNodelist(self):
         return self.nodes
 
@@ -0,0 +1,134 @@
+from array import array
+
+from beziers.cubicbezier import CubicBezier
+from beziers.line import Line
+from beziers.path.representations.Nodelist import Node
+from beziers.point import Point
+from beziers.quadraticbezier import QuadraticBezier
+
+# Verbs are the order of the segment, i.e. the number of points it has.
+LINE = 2
+QUADRATIC = 3
+CUBIC = 4
+
+_segmentClasses = {LINE: Line, QUADRATIC: QuadraticBezier, CUBIC: CubicBezier}
+
+
+class PackedRepresentation(object):
+    """A compact representation of a path, holding all of its coordinates
+    in a single flat buffer of doubles plus one byte per segment describing
+    the segment type. This is much lighter in memory than a list of
+    `Segment` objects each holding a list of `Point` objects, and is useful
+    when you need to keep a great many paths around.
+
+    The coordinate buffer holds the start point of the path followed by
+    the remaining points of each segment in turn, so that the end point of
+    one segment is shared with the start of the next::
+
+      coords = [x0, y0, x1, y1, ...]
+      verbs = [4, 2, 4] # cubic, line, cubic
+
+    As with the segment representation, a closed path includes its closing
+    segment.
+
+    The buffers may also be `memoryview` objects (for instance, views onto
+    shared memory), which are used in place rather than copied."""
+
+    def __init__(self, path, coords=None, verbs=None):
+        self.path = path
+        from beziers.path import BezierPath
+
+        assert isinstance(path, BezierPath)
+        self.coords = array("d")
+        self.verbs = array("B")
+        if coords is not None:
+            if isinstance(coords, (array, memoryview)):
+                self.coords = coords
+            else:
+                self.coords = array("d", coords)
+        if verbs is not None:
+            if isinstance(verbs, (array, memoryview)):
+                self.verbs = verbs
+            else:
+                self.verbs = array("B", verbs)
+
+    def data(self):
+        return (self.coords, self.verbs)
+
+    def snapshot(self):
+        """Returns a copy of the buffers' contents, for noticing when they
+        have been edited in place."""
+        return (bytes(self.coords), bytes(self.verbs))
+
+    def __len__(self):
+        return len(self.verbs)
+
+    def points(self):
+        """Returns an iterator of (x, y) tuples over the packed coordinates."""
+        coords = self.coords
+        return zip(coords[0::2], coords[1::2])
+
+    def toSegments(self):
+        """Materializes the path as a list of `Segment` objects."""
+        coords = self.coords
+        segments = []
+        if not self.verbs:
+            return segments
+        start = Point(coords[0], coords[1])
+        ix = 2
+        for verb in self.verbs:
+            pts = [start]
+            for _ in range(1, verb):
+                pts.append(Point(coords[ix], coords[ix + 1]))
+                ix += 2
+            segments.append(_segmentClasses[verb](*pts))
+            start = pts[-1]
+        return segments
+
+    def toNodelist(self):
+        coords = self.coords
+        nodelist = []
+        if not self.verbs:
+            return nodelist
+        if self.verbs[0] == LINE:
+            nodelist.append(Node(coords[0], coords[1], "line"))
+        else:
+            nodelist.append(Node(coords[0], coords[1], "curve"))
+        ix = 2
+        for verb in self.verbs:
+            for _ in range(2, verb):
+                nodelist.append(Node(coords[ix], coords[ix + 1], "offcurve"))
+                ix += 2
+            if verb == LINE:
+                nodelist.append(Node(coords[ix], coords[ix + 1], "line"))
+            else:
+                nodelist.append(Node(coords[ix], coords[ix + 1], "curve"))
+            ix += 2
+        return nodelist
+
+    @classmethod
+    def fromSegments(cls, path, segments):
+        self = cls(path)
+        if not segments:
+            return self
+        coords = self.coords
+        verbs = self.verbs
+        first = segments[0][0]
+        coords.append(first.x)
+        coords.append(first.y)
+        for seg in segments:
+            points = seg.points
+            if len(points) not in _segmentClasses:
+                raise ValueError("Unknown segment type")
+            verbs.append(len(points))
+            for pt in points[1:]:
+                coords.append(pt.x)
+                coords.append(pt.y)
+        return self
+
+    @classmethod
+    def fromNodelist(cls, path, nodelist):
+        from beziers.path.representations.Segment import SegmentRepresentation
+
+        segs = SegmentRepresentation.fromNodelist(path, nodelist).data()
+        return cls.fromSegments(path, segs)
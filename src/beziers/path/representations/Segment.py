@@ -19,6 +19,15 @@ class SegmentRepresentation(object):
     def data(self):
         return self.segments
 
+    def snapshot(self):
+        """Returns the co-ordinates of every segment, for noticing when the
+        segments have been edited in place."""
+        segs = self.segments
+        return (
+            [len(seg.points) for seg in segs],
+            [(p.x, p.y) for seg in segs for p in seg.points],
+        )
+
     def toNodelist(self):
         first = self.segments[0][0]
         nodelist = []
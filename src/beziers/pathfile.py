@@ -0,0 +1,276 @@
+"""
+Reads and writes collections of paths in a compact binary format, for
+caching processed outlines on disk::
+
+    from beziers.pathfile import dump, load, PathFile
+
+    with open("outlines.bzp", "wb") as f:
+        dump(paths, f)
+    with open("outlines.bzp", "rb") as f:
+        paths = load(f)
+
+    # Or map the file and read only the paths you need
+    with PathFile("outlines.bzp") as pf:
+        path = pf[42]
+
+A file holds the packed form of each path (see
+:py:class:`PackedRepresentation`), little-endian, laid out as::
+
+    header        magic "BZPF", uint16 format version, uint16 flags,
+                  int64 paths, int64 co-ordinates, int64 verbs
+    coordOffsets  (paths + 1) x int64
+    verbOffsets   (paths + 1) x int64
+    closed        uint8 closed flag of each path
+    verbs         uint8 verbs of every path, one after another
+    (padding to a multiple of eight bytes)
+    coords        float64 (or float32) co-ordinates of every path
+
+If the ``FLOAT32`` flag is set, co-ordinates are stored as float32, which
+halves the size of the file at the cost of precision.
+"""
+
+import mmap
+import struct
+import sys
+import weakref
+from array import array
+
+from beziers.path import BezierPath
+
+MAGIC = b"BZPF"
+FORMAT_VERSION = 1
+FLOAT32 = 1
+
+_header = struct.Struct("<4sHHqqq")
+_bigEndian = sys.byteorder == "big"
+
+
+def _littleEndian(a):
+    if _bigEndian:
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a
+
+
+def _padding(size):
+    return -size % 8
+
+
+def _serialize(paths, precision):
+    # Returns the parts of the serialization of `paths`, to be written out
+    # one after another
+    if precision not in ("double", "single"):
+        raise ValueError("Unknown precision %s" % precision)
+    coordOffsets = array("q", [0])
+    verbOffsets = array("q", [0])
+    closed = array("B")
+    verbs = array("B")
+    coords = array("f" if precision == "single" else "d")
+    for path in paths:
+        c, v = path.packedCopy()
+        if precision == "single":
+            c = array("f", c)
+        coords.extend(c)
+        verbs.extend(v)
+        coordOffsets.append(len(coords))
+        verbOffsets.append(len(verbs))
+        closed.append(1 if path.closed else 0)
+    flags = FLOAT32 if precision == "single" else 0
+    header = _header.pack(
+        MAGIC, FORMAT_VERSION, flags, len(closed), len(coords), len(verbs)
+    )
+    parts = [
+        header,
+        _littleEndian(coordOffsets).tobytes(),
+        _littleEndian(verbOffsets).tobytes(),
+        closed.tobytes(),
+        verbs.tobytes(),
+    ]
+    parts.append(b"\0" * _padding(sum(len(p) for p in parts)))
+    parts.append(_littleEndian(coords).tobytes())
+    return parts
+
+
+def dumps(paths, precision="double"):
+    """Returns the binary serialization of `paths` as bytes.
+
+    Args:
+        paths: An iterable of `BezierPath` objects.
+        precision (str): ``"double"`` to store co-ordinates as float64,
+            ``"single"`` to store them as float32.
+    """
+    return b"".join(_serialize(paths, precision))
+
+
+def dump(paths, fp, precision="double"):
+    """Writes the binary serialization of `paths` to the binary file `fp`.
+    See :py:func:`dumps`."""
+    for part in _serialize(paths, precision):
+        fp.write(part)
+
+
+def _layout(buf):
+    # Returns the flags, path count and the byte offset and item count of
+    # each table in `buf`
+    if len(buf) < _header.size:
+        raise ValueError("Not a path file: too short")
+    magic, version, flags, count, ncoords, nverbs = _header.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError("Not a path file")
+    if version != FORMAT_VERSION:
+        raise ValueError("Unknown path file format version %i" % version)
+    pos = _header.size
+    tables = {}
+    for name, length, size in (
+        ("coordOffsets", count + 1, 8),
+        ("verbOffsets", count + 1, 8),
+        ("closed", count, 1),
+        ("verbs", nverbs, 1),
+    ):
+        tables[name] = (pos, length)
+        pos += length * size
+    pos += _padding(pos)
+    itemsize = 4 if flags & FLOAT32 else 8
+    tables["coords"] = (pos, ncoords)
+    if len(buf) < pos + ncoords * itemsize:
+        raise ValueError("Truncated path file")
+    return flags, count, tables
+
+
+def _table(buf, tables, name, typecode):
+    start, length = tables[name]
+    a = array(typecode)
+    a.frombytes(buf[start : start + length * a.itemsize])
+    if _bigEndian:
+        a.byteswap()
+    return a
+
+
+def loads(data):
+    """Returns the list of paths serialized in the bytes-like object `data`."""
+    flags, count, tables = _layout(data)
+    coordOffsets = _table(data, tables, "coordOffsets", "q")
+    verbOffsets = _table(data, tables, "verbOffsets", "q")
+    closed = _table(data, tables, "closed", "B")
+    verbs = _table(data, tables, "verbs", "B")
+    coords = _table(data, tables, "coords", "f" if flags & FLOAT32 else "d")
+    paths = []
+    for i in range(0, count):
+        c = coords[coordOffsets[i] : coordOffsets[i + 1]]
+        if flags & FLOAT32:
+            c = array("d", c)
+        v = verbs[verbOffsets[i] : verbOffsets[i + 1]]
+        paths.append(BezierPath.fromPacked(c, v, bool(closed[i])))
+    return paths
+
+
+def load(fp):
+    """Reads the list of paths serialized in the binary file `fp`."""
+    return loads(fp.read())
+
+
+class PathBuffer(object):
+    """Read-only access to the paths serialized by :py:func:`dumps` in a
+    buffer, such as a mapped file or a shared memory block, reading only
+    the paths that are asked for. This is the base of `PathFile` and of
+    :py:class:`beziers.sharedpaths.SharedPaths`.
+
+    The paths returned use the buffer directly where they can, so they
+    must not be used once it is released; take a copy with `clone` if you
+    need to keep one."""
+
+    def __init__(self, buf):
+        self._buf = memoryview(buf).toreadonly()
+        self._views = [self._buf]
+        # Weak references to the views handed out to paths, which are
+        # pruned of dead references whenever their number doubles
+        self._lent = []
+        self._lentLimit = 64
+        self._flags, self._count, tables = _layout(self._buf)
+        self.coordOffsets = self._view(tables, "coordOffsets", "q")
+        self.verbOffsets = self._view(tables, "verbOffsets", "q")
+        self.closed = self._view(tables, "closed", "B")
+        self.verbs = self._view(tables, "verbs", "B")
+        self.coords = self._view(
+            tables, "coords", "f" if self._flags & FLOAT32 else "d"
+        )
+
+    def _view(self, tables, name, typecode):
+        if _bigEndian and typecode != "B":
+            return _table(self._buf, tables, name, typecode)
+        start, length = tables[name]
+        raw = self._buf[start : start + length * array(typecode).itemsize]
+        view = raw.cast(typecode)
+        self._views.extend([raw, view])
+        return view
+
+    def _lend(self, view):
+        # Keeps track of a view given to a path, so that it can be released
+        # along with the buffer even if the path is still alive
+        if isinstance(view, memoryview):
+            self._lent.append(weakref.ref(view))
+            if len(self._lent) >= 2 * self._lentLimit:
+                self._lent = [ref for ref in self._lent if ref() is not None]
+                self._lentLimit = max(len(self._lent), 64)
+        return view
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("path index out of range")
+        coords = self.coords[self.coordOffsets[i] : self.coordOffsets[i + 1]]
+        if self._flags & FLOAT32:
+            coords = array("d", coords)
+        verbs = self.verbs[self.verbOffsets[i] : self.verbOffsets[i + 1]]
+        return BezierPath.fromPacked(
+            self._lend(coords), self._lend(verbs), bool(self.closed[i])
+        )
+
+    def __iter__(self):
+        for i in range(0, self._count):
+            yield self[i]
+
+    def release(self):
+        """Releases every view onto the buffer, including those held by
+        paths read from it, which can no longer be used afterwards."""
+        for ref in self._lent:
+            view = ref()
+            if view is not None:
+                view.release()
+        self._lent = []
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+
+
+class PathFile(PathBuffer):
+    """A memory-mapped reader for a file written by :py:func:`dump`, which
+    reads only the paths that are asked for::
+
+        with PathFile("outlines.bzp") as pf:
+            print(len(pf), pf[42].bounds())
+
+    The paths returned use the mapped file directly where they can, so
+    they must not be used once the file is closed; take a copy with
+    `clone` if you need to keep one."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        super().__init__(self._mmap)
+
+    def close(self):
+        """Unmaps the file. Any paths read from it can no longer be used."""
+        self.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -38,6 +38,9 @@ class QuadraticBezier(ArcLengthMixin, Segment):
         )
         return Point(x, y)
 
+    def _basis(self, t):
+        return ((1 - t) * (1 - t), 2 * (1 - t) * t, t * t)
+
     def tOfPoint(self, p):
         """Returns the time t (0->1) of a point on the curve."""
         xroots = quadraticRoots(
@@ -66,10 +69,18 @@ class QuadraticBezier(ArcLengthMixin, Segment):
         return (QuadraticBezier(self[0], p4, p7), QuadraticBezier(p7, p5, self[2]))
 
     def derivative(self):
-        """Returns a `Line` representing the derivative of this curve."""
-        return Line((self[1] - self[0]) * 2, (self[2] - self[1]) * 2)
+        """Returns a `Line` representing the derivative of this curve.
+        The result is cached, so treat it as read-only."""
+        return self._derived(
+            "derivative",
+            lambda: Line((self[1] - self[0]) * 2, (self[2] - self[1]) * 2),
+        )
 
-    def flatten(self, degree=8):
+    def flatten(self, degree=8, tolerance=None):
+        """Flattens the curve into a list of `Line` segments. See
+        :py:meth:`CubicBezier.flatten`."""
+        if tolerance is not None:
+            return self._flattenToTolerance(tolerance)
         ss = []
         if self.length < degree:
             return [Line(self[0], self[2])]
@@ -110,7 +121,7 @@ class QuadraticBezier(ArcLengthMixin, Segment):
 
     def findExtremes(self):
         """Returns a list of time `t` values for extremes of the curve."""
-        return self._findDRoots()
+        return list(self._derived("extremes", self._findDRoots))
 
     def curvatureAtTime(self, t: float) -> float:
         """Returns the C curvature at time `t`."""
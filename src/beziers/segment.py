@@ -1,9 +1,14 @@
 from beziers.affinetransformation import AffineTransformation
 from beziers.boundingbox import BoundingBox
 from beziers.point import Point
+from beziers.utils import numpy
 from beziers.utils.intersectionsmixin import IntersectionsMixin
 from beziers.utils.samplemixin import SampleMixin
 
+# Set this to False to recompute derived geometry (lengths, bounds,
+# derivatives and so on) on every call, e.g. when debugging the cache.
+CACHE_DERIVED_GEOMETRY = True
+
 
 class Segment(IntersectionsMixin, SampleMixin, object):
     """A segment is part of a path. Although this package is called
@@ -41,6 +46,7 @@ class Segment(IntersectionsMixin, SampleMixin, object):
 
     def __setitem__(self, key, item):
         self.points[key] = item
+        self._derivedCache = None
 
     def __len__(self):
         return len(self.points)
@@ -67,6 +73,24 @@ class Segment(IntersectionsMixin, SampleMixin, object):
     def round(self) -> None:
         """Rounds the points of segment to integer coordinates."""
         self.points = [p.rounded() for p in self.points]
+        self._derivedCache = None
+
+    def _derived(self, name, compute):
+        """Returns the derived value `name`, calling `compute` to work it
+        out if it is not already cached. The cache is keyed on the
+        segment's co-ordinates, so it is thrown away whenever any point
+        is replaced or moved."""
+        if not CACHE_DERIVED_GEOMETRY:
+            return compute()
+        key = tuple([(p.x, p.y) for p in self.points])
+        cache = getattr(self, "_derivedCache", None)
+        if cache is None or cache[0] != key:
+            cache = (key, {})
+            self._derivedCache = cache
+        values = cache[1]
+        if name not in values:
+            values[name] = compute()
+        return values[name]
 
     @property
     def order(self) -> int:
@@ -93,6 +117,50 @@ class Segment(IntersectionsMixin, SampleMixin, object):
         """Returns the angle of the end of the segment in radians."""
         return (self.points[-1] - self.points[-2]).angle
 
+    def pointsAtTimes(self, ts):
+        """Returns the points at each of the times (0->1) in the sequence `ts`.
+        This is the batched equivalent of `pointAtTime`: if numpy is installed,
+        the points are returned as an N x 2 array of co-ordinates; otherwise,
+        they are returned as a list of (x, y) tuples. Either way, no `Point`
+        objects are created."""
+        np = numpy()
+        if np is None:
+            coords = []
+            for t in ts:
+                weights = self._basis(t)
+                x = y = 0.0
+                for w, p in zip(weights, self.points):
+                    x += w * p.x
+                    y += w * p.y
+                coords.append((x, y))
+            return coords
+        t = np.asarray(ts, dtype=float)
+        weights = self._basis(t)
+        x = np.zeros(t.shape)
+        y = np.zeros(t.shape)
+        for w, p in zip(weights, self.points):
+            x += w * p.x
+            y += w * p.y
+        return np.column_stack((x, y))
+
+    def _flattenToTolerance(self, tolerance):
+        # Adaptive flattening shared by the curve classes' `flatten`
+        from beziers.line import Line
+        from beziers.utils.flatten import flattenSegments
+
+        coords, _, ts = flattenSegments([self], tolerance)
+        points = [self.start]
+        for i in range(2, len(coords) - 2, 2):
+            points.append(Point(coords[i], coords[i + 1]))
+        points.append(self.end)
+        lines = []
+        for i in range(1, len(points)):
+            line = Line(points[i - 1], points[i])
+            line._orig = self
+            line._tRange = (ts[i - 1], ts[i])
+            lines.append(line)
+        return lines
+
     def tangentAtTime(self, t: float) -> Point:
         """Returns a `Point` representing the unit vector of tangent at time `t`."""
         return self.derivative().pointAtTime(t).toUnitVector()
@@ -176,6 +244,11 @@ class Segment(IntersectionsMixin, SampleMixin, object):
         s1, _ = self.splitAtTime(t)
         return s1.length
 
+    def pointAtLength(self, length: float) -> Point:
+        """Returns the point which lies the given distance along the segment
+        from its start."""
+        return self.pointAtTime(self.tAtLength(length))
+
     def reversed(self) -> "Segment":
         """Returns a new segment with the points reversed."""
         klass = self.__class__
@@ -183,6 +256,9 @@ class Segment(IntersectionsMixin, SampleMixin, object):
 
     def bounds(self) -> BoundingBox:
         """Returns a BoundingBox object for this segment."""
+        return self._derived("bounds", self._computeBounds).clone()
+
+    def _computeBounds(self) -> BoundingBox:
         bounds = BoundingBox()
         ex = self.findExtremes()
         ex.append(0)
@@ -0,0 +1,97 @@
+"""
+Shares the geometry of many paths between processes through a single
+`multiprocessing.shared_memory` block, so that worker processes can read
+the paths without anything being pickled or copied::
+
+    with SharedPaths.create(paths) as shared:
+        # Send `shared` to the workers (it pickles to just the block's
+        # name); in a worker:
+        path = shared[42]
+        print(path.bounds())
+
+The block holds the paths in the same layout as a file written by
+:py:func:`beziers.pathfile.dump` (see :py:mod:`beziers.pathfile`), read in
+the same way. Indexing returns a `BezierPath` whose packed representation
+is a read-only `memoryview` onto the block. Operations which change the
+path replace that representation with a new one, so the shared block is
+never written to.
+"""
+
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+from beziers.pathfile import PathBuffer, _serialize
+
+# Blocks which this process has created or attached to, by name, so that a
+# worker which receives the same SharedPaths many times only maps it once
+_attached = {}
+
+
+class SharedPaths(PathBuffer):
+    """A read-only collection of paths held in shared memory. Create one
+    with `SharedPaths.create`; other processes get access to it by
+    unpickling it or by calling `SharedPaths.attach` with its `name`.
+
+    The creating process owns the block, and should call `unlink` (or use
+    the object as a context manager) once every worker is done with it."""
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.name = shm.name
+        super().__init__(shm.buf)
+
+    @classmethod
+    def create(klass, paths):
+        """Copies the geometry of `paths` into a new shared memory block."""
+        parts = _serialize(paths, "double")
+        size = sum(len(part) for part in parts)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        pos = 0
+        for part in parts:
+            shm.buf[pos : pos + len(part)] = part
+            pos += len(part)
+        shared = klass(shm, owner=True)
+        _attached[shared.name] = shared
+        return shared
+
+    @classmethod
+    def attach(klass, name):
+        """Returns the SharedPaths held in the shared memory block with the
+        given name."""
+        if name not in _attached:
+            # Only the creator should unlink the block, so stop this process's
+            # resource tracker from doing so when it exits
+            if sys.version_info >= (3, 13):
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            else:
+                shm = shared_memory.SharedMemory(name=name)
+                if os.name == "posix":
+                    # The tracker knows the block by its POSIX name
+                    resource_tracker.unregister("/" + shm.name, "shared_memory")
+            _attached[name] = klass(shm, owner=False)
+        return _attached[name]
+
+    def __reduce__(self):
+        return (SharedPaths.attach, (self.name,))
+
+    def close(self):
+        """Detaches this process from the block. Any paths taken from it
+        can no longer be used: their views onto the block are released."""
+        self.release()
+        self.shm.close()
+        _attached.pop(self.name, None)
+
+    def unlink(self):
+        """Closes and destroys the block. Only the creating process should
+        call this."""
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
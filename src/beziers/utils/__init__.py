@@ -21,3 +21,51 @@ def quadraticRoots(a, b, c):
         if 0.0 <= t2 <= 1.0:
             roots.append(t2)
     return roots
+
+
+def powerBasis(c):
+    """Converts the Bernstein coefficients of one co-ordinate of a line,
+    quadratic or cubic Bezier (that is, the co-ordinates of its control
+    points) into power basis coefficients, constant term first."""
+    if len(c) == 2:
+        return (c[0], c[1] - c[0])
+    if len(c) == 3:
+        return (c[0], 2 * (c[1] - c[0]), c[0] - 2 * c[1] + c[2])
+    return (
+        c[0],
+        3 * (c[1] - c[0]),
+        3 * (c[0] - 2 * c[1] + c[2]),
+        -c[0] + 3 * c[1] - 3 * c[2] + c[3],
+    )
+
+
+_numpy = False
+
+
+def numpy():
+    """Returns the `numpy` module if it is installed, or None if it is not.
+    The import is deferred until the first call, so that numpy remains an
+    optional dependency; callers should fall back to pure Python on None."""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        _numpy = np
+    return _numpy
+
+
+_pyclipper = None
+
+
+def pyclipper():
+    """Returns the `pyclipper` module, which the boolean operations are
+    built on. It is imported on first use rather than when `beziers.path`
+    is imported, so that programs which never clip paths don't load it."""
+    global _pyclipper
+    if _pyclipper is None:
+        import pyclipper as clipper
+
+        _pyclipper = clipper
+    return _pyclipper
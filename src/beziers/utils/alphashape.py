@@ -1,9 +1,3 @@
-import numpy as np
-import shapely.geometry as geometry
-from scipy.spatial import Delaunay
-from shapely.ops import cascaded_union, polygonize
-
-
 def alpha_shape(points, alpha):
     """
     Compute the alpha shape (concave hull) of a set
@@ -14,6 +8,12 @@ def alpha_shape(points, alpha):
         don't fall inward as much as larger numbers.
         Too large, and you lose everything!
     """
+    # numpy, shapely and scipy are optional, so only import them when needed
+    import numpy as np
+    import shapely.geometry as geometry
+    from scipy.spatial import Delaunay
+    from shapely.ops import cascaded_union, polygonize
+
     if len(points) < 4:
         # When you have a triangle, there is no sense
         # in computing an alpha shape.
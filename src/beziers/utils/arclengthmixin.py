@@ -1,17 +1,121 @@
 import math
+from bisect import bisect_right
 
-from beziers.utils.legendregauss import Cvalues, Tvalues
+from beziers.utils.legendregauss import Cvalues5, Tvalues5
+
+# Largest estimated error of an entry in the arc length table, relative to
+# the size of the curve. Each entry's length is then accurate to much better
+# than this, as it is the sum of two halves more accurate than the estimate.
+ARC_LENGTH_TOLERANCE = 1e-8
 
 
 class ArcLengthMixin:
     @property
     def length(self):
-        d = self.derivative()
-        z = 0.5
+        """The length of the curve. This is the last entry of the arc length
+        table, so that `tAtLength` maps it exactly to the end of the curve."""
+        return self._arcLengthTable()[2][-1]
+
+    def _hodograph(self):
+        # Control points of the derivative, as plain (x, y) tuples
+        n = len(self.points) - 1
+        return [
+            (n * (b.x - a.x), n * (b.y - a.y))
+            for a, b in zip(self.points, self.points[1:])
+        ]
+
+    def _speedAtTime(self, hodograph, t):
+        if len(hodograph) == 3:
+            # The derivative of a cubic, evaluated directly
+            (x0, y0), (x1, y1), (x2, y2) = hodograph
+            mt = 1 - t
+            a, b, c = mt * mt, 2 * mt * t, t * t
+            x = a * x0 + b * x1 + c * x2
+            y = a * y0 + b * y1 + c * y2
+            return math.sqrt(x * x + y * y)
+        # de Casteljau on the derivative's control points
+        pts = hodograph
+        while len(pts) > 1:
+            pts = [
+                (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+                for a, b in zip(pts, pts[1:])
+            ]
+        return math.sqrt(pts[0][0] * pts[0][0] + pts[0][1] * pts[0][1])
+
+    def _integrateSpeed(self, hodograph, a, b):
+        z = 0.5 * (b - a)
         _sum = 0
-        for i in range(0, len(Tvalues)):
-            t = z * Tvalues[i] + z
-            p = d.pointAtTime(t)
-            arc = math.sqrt(p.x * p.x + p.y * p.y)
-            _sum += Cvalues[i] * arc
+        for i in range(0, len(Tvalues5)):
+            _sum += Cvalues5[i] * self._speedAtTime(hodograph, z * Tvalues5[i] + z + a)
         return _sum * z
+
+    def _buildArcLengthTable(self, hodograph):
+        size = sum(math.sqrt(x * x + y * y) for x, y in hodograph)
+        tolerance = ARC_LENGTH_TOLERANCE * max(size, 1.0)
+        ts = [0.0]
+        lengths = [0.0]
+
+        def refine(a, b, whole, depth):
+            m = 0.5 * (a + b)
+            left = self._integrateSpeed(hodograph, a, m)
+            right = self._integrateSpeed(hodograph, m, b)
+            if depth < 20 and abs(left + right - whole) > tolerance * (b - a):
+                refine(a, m, left, depth + 1)
+                refine(m, b, right, depth + 1)
+            else:
+                ts.append(b)
+                lengths.append(lengths[-1] + left + right)
+
+        # Start from a uniform split so that interpolation between entries
+        # is a fair first guess for Newton's method even on gentle curves
+        steps = 4
+        for i in range(0, steps):
+            a, b = i / float(steps), (i + 1) / float(steps)
+            refine(a, b, self._integrateSpeed(hodograph, a, b), 0)
+        return ts, lengths
+
+    def _arcLengthTable(self):
+        """Returns a tuple of (t values, cumulative lengths) for this curve.
+        The table is built once and cached until the curve's points change."""
+
+        def build():
+            hodograph = self._hodograph()
+            ts, lengths = self._buildArcLengthTable(hodograph)
+            return hodograph, ts, lengths
+
+        return self._derived("arcLengthTable", build)
+
+    def lengthAtTime(self, t):
+        """Returns the length of the subset of the curve from the start
+        up to the point t (0->1), where 1 is the end of the whole curve."""
+        hodograph, ts, lengths = self._arcLengthTable()
+        if t <= 0:
+            return 0.0
+        if t >= 1:
+            return lengths[-1]
+        i = bisect_right(ts, t) - 1
+        return lengths[i] + self._integrateSpeed(hodograph, ts[i], t)
+
+    def tAtLength(self, length):
+        """Returns the time t (0->1) at which the curve has the given
+        length from its start. This is the inverse of `lengthAtTime`."""
+        hodograph, ts, lengths = self._arcLengthTable()
+        if length <= 0:
+            return 0.0
+        if length >= lengths[-1]:
+            return 1.0
+        i = bisect_right(lengths, length) - 1
+        t0, t1 = ts[i], ts[i + 1]
+        t = t0 + (t1 - t0) * (length - lengths[i]) / (lengths[i + 1] - lengths[i])
+        # Polish with Newton's method; ds/dt is the speed of the curve
+        for _ in range(0, 8):
+            speed = self._speedAtTime(hodograph, t)
+            if speed == 0:
+                break
+            error = lengths[i] + self._integrateSpeed(hodograph, t0, t) - length
+            newT = min(max(t - error / speed, t0), t1)
+            if abs(newT - t) < 1e-12:
+                t = newT
+                break
+            t = newT
+        return t
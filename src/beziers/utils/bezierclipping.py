@@ -0,0 +1,194 @@
+"""
+Curve/curve intersection by Bezier clipping, after Sederberg and Nishita,
+"Curve intersection using Bezier clipping", *Computer-Aided Design*
+22(9) 1990, 538-549.
+
+Each curve is bounded by a "fat line": the line through its end points,
+widened to take in all of its control points. The other curve's control
+points are measured against that line, and the convex hull of those
+distances tells us which part of the other curve's parameter range could
+possibly lie inside the fat line. Everything else is clipped away. The
+two curves take turns clipping each other, which converges quadratically
+for transversal intersections. When a clip fails to remove at least a
+fifth of a curve (usually because there are several intersections), the
+longer curve is split in half and each half is handled separately.
+
+The functions here work on lists of (x, y) tuples rather than `Segment`
+objects, so that the inner loop does not allocate `Point`s.
+"""
+
+import math
+
+# Stop when both parameter intervals are narrower than this
+TOLERANCE = 1e-9
+# Widen fat lines by this much so rounding error can't lose intersections
+# which lie exactly on their edges, such as shared end points. (These are
+# found here, but `Segment.intersections` drops intersections at the very
+# ends of either curve unless it is called with limited=False.)
+SLACK = 1e-9
+# Split rather than clip if clipping leaves more than this much of a curve
+MIN_REDUCTION = 0.8
+MAX_DEPTH = 100
+# Give up after this many clipping steps. Only curves which overlap along
+# a stretch (rather than crossing at points) come anywhere near this.
+MAX_STEPS = 5000
+
+
+def _subdivide(points, t0, t1):
+    """Returns the control points of the part of the curve between t0 and t1."""
+
+    def split(pts, t):
+        left = [pts[0]]
+        right = [pts[-1]]
+        while len(pts) > 1:
+            pts = [
+                (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+                for a, b in zip(pts, pts[1:])
+            ]
+            left.append(pts[0])
+            right.append(pts[-1])
+        return left, list(reversed(right))
+
+    if t1 < 1.0:
+        points = split(points, t1)[0]
+    if t0 > 0.0:
+        points = split(points, t0 / t1 if t1 > 0 else 0.0)[1]
+    return points
+
+
+def _fatLine(points):
+    """Returns (a, b, c, dmin, dmax) such that every control point lies
+    between dmin and dmax of the line ax + by + c = 0, where a*a + b*b = 1."""
+    start, end = points[0], points[-1]
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    if dx == 0 and dy == 0:
+        # Closed or degenerate curve: use the farthest control point instead
+        far = max(points, key=lambda p: (p[0] - start[0]) ** 2 + (p[1] - start[1]) ** 2)
+        dx, dy = far[0] - start[0], far[1] - start[1]
+        if dx == 0 and dy == 0:
+            return None
+    length = math.hypot(dx, dy)
+    a, b = -dy / length, dx / length
+    c = -(a * start[0] + b * start[1])
+    distances = [a * p[0] + b * p[1] + c for p in points]
+    dmin = min(0.0, min(distances)) - SLACK
+    dmax = max(0.0, max(distances)) + SLACK
+    return a, b, c, dmin, dmax
+
+
+def _clip(fat, points):
+    """Returns the (t0, t1) range of `points` which may lie within the fat
+    line, or None if none of it does."""
+    a, b, c, dmin, dmax = fat
+    n = len(points) - 1
+    hull = [(i / float(n), a * p[0] + b * p[1] + c) for i, p in enumerate(points)]
+    tmin, tmax = None, None
+
+    def candidate(t):
+        nonlocal tmin, tmax
+        if tmin is None or t < tmin:
+            tmin = t
+        if tmax is None or t > tmax:
+            tmax = t
+
+    # The extremes of the part of the convex hull inside the band are found
+    # on its edges, and every hull edge joins two of the control points.
+    for i, (ti, di) in enumerate(hull):
+        if dmin <= di <= dmax:
+            candidate(ti)
+        for tk, dk in hull[i + 1 :]:
+            if di == dk:
+                continue
+            for level in (dmin, dmax):
+                if min(di, dk) <= level <= max(di, dk):
+                    candidate(ti + (tk - ti) * (level - di) / (dk - di))
+    if tmin is None:
+        return None
+    return max(tmin, 0.0), min(tmax, 1.0)
+
+
+def _boundsOverlap(p, q):
+    return not (
+        max(x for x, _ in p) < min(x for x, _ in q)
+        or max(x for x, _ in q) < min(x for x, _ in p)
+        or max(y for _, y in p) < min(y for _, y in q)
+        or max(y for _, y in q) < min(y for _, y in p)
+    )
+
+
+def _coincident(p, q):
+    return len(p) == len(q) and all(
+        abs(a[0] - b[0]) <= SLACK and abs(a[1] - b[1]) <= SLACK for a, b in zip(p, q)
+    )
+
+
+def _halves(points, prange):
+    mid = 0.5 * (prange[0] + prange[1])
+    return [
+        (_subdivide(points, 0.0, 0.5), (prange[0], mid)),
+        (_subdivide(points, 0.5, 1.0), (mid, prange[1])),
+    ]
+
+
+def _intersect(p, prange, q, qrange, depth, results, budget):
+    # p and q are the control points of the current pieces of the two
+    # curves; prange and qrange are the parameter ranges they cover on the
+    # original curves. Appends (t on p's curve, t on q's curve) to results.
+    # budget is a one-element list counting down the steps remaining.
+    budget[0] -= 1
+    if budget[0] < 0:
+        return
+    if prange[1] - prange[0] < TOLERANCE and qrange[1] - qrange[0] < TOLERANCE:
+        # Converged. (Don't test the bounds first: by now they are so small
+        # that rounding error alone can push them apart.)
+        results.append((sum(prange) / 2.0, sum(qrange) / 2.0))
+        return
+    if not _boundsOverlap(p, q):
+        return
+    if depth > MAX_DEPTH:
+        results.append((sum(prange) / 2.0, sum(qrange) / 2.0))
+        return
+    fat = _fatLine(p)
+    if fat is None:
+        clipped = (0.0, 1.0)
+    else:
+        clipped = _clip(fat, q)
+        if clipped is None:
+            return
+    t0, t1 = clipped
+    width = qrange[1] - qrange[0]
+    q = _subdivide(q, t0, t1)
+    qrange = (qrange[0] + width * t0, qrange[0] + width * t1)
+    depth += 1
+    if t1 - t0 > MIN_REDUCTION:
+        # Not converging; split whichever piece is longer in parameter space
+        if prange[1] - prange[0] > qrange[1] - qrange[0]:
+            for half, halfrange in _halves(p, prange):
+                _intersect(half, halfrange, q, qrange, depth, results, budget)
+        else:
+            for half, halfrange in _halves(q, qrange):
+                _intersect(p, prange, half, halfrange, depth, results, budget)
+        return
+    # Now let q clip p
+    swapped = []
+    _intersect(q, qrange, p, prange, depth, swapped, budget)
+    results.extend((t1, t2) for t2, t1 in swapped)
+
+
+def curveCurveIntersections(p, q):
+    """Returns a sorted list of (t1, t2) pairs at which the curves with
+    control points `p` and `q` (lists of (x, y) tuples) intersect."""
+    p, q = list(p), list(q)
+    if _coincident(p, q) or _coincident(p, q[::-1]):
+        # The same curve: it meets itself everywhere, not at points
+        return []
+    results = []
+    _intersect(p, (0.0, 1.0), q, (0.0, 1.0), 0, results, [MAX_STEPS])
+    results.sort()
+    # Merge duplicates found in neighbouring pieces
+    merged = []
+    for t1, t2 in results:
+        if merged and abs(t1 - merged[-1][0]) < 1e-6 and abs(t2 - merged[-1][1]) < 1e-6:
+            continue
+        merged.append((t1, t2))
+    return merged
@@ -1,11 +1,21 @@
 import logging
-
-import pyclipper
+from array import array
 
 from beziers.line import Line
 from beziers.path.representations.Segment import SegmentRepresentation
 from beziers.point import Point
+from beziers.utils import pyclipper
 from beziers.utils.intersectionsmixin import Intersection
+from beziers.utils.bvh import closestPointOnSegment
+from beziers.utils.flatten import flattenSegments
+from beziers.utils.linesweep import overlapping_pairs
+
+# Maximum distance between a curve and the lines it is flattened into
+# before being handed to the polygon clipper
+CLIP_FLATTEN_TOLERANCE = 0.05
+
+# Clipper works in integers, so co-ordinates are scaled up by this much
+PRECISION = 100.0
 
 
 class BooleanOperationsMixin:
@@ -24,11 +34,11 @@ class BooleanOperationsMixin:
                 and loops[1] < 1
             ):
                 intersections.append(Intersection(seg, loops[0], seg, loops[1]))
-        for i1 in range(0, len(segs)):
-            for i2 in range(i1 + 1, len(segs)):
-                for i in segs[i1].intersections(segs[i2]):
-                    if i.t1 > 1e-2 and i.t1 < 1 - 1e-2:
-                        intersections.append(i)
+        # Only segments whose bounding boxes overlap can intersect
+        for i1, i2 in overlapping_pairs([seg.bounds() for seg in segs]):
+            for i in segs[i1].intersections(segs[i2]):
+                if i.t1 > 1e-2 and i.t1 < 1 - 1e-2:
+                    intersections.append(i)
         return intersections
 
     def removeOverlap(self):
@@ -94,106 +104,293 @@ class BooleanOperationsMixin:
         self.activeRepresentation = SegmentRepresentation(self, newsegs)
 
     def clip(self, clip, cliptype, flat=False):
-        splitlist1 = []
-        splitlist2 = []
-        intersections = {}
-        cloned = self.clone()
-        clip = clip.clone()
-
-        # Split all segments at intersections
-        for s1 in self.asSegments():
-            for s2 in clip.asSegments():
-                for i in s1.intersections(s2):
-                    if i.t1 > 1e-8 and i.t1 < 1 - 1e-8:
-                        if i.seg1 == s1:
-                            splitlist1.append((i.seg1, i.t1))
-                            splitlist2.append((i.seg2, i.t2))
-                        else:
-                            splitlist2.append((i.seg1, i.t1))
-                            splitlist1.append((i.seg2, i.t2))
-                        intersections[i.point] = i
-
-        logging.debug("Split list: %s" % splitlist1)
-        logging.debug("Split list 2: %s" % splitlist2)
-        cloned.splitAtPoints(splitlist1)
-        clip.splitAtPoints(splitlist2)
-        logging.debug("Self:")
-        logging.debug(cloned.asSegments())
-        logging.debug("Clip:")
-        logging.debug(clip.asSegments())
-
-        segs1unflattened = cloned.asSegments()
-        segs2unflattened = clip.asSegments()
-
-        # Replace with flattened versions, building a dictionary of originals
-        segs1 = []
-        reconstructionLUT = {}
-        precision = 100.0
-
-        def fillLUT(flats):
-            for line in flats:
-                key = (
-                    (line.start * precision).rounded(),
-                    (line.end * precision).rounded(),
-                )
-                reconstructionLUT[key] = line._orig or line
-                key2 = (
-                    (line.end * precision).rounded(),
-                    (line.start * precision).rounded(),
-                )
-                reconstructionLUT[key2] = (line._orig or line).reversed()
-
-        for s in segs1unflattened:
-            flats = s.flatten(2)
-            fillLUT(flats)
-            segs1.extend(flats)
-
-        segs2 = []
-        for s in segs2unflattened:
-            flats = s.flatten(2)
-            fillLUT(flats)
-            segs2.extend(flats)
-
-        # Leave it to the professionals
-        subj = [(s[0].x * precision, s[0].y * precision) for s in segs1]
-        clip = [(s[0].x * precision, s[0].y * precision) for s in segs2]
-        pc = pyclipper.Pyclipper()
-        pc.AddPath(clip, pyclipper.PT_CLIP, True)
-        pc.AddPath(subj, pyclipper.PT_SUBJECT, True)
-        paths = pc.Execute(cliptype, pyclipper.PFT_EVENODD, pyclipper.PFT_EVENODD)
-        outpaths = []
-
-        # Now reconstruct Bezier segments from flattened paths
-        def pairwise(points):
-            a = (p for p in points)
-            b = (p for p in points)
-            next(b)
-            for curpoint, nextpoint in zip(a, b):
-                yield curpoint, nextpoint
-
-        from beziers.path import BezierPath
-
-        for p in paths:
-            newpath = []
-            for scaledstart, scaledend in pairwise(p):
-                key = (Point(*scaledstart), Point(*scaledend))
-                if key in reconstructionLUT and not flat:
-                    orig = reconstructionLUT[key]
-                    if len(newpath) == 0 or newpath[-1] != orig:
-                        newpath.append(orig)
-                else:
-                    newpath.append(Line(key[0] / precision, key[1] / precision))
-            outpaths.append(BezierPath.fromSegments(newpath))
-        return outpaths
+        return _booleanOperation(
+            [self], [clip], cliptype, pyclipper().PFT_EVENODD, flat
+        )
 
     def union(self, other, flat=False):
         """Returns a list of Bezier paths representing the union of the two input paths."""
-        return self.clip(other, pyclipper.CT_UNION, flat)
+        return self.clip(other, pyclipper().CT_UNION, flat)
 
     def intersection(self, other, flat=False):
         """Returns a list of Bezier paths representing the intersection of the two input paths."""
-        return self.clip(other, pyclipper.CT_INTERSECTION, flat)
+        return self.clip(other, pyclipper().CT_INTERSECTION, flat)
 
     def difference(self, other, flat=False):
         """Returns a list of Bezier paths representing the first input path subtracted from the second."""
-        return self.clip(other, pyclipper.CT_DIFFERENCE, flat)
+        return self.clip(other, pyclipper().CT_DIFFERENCE, flat)
+
+
+def _splitAtIntersections(subjects, clips):
+    """Returns clones of the subject and clip paths, with their segments
+    split wherever a segment of one path crosses a segment of another."""
+    subjects = [p.clone() for p in subjects]
+    clips = [p.clone() for p in clips]
+    paths = subjects + clips
+    segs = []
+    owners = []
+    for i, path in enumerate(paths):
+        pathsegs = path.asSegments()
+        segs.extend(pathsegs)
+        owners.extend([i] * len(pathsegs))
+    splitlists = [[] for _ in paths]
+    for i1, i2 in overlapping_pairs([seg.bounds() for seg in segs]):
+        if owners[i1] == owners[i2]:
+            continue
+        s1 = segs[i1]
+        for i in s1.intersections(segs[i2]):
+            if i.t1 > 1e-8 and i.t1 < 1 - 1e-8:
+                if i.seg1 == s1:
+                    splitlists[owners[i1]].append((i.seg1, i.t1))
+                    splitlists[owners[i2]].append((i.seg2, i.t2))
+                else:
+                    splitlists[owners[i2]].append((i.seg1, i.t1))
+                    splitlists[owners[i1]].append((i.seg2, i.t2))
+    for path, splitlist in zip(paths, splitlists):
+        logging.debug("Split list: %s" % splitlist)
+        if splitlist:
+            path.splitAtPoints(splitlist)
+    return subjects, clips
+
+
+class _VertexTags(object):
+    """Records where each vertex handed to Clipper came from: the segment
+    it lies on, as an index into `segments`, and its time along that
+    segment. Tags are kept in flat arrays.
+
+    Clipper hands back bare integer co-ordinates, not the vertices it was
+    given (pyclipper offers no way to carry a tag through), so the only way
+    back from an output point to its tags is by its position. `first` is
+    that lookup, from a scaled integer position to a vertex there.
+    Vertices at the same position (such as the shared end points of
+    neighbouring segments, or the crossing points of two paths) don't
+    overwrite one another: each is chained to the one before it, so
+    `sources` returns all of them, and `_reconstruct` picks between them by
+    the segment each edge has in common at both ends."""
+
+    def __init__(self):
+        self.segments = []
+        self.following = array("l")  # next segment along the contour, or -1
+        self.preceding = array("l")  # previous segment, or -1
+        self.seg = array("l")
+        self.t = array("d")
+        self.chain = array("l")  # next vertex at the same point, or -1
+        self.first = {}  # (x, y) -> index of the last vertex added there
+
+    def addPath(self, path):
+        """Flattens a path, tags its vertices, and returns it as a polygon
+        of scaled integer co-ordinates."""
+        segs = path.asSegments()
+        base = len(self.segments)
+        n = len(segs)
+        self.segments.extend(segs)
+        closed = n > 0 and segs[0].start == segs[-1].end
+        for i in range(0, n):
+            if i + 1 < n:
+                self.following.append(base + i + 1)
+            else:
+                self.following.append(base if closed else -1)
+            if i > 0:
+                self.preceding.append(base + i - 1)
+            else:
+                self.preceding.append(base + n - 1 if closed else -1)
+        coords, owners, ts = flattenSegments(segs, CLIP_FLATTEN_TOLERANCE)
+        polygon = []
+        for i in range(0, len(owners)):
+            point = (
+                int(round(coords[2 * i] * PRECISION)),
+                int(round(coords[2 * i + 1] * PRECISION)),
+            )
+            if not polygon or polygon[-1] != point:
+                polygon.append(point)
+            self.seg.append(base + owners[i])
+            self.t.append(ts[i])
+            self.chain.append(self.first.get(point, -1))
+            self.first[point] = len(self.seg) - 1
+        if len(polygon) > 1 and polygon[0] == polygon[-1]:
+            polygon.pop()
+        return polygon
+
+    def sources(self, point):
+        """Returns a dictionary mapping the index of each segment which
+        passes through the given scaled point to the time at which it
+        does so."""
+        found = {}
+        v = self.first.get(tuple(point), -1)
+        while v >= 0:
+            s, t = self.seg[v], self.t[v]
+            found.setdefault(s, t)
+            # The end of one segment is also the start of the next
+            if t == 1.0 and self.following[s] >= 0:
+                found.setdefault(self.following[s], 0.0)
+            if t == 0.0 and self.preceding[s] >= 0:
+                found.setdefault(self.preceding[s], 1.0)
+            v = self.chain[v]
+        return found
+
+
+def _subsegment(seg, t0, t1):
+    """Returns the part of a segment between times t0 and t1, reversed
+    if t1 comes before t0."""
+    if t0 > t1:
+        return _subsegment(seg, t1, t0).reversed()
+    if t0 == 0.0 and t1 == 1.0:
+        return seg
+    if t1 < 1.0:
+        seg = seg.splitAtTime(t1)[0]
+    if t0 > 0.0:
+        seg = seg.splitAtTime(t0 / t1)[1]
+    return seg
+
+
+def _reconstruct(polygons, tags, flat):
+    """Turns polygons returned by Clipper back into Bezier paths. Each edge
+    whose ends both lie on the same source segment is mapped back to a span
+    of times on that segment, consecutive spans are merged, and each merged
+    span is cut out of its segment with `splitAtTime`. Edges which cannot
+    be traced back to a segment (those Clipper invented) become lines."""
+    from beziers.path import BezierPath
+
+    # An edge's mid-point may stray this far from the curve it is traced to
+    slack = 2 * CLIP_FLATTEN_TOLERANCE + 2 / PRECISION
+
+    def traceEdge(a, b, pa, pb, previous):
+        sa, sb = tags.sources(a), tags.sources(b)
+        common = [s for s in sa if s in sb]
+        if previous in common:
+            common.remove(previous)
+            common.insert(0, previous)
+        for s in common:
+            ta, tb = sa[s], sb[s]
+            if ta == tb:
+                continue
+            seg = tags.segments[s]
+            if len(seg) > 2:
+                mid = seg.pointAtTime((ta + tb) * 0.5)
+                if closestPointOnSegment(Line(pa, pb), mid)[1] > slack:
+                    continue
+            return (s, ta, tb)
+        return None
+
+    outpaths = []
+    for polygon in polygons:
+        points = [Point(x / PRECISION, y / PRECISION) for x, y in polygon]
+        n = len(points)
+        spans = []  # (segment index, t0, t1) or (None, start, end)
+        for i in range(0, n):
+            a, b = polygon[i], polygon[(i + 1) % n]
+            pa, pb = points[i], points[(i + 1) % n]
+            previous = spans[-1][0] if spans else None
+            edge = None if flat else traceEdge(a, b, pa, pb, previous)
+            if edge is None:
+                spans.append((None, pa, pb))
+                continue
+            s, ta, tb = edge
+            if spans and spans[-1][0] == s:
+                _, t0, t1 = spans[-1]
+                if t1 == ta and (t1 - t0) * (tb - ta) > 0:
+                    spans[-1] = (s, t0, tb)
+                    continue
+            spans.append(edge)
+        # Clipper may start a polygon part way along a segment
+        if len(spans) > 1 and spans[0][0] is not None and spans[0][0] == spans[-1][0]:
+            s, t0, t1 = spans[-1]
+            if t1 == spans[0][1] and (t1 - t0) * (spans[0][2] - t1) > 0:
+                spans[0] = (s, t0, spans[0][2])
+                spans.pop()
+        newpath = []
+        for s, start, end in spans:
+            if s is None:
+                if newpath:
+                    start = newpath[-1].end
+                newpath.append(Line(start, end))
+            else:
+                newpath.append(_subsegment(tags.segments[s], start, end))
+        outpaths.append(BezierPath.fromSegments(newpath))
+    return outpaths
+
+
+def _fillType(rule):
+    if rule == "nonzero":
+        return pyclipper().PFT_NONZERO
+    if rule == "evenodd":
+        return pyclipper().PFT_EVENODD
+    raise ValueError("Unknown fill rule %s" % rule)
+
+
+def _booleanOperation(subjects, clips, cliptype, filltype, flat):
+    subjects, clips = _splitAtIntersections(subjects, clips)
+    tags = _VertexTags()
+    subjectPolygons = [tags.addPath(p) for p in subjects]
+    clipPolygons = [tags.addPath(p) for p in clips]
+    # Leave it to the professionals
+    clipper = pyclipper()
+    pc = clipper.Pyclipper()
+    if clipPolygons:
+        pc.AddPaths(clipPolygons, clipper.PT_CLIP, True)
+    pc.AddPaths(subjectPolygons, clipper.PT_SUBJECT, True)
+    polygons = pc.Execute(cliptype, filltype, filltype)
+    return _reconstruct(polygons, tags, flat)
+
+
+def union_all(paths, rule="nonzero", flat=False):
+    """Returns a list of Bezier paths outlining the area enclosed by the
+    given paths taken together, as the contours of a glyph are; this removes
+    the overlaps between them. Every path is flattened once and the whole
+    set is handed to the polygon clipper in a single operation.
+
+    `rule` is the fill rule applied to all of the paths at once,
+    ``"nonzero"`` (as for glyph outlines) or ``"evenodd"``, not to each path
+    on its own. So under ``"nonzero"`` a contour running the other way
+    inside another cuts a hole in it, like the counter of an "o", and under
+    ``"evenodd"`` any area enclosed by two of the paths is left out. This is
+    unlike `union`, which fills each of its two paths separately (by the
+    even-odd rule) before uniting them."""
+    paths = list(paths)
+    if not paths:
+        return []
+    return _booleanOperation(paths, [], pyclipper().CT_UNION, _fillType(rule), flat)
+
+
+def intersect_all(paths, rule="nonzero", flat=False):
+    """Returns a list of Bezier paths representing the area common to all
+    of the given paths. Every path is flattened once; the polygons are then
+    intersected in turn without being converted back into curves in between.
+    `rule` is the fill rule, ``"nonzero"`` or ``"evenodd"``, used to decide
+    what is inside each path on its own."""
+    paths = list(paths)
+    if not paths:
+        return []
+    filltype = _fillType(rule)
+    subjects, clips = _splitAtIntersections(paths, [])
+    tags = _VertexTags()
+    polygons = [tags.addPath(p) for p in subjects]
+    # Clipper only intersects a subject set with a clip set, so an n-way
+    # intersection is a chain of operations on the flattened polygons
+    clipper = pyclipper()
+    result = [polygons[0]]
+    for i, polygon in enumerate(polygons):
+        pc = clipper.Pyclipper()
+        pc.AddPaths(result, clipper.PT_SUBJECT, True)
+        if i > 0:
+            pc.AddPath(polygon, clipper.PT_CLIP, True)
+            result = pc.Execute(clipper.CT_INTERSECTION, filltype, filltype)
+        else:
+            result = pc.Execute(clipper.CT_UNION, filltype, filltype)
+        if not result:
+            return []
+    return _reconstruct(result, tags, flat)
+
+
+def difference(subjects, clips, rule="nonzero", flat=False):
+    """Returns a list of Bezier paths representing the area covered by the
+    `subjects` paths but not by any of the `clips` paths, computed in a
+    single pass of the polygon clipper. As in `union_all`, the fill rule
+    `rule` is applied to all of the subjects at once, and to all of the
+    clips at once."""
+    subjects = list(subjects)
+    if not subjects:
+        return []
+    return _booleanOperation(
+        subjects, list(clips), pyclipper().CT_DIFFERENCE, _fillType(rule), flat
+    )
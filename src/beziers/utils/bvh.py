@@ -0,0 +1,197 @@
+import heapq
+import math
+
+from beziers.boundingbox import BoundingBox
+from beziers.line import Line
+
+# Maximum number of segments in a leaf of the tree
+LEAF_SIZE = 4
+
+
+class _Node(object):
+    __slots__ = ("box", "left", "right", "items")
+
+    def __init__(self, box, left=None, right=None, items=None):
+        self.box = box
+        self.left = left
+        self.right = right
+        self.items = items
+
+
+def _boxDistanceSq(box, pt):
+    dx = max(box.left - pt.x, 0.0, pt.x - box.right)
+    dy = max(box.bottom - pt.y, 0.0, pt.y - box.top)
+    return dx * dx + dy * dy
+
+
+def _boxHitByLine(box, start, end):
+    # Slab test of the line from start to end against the box
+    t0, t1 = 0.0, 1.0
+    for s, e, lo, hi in (
+        (start.x, end.x, box.left, box.right),
+        (start.y, end.y, box.bottom, box.top),
+    ):
+        d = e - s
+        if d == 0:
+            if s < lo or s > hi:
+                return False
+            continue
+        ta, tb = (lo - s) / d, (hi - s) / d
+        if ta > tb:
+            ta, tb = tb, ta
+        t0, t1 = max(t0, ta), min(t1, tb)
+        if t0 > t1:
+            return False
+    return True
+
+
+def closestPointOnSegment(seg, pt, samples=16):
+    """Returns a tuple (t, distance) giving the time of the point on the
+    segment `seg` closest to `pt`, and the distance to it."""
+    if isinstance(seg, Line):
+        v = seg.end - seg.start
+        sq = v.squareMagnitude
+        t = 0.0 if sq == 0 else min(max((pt - seg.start).dot(v) / sq, 0.0), 1.0)
+        return t, seg.pointAtTime(t).distanceFrom(pt)
+    ts = [i / float(samples) for i in range(0, samples + 1)]
+    coords = seg.pointsAtTimes(ts)
+    if hasattr(coords, "tolist"):
+        coords = coords.tolist()
+    best = min(
+        range(0, len(ts)),
+        key=lambda i: (coords[i][0] - pt.x) ** 2 + (coords[i][1] - pt.y) ** 2,
+    )
+    # Golden section search within the neighbouring samples
+    lo, hi = ts[max(best - 1, 0)], ts[min(best + 1, samples)]
+    ratio = (math.sqrt(5) - 1) / 2
+
+    def dist(t):
+        return seg.pointAtTime(t).squareDistanceFrom(pt)
+
+    while hi - lo > 1e-9:
+        a = hi - ratio * (hi - lo)
+        b = lo + ratio * (hi - lo)
+        if dist(a) < dist(b):
+            hi = b
+        else:
+            lo = a
+    t = (lo + hi) / 2
+    return t, math.sqrt(dist(t))
+
+
+class BVH(object):
+    """A bounding volume hierarchy over a set of segments, for answering
+    spatial queries without looking at every segment. Build one with
+    `BVH.fromPath` or `BVH.fromPaths`, or get the cached one for a path
+    from :py:meth:`BezierPath.segmentIndex`::
+
+        index = path.segmentIndex()
+        index.overlapping(box)          # segments whose bounds overlap box
+        index.alongLine(Line(p1, p2))   # segments whose bounds the line crosses
+        index.nearest(point)            # (segment, t, distance)
+    """
+
+    def __init__(self, segments, boxes=None):
+        self.segments = list(segments)
+        if boxes is None:
+            boxes = [s.bounds() for s in self.segments]
+        self.root = None
+        if self.segments:
+            self.root = self._build(list(zip(boxes, self.segments)))
+        self._paths = {}
+
+    @classmethod
+    def fromPath(klass, path):
+        """Builds a hierarchy over the segments of a path."""
+        return klass(path.asSegments())
+
+    @classmethod
+    def fromPaths(klass, paths):
+        """Builds a hierarchy over the segments of several paths. Use
+        `pathOf` to find which path a segment returned by a query belongs to."""
+        segments = []
+        owners = {}
+        for path in paths:
+            for seg in path.asSegments():
+                segments.append(seg)
+                owners[id(seg)] = path
+        self = klass(segments)
+        self._paths = owners
+        return self
+
+    def pathOf(self, segment):
+        """Returns the path a segment belongs to, for hierarchies built with `fromPaths`."""
+        return self._paths.get(id(segment))
+
+    def _build(self, entries):
+        box = BoundingBox()
+        for b, _ in entries:
+            box.extend(b)
+        if len(entries) <= LEAF_SIZE:
+            return _Node(box, items=entries)
+        # Split at the median centroid along the longer axis
+        if box.width >= box.height:
+            entries.sort(key=lambda e: e[0].left + e[0].right)
+        else:
+            entries.sort(key=lambda e: e[0].bottom + e[0].top)
+        mid = len(entries) // 2
+        return _Node(box, self._build(entries[:mid]), self._build(entries[mid:]))
+
+    def _search(self, nodeTest):
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            if not nodeTest(node.box):
+                continue
+            if node.items is not None:
+                found.extend(seg for b, seg in node.items if nodeTest(b))
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+        return found
+
+    def overlapping(self, box):
+        """Returns the segments whose bounding boxes overlap the given box."""
+        return self._search(lambda b: b.overlaps(box))
+
+    def alongLine(self, line):
+        """Returns the segments whose bounding boxes are crossed by the
+        given `Line`. These are the only ones which can intersect it."""
+        start, end = line.start, line.end
+        return self._search(lambda b: _boxHitByLine(b, start, end))
+
+    def rayIntersections(self, ray):
+        """Returns the `Intersection` objects between the given `Line`
+        and the indexed segments."""
+        intersections = []
+        for seg in self.alongLine(ray):
+            intersections.extend(seg.intersections(ray))
+        return intersections
+
+    def nearest(self, pt):
+        """Returns a tuple (segment, t, distance) for the indexed segment
+        closest to the given point, or None if the hierarchy is empty."""
+        if not self.root:
+            return None
+        best = None
+        counter = 0  # tie-breaker, so the heap never compares nodes
+        heap = [(_boxDistanceSq(self.root.box, pt), counter, self.root)]
+        while heap:
+            d, _, node = heapq.heappop(heap)
+            if best and d > best[2] * best[2]:
+                break
+            if node.items is not None:
+                for box, seg in node.items:
+                    if best and _boxDistanceSq(box, pt) > best[2] * best[2]:
+                        continue
+                    t, dist = closestPointOnSegment(seg, pt)
+                    if not best or dist < best[2]:
+                        best = (seg, t, dist)
+            else:
+                for child in (node.left, node.right):
+                    counter += 1
+                    heapq.heappush(
+                        heap, (_boxDistanceSq(child.box, pt), counter, child)
+                    )
+        return best
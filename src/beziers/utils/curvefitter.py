@@ -1,8 +1,10 @@
 import math
 import sys
+from bisect import bisect_left, bisect_right
 
 from beziers.cubicbezier import CubicBezier
 from beziers.point import Point
+from beziers.utils import numpy
 
 
 def B0(u):
@@ -41,6 +43,16 @@ class CurveFit:
             return
         return self._fitCurve(data, None, None, error, cornerTolerance, maxSegments)
 
+    @classmethod
+    def _points(self, points):
+        # The form in which _fitCurve takes a list of points
+        return points
+
+    @classmethod
+    def _vector(self, point):
+        # The form in which _fitCurve takes a tangent
+        return point
+
     @classmethod
     def fitLine(self, data, tHat1, tHat2):
         p0, p3 = data[0], data[-1]
@@ -349,3 +361,604 @@ class CurveFit:
             return lbeziers + rbeziers
         else:
             return []
+
+
+class NumpyCurveFit(CurveFit):
+    """The same fitting algorithm as `CurveFit`, working on an N×2 numpy
+    array of points rather than a list of `Point` objects, so that each
+    step (parameterization, least-squares estimation, Newton-Raphson
+    reparameterization, error measurement) handles every point at once.
+    The segments it returns match those of `CurveFit` to within rounding
+    error. Requires numpy."""
+
+    @classmethod
+    def fitCurve(self, data, error, cornerTolerance, maxSegments):
+        keys = {}
+
+        def filterSeen(x):
+            if hash(x) in keys:
+                return False
+            keys[hash(x)] = 1
+            return True
+
+        data = list(filter(filterSeen, data))
+        if len(data) < 2:
+            return
+        if numpy() is None:
+            raise ImportError("NumpyCurveFit requires numpy")
+        return self._fitCurve(
+            self._points(data), None, None, error, cornerTolerance, maxSegments
+        )
+
+    @classmethod
+    def _points(self, points):
+        return numpy().array([(p.x, p.y) for p in points], dtype=float)
+
+    @classmethod
+    def _vector(self, point):
+        return numpy().array([point.x, point.y])
+
+    @classmethod
+    def _bezier(self, bez):
+        return CubicBezier(*[Point(x, y) for x, y in bez.tolist()])
+
+    @classmethod
+    def _unit(self, v):
+        mag = numpy().hypot(v[0], v[1])
+        return v / (mag if mag != 0.0 else 1.0)
+
+    @classmethod
+    def _evaluate(self, bez, u):
+        # Points on the curve with control points bez (4×2) at times u
+        u = u[:, None]
+        mt = 1.0 - u
+        return (
+            mt * mt * mt * bez[0]
+            + 3 * u * mt * mt * bez[1]
+            + 3 * u * u * mt * bez[2]
+            + u * u * u * bez[3]
+        )
+
+    @classmethod
+    def fitLine(self, data, tHat1, tHat2):
+        p0, p3 = data[0], data[-1]
+        dist = numpy().hypot(*(p3 - p0)) / 3.0
+        p1 = p0 + tHat1 * dist if tHat1 is not None else (p0 * 2.0 + p3) / 3.0
+        p2 = p3 + tHat2 * dist if tHat2 is not None else (p3 * 2.0 + p0) / 3.0
+        return self._bezier(numpy().array([p0, p1, p2, p3]))
+
+    @classmethod
+    def estimateBi(self, bez, data, u):
+        b0, b1, b2, b3 = B0(u), B1(u), B2(u), B3(u)
+        shortfall = (
+            b0[:, None] * bez[0] + b2[:, None] * bez[2] + b3[:, None] * bez[3] - data
+        )
+        num = (b1[:, None] * shortfall).sum(axis=0)
+        den = -(b1 * b1).sum()
+        if den != 0.0:
+            bez[1] = num / den
+        else:
+            bez[1] = bez[0] + (bez[3] - bez[0]) / 3.0
+
+    @classmethod
+    def centerTangent(self, data, center):
+        before, after = data[center - 1], data[center + 1]
+        if numpy().allclose(before, after, rtol=1e-9, atol=0.0):
+            ret = data[center] - before
+            return self._unit(numpy().array([-ret[1], ret[0]]))
+        return self._unit(before - after)
+
+    @classmethod
+    def leftTangent(self, data, tolerance):
+        t = data[1:] - data[0]
+        distSq = (t * t).sum(axis=1)
+        far = numpy().nonzero(tolerance < distSq)[0]
+        if len(far):
+            return self._unit(t[far[0]])
+        if distSq[-1] == 0:
+            return self._unit(data[1] - data[0])
+        return self._unit(t[-1])
+
+    @classmethod
+    def rightTangent(self, data, tolerance):
+        t = data[-2:0:-1] - data[-1]
+        distSq = (t * t).sum(axis=1)
+        far = numpy().nonzero(tolerance < distSq)[0]
+        if len(far):
+            return self._unit(t[far[0]])
+        if distSq[-1] == 0:
+            return self._unit(data[-1] - data[-2])
+        return self._unit(t[-1])
+
+    @classmethod
+    def generateBezier(self, data, u, tHat1, tHat2, tolerance_sq):
+        est_tHat1 = tHat1
+        est_tHat2 = tHat2
+        if est_tHat1 is None:
+            est_tHat1 = self.leftTangent(data, tolerance_sq)
+        if est_tHat2 is None:
+            est_tHat2 = self.rightTangent(data, tolerance_sq)
+        bez = self.estimateLengths(data, u, est_tHat1, est_tHat2)
+        if tHat1 is None:
+            self.estimateBi(bez, data, u)
+            if numpy().hypot(*(bez[1] - bez[0])) > sys.float_info.epsilon:
+                est_tHat1 = self._unit(bez[1] - bez[0])
+            bez = self.estimateLengths(data, u, est_tHat1, est_tHat2)
+        return bez
+
+    @classmethod
+    def estimateLengths(self, data, u, tHat1, tHat2):
+        np = numpy()
+        b0, b1, b2, b3 = B0(u), B1(u), B2(u), B3(u)
+        a1 = b1[:, None] * tHat1
+        a2 = b2[:, None] * tHat2
+        shortfall = data - data[0] * (b0 + b1)[:, None] - data[-1] * (b2 + b3)[:, None]
+        c00 = (a1 * a1).sum()
+        c01 = (a1 * a2).sum()
+        c11 = (a2 * a2).sum()
+        x0 = (a1 * shortfall).sum()
+        x1 = (a2 * shortfall).sum()
+
+        det_C0_C1 = c00 * c11 - c01 * c01
+        if det_C0_C1 != 0.0:
+            alpha_l = (x0 * c11 - x1 * c01) / det_C0_C1
+            alpha_r = (c00 * x1 - c01 * x0) / det_C0_C1
+        else:
+            c0 = c00 + c01
+            if c0 != 0:
+                alpha_l = alpha_r = x0 / c0
+            else:
+                alpha_l = alpha_r = 0.0
+        if alpha_l < 1.0e-6 or alpha_r < 1.0e-6:
+            alpha_l = alpha_r = np.hypot(*(data[-1] - data[0])) / 3.0
+        return np.array(
+            [data[0], tHat1 * alpha_l + data[0], tHat2 * alpha_r + data[-1], data[-1]]
+        )
+
+    @classmethod
+    def chordLengthParameterize(self, points):
+        np = numpy()
+        d = np.hypot(*(points[1:] - points[:-1]).T)
+        u = np.concatenate(([0.0], np.cumsum(d)))
+        if u[-1] == 0.0:
+            return u
+        return u / u[-1]
+
+    @classmethod
+    def reparameterize(self, bez, points, params):
+        # All of the Newton-Raphson steps of CurveFit.newtonRaphsonFind at once
+        np = numpy()
+        d1 = 3 * (bez[1:] - bez[:-1])
+        d2 = 2 * (d1[1:] - d1[:-1])
+        u = params
+        mt = (1.0 - u)[:, None]
+        uu = u[:, None]
+        q0 = self._evaluate(bez, u)
+        q1 = mt * mt * d1[0] + 2 * uu * mt * d1[1] + uu * uu * d1[2]
+        q2 = mt * d2[0] + uu * d2[1]
+        diff = q0 - points
+        numerator = (diff * q1).sum(axis=1)
+        denominator = (q1 * q1).sum(axis=1) + (diff * q2).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = u - numerator / denominator
+        improved = np.where(
+            denominator > 0.0,
+            newton,
+            np.where(
+                numerator > 0.0,
+                u * 0.98 - 0.01,
+                np.where(numerator < 0.0, 0.031 + u * 0.98, u),
+            ),
+        )
+        improved = np.clip(improved, 0, 1)
+        dist = np.hypot(*diff.T)
+        active = np.ones(len(u), dtype=bool)
+        proportion = 0.125
+        while active.any():
+            proportion += 0.125
+            newDist = np.hypot(*(points - self._evaluate(bez, improved)).T)
+            worse = active & (newDist > dist)
+            if proportion > 1.0:
+                improved[worse] = u[worse]
+                break
+            improved[worse] = (1 - proportion) * improved[worse] + proportion * u[worse]
+            active = worse
+        params[:] = improved
+
+    @classmethod
+    def computeMaxError(self, bez, points, params, tolerance, cornerTolerance):
+        np = numpy()
+        cur = self._evaluate(bez, params)
+        cur[0] = bez[0]
+        distSq = ((cur[1:] - points[1:]) ** 2).sum(axis=1)
+        splitPoint = 0
+        maxSqDist = distSq.max()
+        if maxSqDist > 0.0:
+            splitPoint = int(np.argmax(distSq)) + 1
+        else:
+            maxSqDist = 0.0
+        prev, nxt = cur[:-1], cur[1:]
+        hook = self._evaluate(bez, (params[1:] + params[:-1]) / 2.0)
+        dist = np.hypot(*(hook - (prev + nxt) * 0.5).T)
+        allowed = np.hypot(*(nxt - prev).T) + cornerTolerance
+        hookRatio = np.where(dist < cornerTolerance, 0.0, dist / allowed)
+        maxHookRatio = 0.0
+        snapEnd = 0
+        if hookRatio.max() > 0.0:
+            snapEnd = int(np.argmax(hookRatio)) + 1
+            maxHookRatio = hookRatio[snapEnd - 1]
+        distRatio = math.sqrt(maxSqDist) / tolerance
+        if maxHookRatio <= distRatio:
+            return (distRatio, splitPoint)
+        else:
+            return (-maxHookRatio, snapEnd - 1)
+
+    @classmethod
+    def _fitCurve(
+        self, points, tangent1, tangent2, error, cornerTolerance, maxSegments
+    ):
+        np = numpy()
+        if len(points) == 0:
+            return
+        if len(points) == 2:
+            return [self.fitLine(points, tangent1, tangent2)]
+        maxIterations = 3
+        isCorner = False
+        u = self.chordLengthParameterize(points)
+        if u[-1] == 0.0:
+            return []
+        bez = self.generateBezier(points, u, tangent1, tangent2, error)
+        self.reparameterize(bez, points, u)
+        tolerance = math.sqrt(error + 1e-9)
+        (maxErrorRatio, splitPoint) = self.computeMaxError(
+            bez, points, u, tolerance, cornerTolerance
+        )
+        if abs(maxErrorRatio) <= 1.0:
+            return [self._bezier(bez)]
+        if 0.0 <= maxErrorRatio and maxErrorRatio <= 3.0:
+            for _ in range(0, maxIterations + 1):
+                bez = self.generateBezier(points, u, tangent1, tangent2, error)
+                (maxErrorRatio, splitPoint) = self.computeMaxError(
+                    bez, points, u, tolerance, cornerTolerance
+                )
+                if abs(maxErrorRatio) <= 1.0:
+                    return [self._bezier(bez)]
+
+        zero = np.zeros(2)
+        isCorner = maxErrorRatio < 0
+        if isCorner:
+            if splitPoint == 0:
+                if tangent1 is None:
+                    splitPoint = splitPoint + 1
+                else:
+                    return self._fitCurve(
+                        points, zero, tangent2, error, cornerTolerance, maxSegments
+                    )
+            elif splitPoint == len(points) - 1:
+                if tangent2 is None:
+                    splitPoint = splitPoint - 1
+                else:
+                    return self._fitCurve(
+                        points, tangent1, zero, error, cornerTolerance, maxSegments
+                    )
+
+        if 1 < maxSegments:
+            segmentsRemaining = maxSegments - 1
+            if isCorner:
+                if not (0 < splitPoint and splitPoint < len(points) - 1):
+                    return []
+                recTHat1 = zero
+                recTHat2 = zero
+            else:
+                recTHat2 = self.centerTangent(points, splitPoint)
+                recTHat1 = recTHat2 * -1
+
+            lbeziers = self._fitCurve(
+                points[: splitPoint + 1],
+                tangent1,
+                recTHat2,
+                error,
+                cornerTolerance,
+                segmentsRemaining,
+            )
+            if lbeziers:
+                segmentsRemaining = segmentsRemaining - len(lbeziers)
+            rbeziers = self._fitCurve(
+                points[splitPoint:],
+                recTHat1,
+                tangent2,
+                error,
+                cornerTolerance,
+                segmentsRemaining,
+            )
+            return lbeziers + rbeziers
+        else:
+            return []
+
+
+# The fitting implementations which `BezierPath.fromPoints` can use
+fitters = {"python": CurveFit, "numpy": NumpyCurveFit}
+
+
+class StreamingCurveFit(object):
+    """Fits a poly-bezier to points as they arrive, for a pencil tool which
+    wants to show the fitted curve while the stroke is still being drawn::
+
+        fitter = StreamingCurveFit(error=50.0)
+        for point in stroke:
+            path = fitter.addPoint(point)  # redraw with this
+        path = fitter.path
+
+    Refitting the whole stroke on every new point (as calling
+    `BezierPath.fromPoints` each time would) takes time proportional to the
+    length of the stroke so far. Instead, once the fitter has split the
+    points it is working on into more than one segment, all but the last
+    segment are frozen and only the points from the start of the last
+    segment onwards are fitted again. The next segment starts with the
+    tangent the frozen one ends with, so the joins stay smooth.
+
+    Fitting never covers more than `window` points: if that many arrive
+    without a split, the first half of them are fitted and frozen. This
+    bounds the time taken by each point.
+
+    `backend` is ``"python"`` or ``"numpy"``, as for `BezierPath.fromPoints`."""
+
+    def __init__(self, error=50.0, cornerTolerance=20.0, window=200, backend="python"):
+        if backend not in fitters:
+            raise ValueError("Unknown curve fitting backend %s" % backend)
+        self.error = error
+        self.cornerTolerance = cornerTolerance
+        self.window = max(window, 4)
+        self.fitter = fitters[backend]
+        self.frozen = []
+        self.tail = []
+        self._pending = []
+        self._tangent = None
+
+    def _fit(self, points):
+        fitter = self.fitter
+        tangent = self._tangent
+        if tangent is not None:
+            tangent = fitter._vector(tangent)
+        segments = fitter._fitCurve(
+            fitter._points(points),
+            tangent,
+            None,
+            self.error,
+            self.cornerTolerance,
+            len(points),
+        )
+        return segments or []
+
+    def _freeze(self, segments):
+        self.frozen.extend(segments)
+        last = segments[-1]
+        handle = last[3] - last[2]
+        # A join the fitter made at a corner has no handle to continue from
+        if handle.magnitude > sys.float_info.epsilon:
+            self._tangent = handle.toUnitVector()
+        else:
+            self._tangent = None
+
+    def addPoint(self, point):
+        """Adds the next point of the stroke, returning the path fitted to
+        the stroke so far."""
+        pending = self._pending
+        if pending and pending[-1] == point:
+            return self.path
+        pending.append(point)
+        if len(pending) > self.window:
+            half = len(pending) // 2
+            settled = self._fit(pending[: half + 1])
+            if settled:
+                self._freeze(settled)
+            del pending[:half]
+        segments = self._fit(pending) if len(pending) > 1 else []
+        if len(segments) > 1:
+            # The last segment starts at one of the points; everything
+            # before that is settled
+            start = segments[-1].start
+            for i in range(len(pending) - 1, -1, -1):
+                if pending[i] == start:
+                    break
+            else:
+                i = 0
+            if i > 0:
+                self._freeze(segments[:-1])
+                del pending[:i]
+                segments = segments[-1:]
+        self.tail = segments
+        return self.path
+
+    def addPoints(self, points):
+        """Adds several points, returning the path fitted so far."""
+        for point in points:
+            self.addPoint(point)
+        return self.path
+
+    @property
+    def segments(self):
+        """The fitted segments: those frozen so far, then the current fit of
+        the remaining points."""
+        return self.frozen + self.tail
+
+    @property
+    def path(self):
+        """The fitted path, as a new open `BezierPath`."""
+        from beziers.path import BezierPath
+
+        path = BezierPath.fromSegments(self.segments)
+        path.closed = False
+        return path
+
+
+def simplifyPoints(points, tolerance):
+    """Reduces a run of points with the Ramer-Douglas-Peucker algorithm,
+    returning the indices of the points which must be kept so that the
+    polyline through them stays within `tolerance` of every point. Sharp
+    corners are always kept, as they are the points furthest from the
+    chords around them."""
+    n = len(points)
+    if n < 3:
+        return list(range(0, n))
+    np = numpy()
+    if np is not None:
+        xy = np.array([(p.x, p.y) for p in points], dtype=float)
+    keep = [0, n - 1]
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = points[first], points[last]
+        dx, dy = b.x - a.x, b.y - a.y
+        length = math.hypot(dx, dy)
+        if np is not None:
+            rel = xy[first + 1 : last] - (a.x, a.y)
+            if length == 0:
+                d = np.hypot(rel[:, 0], rel[:, 1])
+            else:
+                d = np.abs(rel[:, 0] * dy - rel[:, 1] * dx) / length
+            i = int(np.argmax(d))
+            distance, index = d[i], first + 1 + i
+        else:
+            distance, index = -1.0, first
+            for i in range(first + 1, last):
+                p = points[i]
+                if length == 0:
+                    d = math.hypot(p.x - a.x, p.y - a.y)
+                else:
+                    d = abs((p.x - a.x) * dy - (p.y - a.y) * dx) / length
+                if d > distance:
+                    distance, index = d, i
+        if distance > tolerance:
+            keep.append(index)
+            stack.append((first, index))
+            stack.append((index, last))
+    return sorted(keep)
+
+
+def findCorners(points, angle, span=0.0):
+    """Returns the indices of the points at which the polyline through
+    `points` turns by more than `angle` radians. The turn at each point is
+    measured between the points at least `span` along the polyline from it
+    on either side, so that a little noise in the points isn't mistaken
+    for corners (and points closer than that to either end are not
+    considered); of several corners within `span` of one another, only the
+    sharpest is returned."""
+    n = len(points)
+    xy = [(p.x, p.y) for p in points]
+    along = [0.0]
+    for (x0, y0), (x1, y1) in zip(xy, xy[1:]):
+        along.append(along[-1] + math.hypot(x1 - x0, y1 - y0))
+    found = []
+    for i in range(1, n - 1):
+        if span:
+            j = bisect_right(along, along[i] - span) - 1
+            k = bisect_left(along, along[i] + span)
+            if j < 0 or k >= n:
+                continue
+        else:
+            j, k = i - 1, i + 1
+        (x, y), (xj, yj), (xk, yk) = xy[i], xy[j], xy[k]
+        ax, ay, bx, by = x - xj, y - yj, xk - x, yk - y
+        la, lb = math.hypot(ax, ay), math.hypot(bx, by)
+        if la == 0 or lb == 0:
+            continue
+        cos = (ax * bx + ay * by) / (la * lb)
+        turn = math.acos(max(-1.0, min(1.0, cos)))
+        if turn > angle:
+            found.append((i, turn))
+    corners = []
+    for i, turn in found:
+        if corners and along[i] - along[corners[-1][0]] < span:
+            if turn > corners[-1][1]:
+                corners[-1] = (i, turn)
+            continue
+        corners.append((i, turn))
+    return [i for i, _ in corners]
+
+
+def _fitChunk(backend, coords, tangent1, tangent2, error, cornerTolerance):
+    # Fits one chunk; runs in a worker process when fitting in parallel, so
+    # everything going in and out is plain tuples
+    fitter = fitters[backend]
+    points = fitter._points([Point(x, y) for x, y in coords])
+    if tangent1 is not None:
+        tangent1 = fitter._vector(Point(*tangent1))
+    if tangent2 is not None:
+        tangent2 = fitter._vector(Point(*tangent2))
+    segments = fitter._fitCurve(
+        points, tangent1, tangent2, error, cornerTolerance, len(coords)
+    )
+    return [tuple((p.x, p.y) for p in seg.points) for seg in segments or []]
+
+
+def fitLargeCurve(
+    points,
+    error=50.0,
+    cornerTolerance=20.0,
+    simplify=None,
+    cornerAngle=math.radians(70),
+    chunkSize=400,
+    processes=1,
+    backend="python",
+):
+    """Fits a poly-bezier to a very large number of points, such as a
+    scanned outline, which would be slow to fit in one go (and could
+    exceed Python's recursion limit).
+
+    The points are first reduced with `simplifyPoints` to within
+    `simplify` (by default, half the fitting tolerance ``sqrt(error)``),
+    so the curve may stray from the original points by up to the sum of
+    the two. The reduced polyline is cut at every corner sharper than
+    `cornerAngle` (measured over a distance of `cornerTolerance` either
+    side; see `findCorners`), and smooth stretches are cut into chunks of
+    at most `chunkSize` points. Each chunk is fitted independently, with
+    the same tangent on either side of a smooth cut, so the result stays
+    smooth there. With `processes` greater than one the chunks are fitted
+    in that many worker processes.
+
+    Returns a list of `CubicBezier` segments, like `CurveFit.fitCurve`."""
+    if backend not in fitters:
+        raise ValueError("Unknown curve fitting backend %s" % backend)
+    unique = []
+    for p in points:
+        if not unique or unique[-1] != p:
+            unique.append(p)
+    if len(unique) < 2:
+        return []
+    if simplify is None:
+        simplify = math.sqrt(error) / 2.0
+    reduced = [unique[i] for i in simplifyPoints(unique, simplify)]
+
+    # Cut at corners, with no tangent constraint, and then into chunks
+    cuts = [(0, None)]
+    corners = findCorners(reduced, cornerAngle, cornerTolerance)
+    for corner in corners + [len(reduced) - 1]:
+        start = cuts[-1][0]
+        pieces = max(1, int(math.ceil((corner - start) / float(chunkSize))))
+        for k in range(1, pieces):
+            cut = start + (corner - start) * k // pieces
+            cuts.append((cut, CurveFit.centerTangent(reduced, cut)))
+        cuts.append((corner, None))
+
+    jobs = []
+    for (start, t1), (end, t2) in zip(cuts, cuts[1:]):
+        coords = tuple((p.x, p.y) for p in reduced[start : end + 1])
+        tangent1 = None if t1 is None else (-t1.x, -t1.y)
+        tangent2 = None if t2 is None else (t2.x, t2.y)
+        jobs.append((backend, coords, tangent1, tangent2, error, cornerTolerance))
+
+    if processes == 1 or len(jobs) == 1:
+        results = [_fitChunk(*job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_fitChunk, *zip(*jobs)))
+    segments = []
+    for result in results:
+        for pts in result:
+            segments.append(CubicBezier(*[Point(x, y) for x, y in pts]))
+    return segments
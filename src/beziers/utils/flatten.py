@@ -0,0 +1,87 @@
+"""
+Adaptive flattening of Bezier segments into polylines.
+
+A curve is approximated by the chord between its end points once all of
+its control points lie within `tolerance` of that chord; by the convex hull
+property, the curve itself then lies within `tolerance` of it too.
+Otherwise the curve is split in half and each half is tested in turn. Flat
+stretches of a curve therefore produce few lines and tight turns many,
+rather than lines being spaced evenly along the curve's length.
+
+The output is written straight into flat arrays rather than into `Line`
+objects, so that callers which only need co-ordinates (such as polygon
+clipping) never allocate any.
+"""
+
+from array import array
+
+# Give up splitting after this many halvings (a piece 1/65536 of the curve)
+MAX_DEPTH = 16
+
+
+def _split(points):
+    """Splits the curve with control points `points` at t=0.5."""
+    left = [points[0]]
+    right = [points[-1]]
+    while len(points) > 1:
+        points = [
+            ((a[0] + b[0]) * 0.5, (a[1] + b[1]) * 0.5)
+            for a, b in zip(points, points[1:])
+        ]
+        left.append(points[0])
+        right.append(points[-1])
+    right.reverse()
+    return left, right
+
+
+def _isFlat(points, tolerance):
+    (x0, y0), (x1, y1) = points[0], points[-1]
+    dx, dy = x1 - x0, y1 - y0
+    d2 = dx * dx + dy * dy
+    limit = tolerance * tolerance
+    for x, y in points[1:-1]:
+        # Distance to the chord as a line segment rather than an infinite
+        # line, so that curves which double back on themselves are caught
+        t = 0.0 if d2 == 0 else ((x - x0) * dx + (y - y0) * dy) / d2
+        t = min(max(t, 0.0), 1.0)
+        ex, ey = x - (x0 + t * dx), y - (y0 + t * dy)
+        if ex * ex + ey * ey > limit:
+            return False
+    return True
+
+
+def flattenSegments(segments, tolerance, maxDepth=MAX_DEPTH):
+    """Flattens a run of connected segments into a polyline which deviates
+    from them by no more than `tolerance`. Returns three arrays:
+
+    * ``coords``: the vertices of the polyline, as ``[x0, y0, x1, y1, ...]``.
+    * ``owners``: for each vertex, the index into `segments` of the
+      segment it lies on.
+    * ``ts``: for each vertex, its time along that segment.
+
+    The first vertex is the start of the first segment, at time 0; each
+    subsequent vertex ends a line which covers the segment named in
+    ``owners`` from the previous vertex's time (or from 0, if the previous
+    vertex belongs to another segment) up to its own."""
+    coords = array("d")
+    owners = array("l")
+    ts = array("d")
+    for index, seg in enumerate(segments):
+        points = [(p.x, p.y) for p in seg.points]
+        if index == 0:
+            coords.extend(points[0])
+            owners.append(0)
+            ts.append(0.0)
+        stack = [(points, 0.0, 1.0, 0)]
+        while stack:
+            points, t0, t1, depth = stack.pop()
+            if len(points) == 2 or depth >= maxDepth or _isFlat(points, tolerance):
+                coords.extend(points[-1])
+                owners.append(index)
+                ts.append(t1)
+                continue
+            left, right = _split(points)
+            mid = (t0 + t1) * 0.5
+            stack.append((right, mid, t1, depth + 1))
+            stack.append((left, t0, mid, depth + 1))
+    return coords, owners, ts
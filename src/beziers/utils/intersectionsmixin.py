@@ -28,15 +28,24 @@ class IntersectionsMixin:
     # This isn't something we mix into different classes but I'm
     # just putting it here to keep the code tidy.
 
-    def intersections(self, other, limited=True):
+    def intersections(self, other, limited=True, method="clipping"):
         """Returns an array of `Intersection` objects representing the intersections
-        between this Segment and another Segment."""
+        between this Segment and another Segment.
+
+        Intersections between two curves are found by Bezier clipping, which
+        converges very quickly. Pass `method="bisection"` to use the older
+        recursive subdivision instead."""
         # Arrange by degree
         if len(other.points) > len(self.points):
             self, other = other, self
         if len(self.points) == 4 or len(self.points) == 3:
             if len(other.points) == 4 or len(other.points) == 3:
-                inter = self._curve_curve_intersections(other)
+                if method == "clipping":
+                    inter = self._curve_curve_intersections_clipping(other)
+                elif method == "bisection":
+                    inter = self._curve_curve_intersections(other)
+                else:
+                    raise ValueError("Unknown intersection method %s" % method)
             if len(other.points) == 2:
                 inter = self._curve_line_intersections(other)
         elif len(self.points) == 2 and len(other.points) == 2:
@@ -183,3 +192,11 @@ class IntersectionsMixin:
             Intersection(self, t[0], other, t[1])
             for t in self._curve_curve_intersections_t(other)
         ]
+
+    def _curve_curve_intersections_clipping(self, other):
+        from beziers.utils.bezierclipping import curveCurveIntersections
+
+        found = curveCurveIntersections(
+            [(p.x, p.y) for p in self.points], [(p.x, p.y) for p in other.points]
+        )
+        return [Intersection(self, t1, other, t2) for t1, t2 in found]
@@ -50,3 +50,19 @@ Cvalues = [
     0.0123412297999871995468056670700372915759,
     0.0123412297999871995468056670700372915759,
 ]
+
+# A five-point rule, used for integrating over short intervals
+Tvalues5 = [
+    0.0,
+    -0.5384693101056830910363144207002088049673,
+    0.5384693101056830910363144207002088049673,
+    -0.9061798459386639927976268782993929651257,
+    0.9061798459386639927976268782993929651257,
+]
+Cvalues5 = [
+    0.5688888888888888888888888888888888888889,
+    0.4786286704993664680412915148356381929123,
+    0.4786286704993664680412915148356381929123,
+    0.2369268850561890875142640407199173626433,
+    0.2369268850561890875142640407199173626433,
+]
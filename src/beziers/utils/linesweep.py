@@ -1,44 +1,57 @@
-from collections import deque
+import heapq
 
 
-def dequefilter(deck, condition):
-    for _ in range(0, len(deck)):
-        item = deck.popleft()
-        if condition(item):
-            deck.append(item)
+def overlapping_pairs(boxesa, boxesb=None):
+    """Sweep-and-prune broad phase. Given one or two lists of BoundingBox
+    objects, returns a sorted list of (i, j) index pairs whose boxes overlap.
+    With two lists, `i` indexes `boxesa` and `j` indexes `boxesb`; with one
+    list, pairs of boxes within it are returned with `i < j`.
 
+    Boxes are swept from left to right. Each box is compared only against
+    the boxes still "active" (those whose right edge has not yet been passed),
+    so the work is proportional to the number of boxes which overlap in x
+    rather than to the number of pairs."""
+    selfmode = boxesb is None
+    events = [(b.left, 0, i) for i, b in enumerate(boxesa)]
+    if not selfmode:
+        events.extend((b.left, 1, i) for i, b in enumerate(boxesb))
+    events.sort()
+    sets = (boxesa, boxesa if selfmode else boxesb)
+    active = ({}, {})  # index -> box, for each set
+    expiry = []  # heap of (right, set, index)
+    pairs = []
+    for left, which, i in events:
+        while expiry and expiry[0][0] < left:
+            _, w, j = heapq.heappop(expiry)
+            del active[w][j]
+        box = sets[which][i]
+        other = active[0] if selfmode else active[1 - which]
+        for j, box2 in other.items():
+            if box.overlaps(box2):
+                if selfmode:
+                    pairs.append((min(i, j), max(i, j)))
+                elif which == 0:
+                    pairs.append((i, j))
+                else:
+                    pairs.append((j, i))
+        active[0 if selfmode else which][i] = box
+        heapq.heappush(expiry, (box.right, 0 if selfmode else which, i))
+    pairs.sort()
+    return pairs
 
-def bbox_intersections(seta, setb):
-    active_a = deque([])
-    active_b = deque([])
-    instructions = []
-    intersections = []
 
-    def add_to(o, bounds, lst):
-        lst.append((o, bounds))
-        if l == active_a:
-            other = active_b
-        else:
-            other = active_a
-        for o2, bounds2 in other:
-            if bounds.overlaps(bounds2):
-                intersections.append((o, o2))
-
-    def remove_from(o, bounds, lst):
-        dequefilter(lst, lambda i: i[0] != o)
-
-    for a in seta:
-        bounds = a.bounds()
-        instructions.append((bounds.left, a, bounds, add_to, active_a))
-        instructions.append((bounds.right, a, bounds, remove_from, active_a))
-    for b in setb:
-        bounds = b.bounds()
-        instructions.append((bounds.left, b, bounds, add_to, active_b))
-        instructions.append((bounds.right, b, bounds, remove_from, active_b))
-    instructions = sorted(instructions, key=lambda i: i[0])
-    for key, o, bounds, verb, activelist in instructions:
-        verb(o, bounds, activelist)
-    return intersections
+def bbox_intersections(seta, setb=None):
+    """Returns a list of (a, b) pairs of objects from `seta` and `setb`
+    whose bounding boxes overlap. The objects can be anything with a
+    `bounds()` method, such as segments or paths. If `setb` is not given,
+    overlapping pairs of objects within `seta` are returned instead."""
+    seta = list(seta)
+    boxesa = [a.bounds() for a in seta]
+    if setb is None:
+        return [(seta[i], seta[j]) for i, j in overlapping_pairs(boxesa)]
+    setb = list(setb)
+    boxesb = [b.bounds() for b in setb]
+    return [(seta[i], setb[j]) for i, j in overlapping_pairs(boxesa, boxesb)]
 
 
 if __name__ == "__main__":
@@ -64,6 +77,7 @@ if __name__ == "__main__":
     for p in right:
         p.clone().plot(ax, color="red")
     intersections = bbox_intersections(left, right)
-    for line, r in intersections:
-        [p.plot(ax, fill="green") for p in line.intersection(r)]
+    for a, b in intersections:
+        for p in a.intersection(b):
+            p.plot(ax, color="green")
     plt.show()
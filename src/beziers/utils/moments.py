@@ -0,0 +1,59 @@
+"""
+Exact moments of area of a closed path, by Green's theorem. Each segment's
+co-ordinates are polynomials in t, so every boundary integral below is the
+integral of a polynomial over [0, 1] and can be evaluated in closed form::
+
+    area            =  1/2 * boundary integral of (x dy - y dx)
+    integral x dA   =  1/2 * boundary integral of x^2 dy
+    integral y dA   = -1/2 * boundary integral of y^2 dx
+    integral x^2 dA =  1/3 * boundary integral of x^3 dy
+    integral y^2 dA = -1/3 * boundary integral of y^3 dx
+    integral xy dA  =  1/2 * boundary integral of x^2 y dy
+"""
+
+from beziers.utils import powerBasis
+
+
+def _multiply(p, q):
+    result = [0.0] * (len(p) + len(q) - 1)
+    for i, a in enumerate(p):
+        for j, b in enumerate(q):
+            result[i + j] += a * b
+    return result
+
+
+def _derivative(p):
+    return [i * c for i, c in enumerate(p)][1:] or [0.0]
+
+
+def _integral(p):
+    """Integrates a polynomial over [0, 1]."""
+    return sum(c / (i + 1) for i, c in enumerate(p))
+
+
+def segmentMoments(seg):
+    """Returns the contribution of a segment to the moments of the closed
+    path it belongs to, as a tuple (area, integral x dA, integral y dA,
+    integral x^2 dA, integral y^2 dA, integral xy dA). Areas are positive
+    for counter-clockwise paths."""
+    x = powerBasis([p.x for p in seg.points])
+    y = powerBasis([p.y for p in seg.points])
+    dx, dy = _derivative(x), _derivative(y)
+    xx, yy = _multiply(x, x), _multiply(y, y)
+    return (
+        0.5 * (_integral(_multiply(x, dy)) - _integral(_multiply(y, dx))),
+        0.5 * _integral(_multiply(xx, dy)),
+        -0.5 * _integral(_multiply(yy, dx)),
+        _integral(_multiply(_multiply(xx, x), dy)) / 3.0,
+        -_integral(_multiply(_multiply(yy, y), dx)) / 3.0,
+        0.5 * _integral(_multiply(_multiply(xx, y), dy)),
+    )
+
+
+def pathMoments(segments):
+    """Sums `segmentMoments` over a list of segments."""
+    totals = [0.0] * 6
+    for seg in segments:
+        for i, m in enumerate(segmentMoments(seg)):
+            totals[i] += m
+    return tuple(totals)
@@ -0,0 +1,330 @@
+"""
+Offsetting of Bezier segments by the Tiller-Hanson method.
+
+Each edge of a segment's control polygon is moved out along its own normal,
+and the new control points are put where the moved edges meet. For a line
+this is exact; for a curve it is a close approximation wherever the curve
+doesn't bend too sharply. The approximation is checked against the true
+offset at a few points along the segment. Where it strays further than the
+tolerance, its handle lengths are fitted to those points instead, and if
+that doesn't help either, the segment is split in half and each half offset
+separately. Since only those points are checked, the tolerance is a target
+rather than a guarantee: between them the error can be slightly larger
+(by about one percent on typical outlines).
+
+Splitting leaves many short pieces, so neighbouring pieces whose true offset
+runs on smoothly from one to the next are then merged, wherever a single
+curve fitted to both stays within the tolerance at the points they were
+checked at.
+"""
+
+import math
+
+from beziers.cubicbezier import CubicBezier
+from beziers.line import Line
+from beziers.point import Point
+
+# Give up splitting after this many halvings (a piece 1/256 of the segment)
+MAX_DEPTH = 8
+
+# Times at which the approximation is compared with the true offset
+CHECK_TIMES = (0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875)
+
+# Newton steps taken towards the closest point of the approximation
+NEWTON_STEPS = 3
+
+# Longest a mitred control point may be moved, relative to the offset
+# distance, before the edges are treated as parallel instead
+MITER_LIMIT = 4.0
+
+# Largest sine of the angle between two pieces' tangents where they meet
+# for the pieces to be considered for merging
+G1_LIMIT = 1e-3
+
+
+def _shift(dx, dy, vector, rotateVector):
+    # The offset of a point where the curve runs in the direction (dx, dy):
+    # the vector rotated to the curve's normal, or just the vector
+    if not rotateVector:
+        return vector.x, vector.y
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return vector.x, vector.y
+    nx, ny = -dy / length, dx / length
+    return vector.x * nx - vector.y * ny, vector.x * ny + vector.y * nx
+
+
+def _directions(points):
+    # The direction of each edge of the control polygon, with zero-length
+    # edges (such as retracted handles) taking the direction of a neighbour
+    edges = [(b.x - a.x, b.y - a.y) for a, b in zip(points, points[1:])]
+    nonzero = [e for e in edges if e != (0.0, 0.0)]
+    if not nonzero:
+        return None
+    result = []
+    last = nonzero[0]
+    for e in edges:
+        if e != (0.0, 0.0):
+            last = e
+        result.append(last)
+    return result
+
+
+def offsetControlPoints(points, vector, rotateVector=True):
+    """Returns the Tiller-Hanson offset of a control polygon: the control
+    points of a curve approximately offset from the curve with control
+    points `points` by `vector` (see :py:meth:`BezierPath.offset` for the
+    meaning of `vector` and `rotateVector`)."""
+    directions = _directions(points)
+    if directions is None or not rotateVector:
+        dx, dy = _shift(0, 0, vector, False)
+        return [Point(p.x + dx, p.y + dy) for p in points]
+    shifts = [_shift(dx, dy, vector, True) for dx, dy in directions]
+    # The part of the vector along the curve slides the moved edges along
+    # themselves, so the edges' intersection loses it; it is added back to
+    # the interior points separately, or small pieces would be distorted
+    across = Point(vector.x, 0)
+    along = [_shift(dx, dy, Point(0, vector.y), True) for dx, dy in directions]
+    limit = MITER_LIMIT * vector.magnitude
+    result = [Point(points[0].x + shifts[0][0], points[0].y + shifts[0][1])]
+    for i in range(1, len(points) - 1):
+        p = points[i]
+        (ax, ay), (bx, by) = directions[i - 1], directions[i]
+        (sax, say) = _shift(ax, ay, across, True)
+        (sbx, sby) = _shift(bx, by, across, True)
+        # The moved edges are p + sa + s*a and p + sb + r*b; solve for s
+        cross = ax * by - ay * bx
+        mx, my = (sax + sbx) / 2.0, (say + sby) / 2.0
+        if abs(cross) > 1e-12 * math.hypot(ax, ay) * math.hypot(bx, by):
+            s = ((sbx - sax) * by - (sby - say) * bx) / cross
+            qx, qy = sax + s * ax, say + s * ay
+            if math.hypot(qx, qy) <= limit:
+                mx, my = qx, qy
+        mx += (along[i - 1][0] + along[i][0]) / 2.0
+        my += (along[i - 1][1] + along[i][1]) / 2.0
+        result.append(Point(p.x + mx, p.y + my))
+    dx, dy = shifts[-1]
+    result.append(Point(points[-1].x + dx, points[-1].y + dy))
+    return result
+
+
+def _trueOffset(seg, t, vector, rotateVector):
+    d = seg.derivative().pointAtTime(t)
+    dx, dy = _shift(d.x, d.y, vector, rotateVector)
+    p = seg.pointAtTime(t)
+    return Point(p.x + dx, p.y + dy)
+
+
+def _offsetDirection(seg, t, vector):
+    # The direction in which the true offset of seg runs at time t (the
+    # vector is rotated), or None where that is undefined or reversed
+    d1 = seg.derivative()
+    v = d1.pointAtTime(t)
+    speed = math.hypot(v.x, v.y)
+    if speed == 0:
+        return None
+    a = d1.derivative().pointAtTime(t)
+    curvature = (v.x * a.y - v.y * a.x) / speed**3
+    tx, ty = v.x / speed, v.y / speed
+    along, across = 1 - vector.x * curvature, -vector.y * curvature
+    if along <= 0:
+        return None
+    return along * tx - across * ty, along * ty + across * tx
+
+
+def _distanceNear(approx, target, t):
+    # The distance from target to the closest point of approx, found by
+    # Newton's method starting at time t. Any point of approx gives an upper
+    # bound, so stopping early can only overestimate the distance.
+    d1 = approx.derivative()
+    for _ in range(0, NEWTON_STEPS):
+        p, v = approx.pointAtTime(t), d1.pointAtTime(t)
+        if isinstance(d1, Line):
+            a = d1.end - d1.start
+        else:
+            a = d1.derivative().pointAtTime(t)
+        dx, dy = p.x - target.x, p.y - target.y
+        slope = v.x * v.x + v.y * v.y + dx * a.x + dy * a.y
+        if slope <= 0:
+            break
+        t = min(max(t - (dx * v.x + dy * v.y) / slope, 0.0), 1.0)
+    return approx.pointAtTime(t).distanceFrom(target)
+
+
+def _samples(seg, vector, rotateVector):
+    # Points of the true offset of seg, with the times they were taken at
+    return [(t, _trueOffset(seg, t, vector, rotateVector)) for t in CHECK_TIMES]
+
+
+def _withinTolerance(approx, samples, tolerance):
+    for t, target in samples:
+        # The approximation needn't keep the curve's parameterization, so if
+        # the points at the same time are far apart, look for the closest
+        if approx.pointAtTime(t).distanceFrom(target) > tolerance:
+            if _distanceNear(approx, target, t) > tolerance:
+                return False
+    return True
+
+
+def _offsetPieces(seg, vector, rotateVector, tolerance, maxDepth):
+    # The pieces of offsetSegment, as (approximation, samples, directions)
+    # tuples. The samples are those of the true offset the piece was
+    # checked against, and the directions those in which the true offset
+    # leaves the piece's start and arrives at its end; either is None for a
+    # piece which can't be merged with its neighbours.
+    klass = seg.__class__
+    if isinstance(seg, Line) or not rotateVector:
+        approx = klass(*offsetControlPoints(seg.points, vector, rotateVector))
+        return [(approx, None, None)]
+    result = []
+    stack = [(seg, 0)]
+    while stack:
+        piece, depth = stack.pop()
+        approx = klass(*offsetControlPoints(piece.points, vector, rotateVector))
+        samples = _samples(piece, vector, rotateVector)
+        directions = None
+        if isinstance(piece, CubicBezier):
+            directions = _offsetDirection(piece, 0, vector), _offsetDirection(
+                piece, 1, vector
+            )
+            if None in directions:
+                # The true offset turns back on itself here
+                directions = None
+        if depth >= maxDepth or _withinTolerance(approx, samples, tolerance):
+            result.append((approx, samples, directions))
+            continue
+        if directions:
+            # Mitring the control polygon shortens the handles of a curve
+            # offset outwards (and lengthens them inwards), so before
+            # splitting, try fitting the handle lengths to the samples
+            refitted = _fitHandles(approx.start, approx.end, directions, samples)
+            if refitted and _withinTolerance(refitted, samples, tolerance):
+                result.append((refitted, samples, directions))
+                continue
+        left, right = piece.splitAtTime(0.5)
+        stack.append((right, depth + 1))
+        stack.append((left, depth + 1))
+    return result
+
+
+def offsetSegment(seg, vector, rotateVector=True, tolerance=0.1, maxDepth=MAX_DEPTH):
+    """Returns a list of segments of the same type as `seg` which together
+    approximate the offset of `seg` by `vector`, to within about `tolerance`
+    (see above). Lines are offset exactly."""
+    pieces = _offsetPieces(seg, vector, rotateVector, tolerance, maxDepth)
+    return [piece[0] for piece in pieces]
+
+
+def offsetSegments(segs, vector, rotateVector=True, tolerance=0.1, closed=False):
+    """Offsets a run of connected segments with `offsetSegment`. Where the
+    offsets of two neighbouring segments don't meet (at a corner of the
+    original path), they are joined with a line. Neighbouring pieces which
+    meet smoothly are merged wherever a single curve (or line) stays within
+    the tolerance of the true offset of both."""
+    result = []
+    for seg in segs:
+        for piece in _offsetPieces(seg, vector, rotateVector, tolerance, MAX_DEPTH):
+            _add(result, piece, tolerance)
+    if closed and len(result) > 1:
+        end = result[-1][0].end
+        first = result[0][0]
+        if end.distanceFrom(first.start) > 1e-9:
+            result.append((Line(end, first.start), None, None))
+        else:
+            result[0] = (first.__class__(end, *first.points[1:]),) + result[0][1:]
+    return [piece[0] for piece in result]
+
+
+def _add(result, piece, tolerance):
+    # Appends a piece to result, joining it to the last one with a line if
+    # they don't meet, and merging the two if they can be
+    approx = piece[0]
+    if result:
+        end = result[-1][0].end
+        if end.distanceFrom(approx.start) > 1e-9:
+            result.append((Line(end, approx.start), None, None))
+        else:
+            # Snap together ends which differ only by rounding error, on a
+            # copy, as the piece may be shared
+            approx = approx.__class__(end, *approx.points[1:])
+            piece = (approx,) + piece[1:]
+            merged = _merge(result[-1], piece, tolerance)
+            if merged:
+                result[-1] = merged
+                return
+    result.append(piece)
+
+
+def _merge(first, second, tolerance):
+    # A single piece replacing two which meet smoothly, or None
+    (a, aSamples, aDirections), (b, bSamples, bDirections) = first, second
+    if isinstance(a, Line) and isinstance(b, Line):
+        (ax, ay), (bx, by) = a.end - a.start, b.end - b.start
+        if (
+            abs(ax * by - ay * bx) <= 1e-9 * a.length * b.length
+            and ax * bx + ay * by > 0
+        ):
+            return (Line(a.start, b.end), None, None)
+        return None
+    if not (aSamples and aDirections and bSamples and bDirections):
+        return None
+    (ax, ay), (bx, by) = aDirections[1], bDirections[0]
+    if ax * bx + ay * by <= 0 or abs(ax * by - ay * bx) > G1_LIMIT * math.hypot(
+        ax, ay
+    ) * math.hypot(bx, by):
+        return None
+    # Place each piece's samples on the merged curve in proportion to the
+    # lengths of their control polygons
+    aLength, bLength = _polygonLength(a.points), _polygonLength(b.points)
+    split = aLength / (aLength + bLength)
+    samples = [(t * split, p) for t, p in aSamples]
+    samples.append((split, a.end))
+    samples.extend((split + t * (1 - split), p) for t, p in bSamples)
+    directions = aDirections[0], bDirections[1]
+    merged = _fitHandles(a.start, b.end, directions, samples)
+    if merged is None or not _withinTolerance(merged, samples, tolerance):
+        return None
+    return (merged, samples, directions)
+
+
+def _polygonLength(points):
+    return sum(p.distanceFrom(q) for p, q in zip(points, points[1:]))
+
+
+def _fitHandles(start, end, directions, samples):
+    # The cubic from start to end, leaving and arriving in the given
+    # directions, whose handle lengths best fit the samples in the least
+    # squares sense; or None, if no such curve has handles pointing forward
+    d0, d1 = _unit(directions[0]), _unit(directions[1])
+    a11 = a12 = a22 = r1 = r2 = 0.0
+    for t, p in samples:
+        mt = 1 - t
+        b0, b1, b2, b3 = mt * mt * mt, 3 * mt * mt * t, 3 * mt * t * t, t * t * t
+        # What's left to fit once the end points' contribution is removed
+        rx = p.x - (b0 + b1) * start.x - (b2 + b3) * end.x
+        ry = p.y - (b0 + b1) * start.y - (b2 + b3) * end.y
+        ux, uy = b1 * d0[0], b1 * d0[1]
+        vx, vy = -b2 * d1[0], -b2 * d1[1]
+        a11 += ux * ux + uy * uy
+        a12 += ux * vx + uy * vy
+        a22 += vx * vx + vy * vy
+        r1 += ux * rx + uy * ry
+        r2 += vx * rx + vy * ry
+    det = a11 * a22 - a12 * a12
+    if abs(det) <= 1e-12 * a11 * a22:
+        return None
+    h0 = (r1 * a22 - r2 * a12) / det
+    h1 = (a11 * r2 - a12 * r1) / det
+    if h0 <= 0 or h1 <= 0:
+        return None
+    return CubicBezier(
+        start,
+        Point(start.x + h0 * d0[0], start.y + h0 * d0[1]),
+        Point(end.x - h1 * d1[0], end.y - h1 * d1[1]),
+        end,
+    )
+
+
+def _unit(direction):
+    length = math.hypot(*direction)
+    return direction[0] / length, direction[1] / length
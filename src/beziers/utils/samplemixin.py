@@ -1,3 +1,13 @@
+from beziers.point import Point
+
+
+def pointsFromCoords(coords):
+    """Turns the result of a `pointsAtTimes` call into a list of Point objects."""
+    if hasattr(coords, "tolist"):
+        coords = coords.tolist()
+    return [Point(x, y) for x, y in coords]
+
+
 class SampleMixin(object):
     def sample(self, samples):
         """Samples a segment or path a given number of times, returning a list of Point objects.
@@ -19,45 +29,35 @@ class SampleMixin(object):
         """
         step = 1.0 / float(samples)
         t = 0.0
-        samples = []
+        ts = []
         while t <= 1.0:
-            samples.append(self.pointAtTime(t))
+            ts.append(t)
             t += step
         if t != 1.0:
-            samples.append(self.pointAtTime(1))
-        return samples
+            ts.append(1)
+        return pointsFromCoords(self.pointsAtTimes(ts))
 
     def regularSample(self, samples):
         """Samples a segment or path a given number of times, returning a list of Point objects,
         but ensuring that the points are regularly distributed along the length
-        of the curve. This is an expensive operation because I am a lazy programmer."""
+        of the curve. Segments cache the arc length table used for this, so sampling
+        the same segment repeatedly is cheap."""
 
-        return [self.pointAtTime(t) for t in self.regularSampleTValue(samples)]
+        return pointsFromCoords(self.pointsAtTimes(self.regularSampleTValue(samples)))
 
     def regularSampleTValue(self, samples):
         """Sometimes you don't want the points, you just want a set of time values (t) which
         represent regular spaced samples along the curve. Use this method to get a list of time
         values instead of Point objects."""
-        # Build LUT; could cache it *if* we knew when to invalidate
-        lut = []
         length = self.length
         if length == 0:
             return []
-        step = 1.0 / length
-        t = 0
-        while t <= 1.0:
-            lut.append(
-                (t, self.lengthAtTime(t))
-            )  # Inefficient algorithm but computers are getting faster
-            t += step
+        # Segments call it tAtLength, paths call it timeAtLength
+        tAtLength = getattr(self, "tAtLength", None) or self.timeAtLength
         desiredLength = 0.0
         rSamples = []
         while desiredLength < length:
-            while len(lut) > 0 and lut[0][1] < desiredLength:
-                lut.pop(0)
-            if len(lut) == 0:
-                break
-            rSamples.append(lut[0][0])
+            rSamples.append(tAtLength(desiredLength))
             desiredLength += length / samples
         if rSamples[-1] != 1.0:
             rSamples.append(1.0)
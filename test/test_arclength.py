@@ -17,3 +17,24 @@ class ArcLengthMethods(unittest.TestCase):
             Point(100, 25), Point(10, 90), Point(110, 100), Point(132, 192)
         )
         self.assertAlmostEqual(b1.length, 202.20118972656385)
+
+    def test_tAtLength(self):
+        b1 = CubicBezier(
+            Point(100, 25), Point(10, 90), Point(110, 100), Point(132, 192)
+        )
+        for t in [0.1, 0.3, 0.5, 0.8]:
+            length = b1.lengthAtTime(t)
+            self.assertAlmostEqual(length, b1.splitAtTime(t)[0].length)
+            self.assertAlmostEqual(b1.tAtLength(length), t)
+        self.assertEqual(b1.tAtLength(0), 0)
+        self.assertEqual(b1.tAtLength(b1.length + 1), 1)
+        self.assertEqual(b1.pointAtLength(b1.lengthAtTime(0.5)), b1.pointAtTime(0.5))
+
+    def test_table_invalidation(self):
+        b1 = QuadraticBezier(Point(150, 40), Point(80, 30), Point(105, 150))
+        before = b1.lengthAtTime(1)
+        b1[2] = Point(105, 300)
+        self.assertAlmostEqual(b1.lengthAtTime(1), b1.length)
+        self.assertNotAlmostEqual(b1.lengthAtTime(1), before)
+        b1[2].y = 150
+        self.assertAlmostEqual(b1.lengthAtTime(1), before)
@@ -0,0 +1,52 @@
+import unittest
+from beziers.batch import batchMap, batchApply, BatchError, packPath, unpackPath
+from beziers.path import BezierPath
+from beziers.path.geometricshapes import Circle, Rectangle
+from beziers.point import Point
+import pickle
+
+
+class BatchTests(unittest.TestCase):
+    def setUp(self):
+        self.paths = [Circle(10 + i, origin=Point(i * 30, 0)) for i in range(0, 12)]
+
+    def test_pack(self):
+        path = self.paths[3]
+        packed = pickle.loads(pickle.dumps(packPath(path)))
+        copy = unpackPath(packed)
+        self.assertEqual(copy.asSegments(), path.asSegments())
+        self.assertEqual(copy.closed, path.closed)
+        # Packing neither changes the path's representation nor shares
+        # its buffers
+        path.asSegments()
+        active = path.activeRepresentation
+        packed = packPath(path)
+        self.assertIs(path.activeRepresentation, active)
+        packed.coords[0] += 1
+        self.assertNotEqual(path.asPacked()[0][0], packed.coords[0])
+
+    def test_map(self):
+        results = list(batchMap("addExtremes", self.paths, processes=2, chunksize=5))
+        self.assertEqual([r.index for r in results], list(range(0, 12)))
+        for r in results:
+            self.assertIsNone(r.error)
+            self.assertIsInstance(r.value, BezierPath)
+            self.assertEqual(r.value.asSegments(), self.paths[r.index].asSegments())
+        lengths = batchApply("getSelfIntersections", self.paths, processes=1)
+        self.assertEqual(lengths, [[]] * 12)
+        unordered = batchMap("union", self.paths, self.paths[0], ordered=False)
+        self.assertEqual(sorted(r.index for r in unordered), list(range(0, 12)))
+
+    def test_errors(self):
+        paths = [Rectangle(10, 10), BezierPath.fromSegments([]), Rectangle(20, 20)]
+        results = list(batchMap("pointAtLength", paths, 15, processes=1))
+        self.assertEqual([r.error is None for r in results], [True, False, True])
+        self.assertEqual(results[0].value, Point(5, 0))
+        self.assertIn("IndexError", results[1].error)
+        with self.assertRaises(BatchError) as cm:
+            batchApply("pointAtLength", paths, 15, processes=2)
+        self.assertEqual([f.index for f in cm.exception.failures], [1])
+        # An unknown operation is reported at once, not on first iteration
+        for operation in ("frobnicate", "length", "closed", "_moments"):
+            with self.assertRaises(AttributeError):
+                batchMap(operation, paths)
@@ -3,6 +3,7 @@ from beziers.path import BezierPath
 from beziers.path.representations.Nodelist import NodelistRepresentation, Node
 from beziers.point import Point
 from beziers.path.geometricshapes import Circle, Square
+from beziers.utils.booleanoperationsmixin import union_all, intersect_all, difference
 
 
 class BooleanShapeOperations(unittest.TestCase):
@@ -21,3 +22,82 @@ class BooleanShapeOperations(unittest.TestCase):
         clip = Circle(10, origin=Point(15, 15))
         paths = subject.union(clip)
         self.drawIt(subject, clip, paths)
+
+    def test_union_all(self):
+        circles = [Circle(30, origin=Point(i * 40, 0)) for i in range(0, 5)]
+        circles.append(Circle(10, origin=Point(0, 200)))
+        paths = union_all(circles)
+        self.assertEqual(len(paths), 2)
+        chain = max(paths, key=lambda p: p.bounds().width)
+        self.assertAlmostEqual(chain.bounds().left, -30, places=1)
+        self.assertAlmostEqual(chain.bounds().right, 190, places=1)
+        inside = [Point(i * 20, 0) for i in range(0, 9)]
+        self.assertTrue(all(chain.containsPoints(inside)))
+        self.assertFalse(any(chain.containsPoints([Point(20, 29), Point(0, 200)])))
+
+    def test_union_all_rule(self):
+        # The fill rule applies to all of the paths at once
+        a, b = Circle(50), Circle(50, origin=Point(50, 0))
+        union = union_all([a, b])
+        self.assertEqual(len(union), 1)
+        self.assertAlmostEqual(union[0].area, a.union(b)[0].area, places=0)
+        lunes = union_all([a, b], rule="evenodd")
+        self.assertEqual(len(lunes), 2)
+        self.assertAlmostEqual(sum(p.area for p in lunes), 2 * 4784, delta=2)
+        counter = Circle(40)
+        counter.reverse()
+        o = union_all([Circle(100), counter])
+        self.assertEqual(len(o), 2)
+        # The counter survives as a hole, running the other way
+        outer, inner = sorted(o, key=lambda p: -p.area)
+        self.assertAlmostEqual(inner.area, counter.area, delta=2)
+        self.assertEqual(inner.direction, -outer.direction)
+
+    def test_coincident_vertices(self):
+        # Vertices of different paths at the same point are told apart
+        squares = union_all([Square(100), Square(100, origin=Point(100, 0))])
+        self.assertEqual(len(squares), 1)
+        self.assertEqual(squares[0].area, 20000)
+        self.assertEqual(len(squares[0].asSegments()), 4)
+        a, b = Circle(50), Circle(50, origin=Point(100, 0))
+        circles = union_all([a, b])
+        self.assertEqual(len(circles), 2)
+        for circle in circles:
+            self.assertAlmostEqual(circle.area, a.area)
+            self.assertEqual(len(circle.asSegments()), 4)
+
+    def test_intersect_all_and_difference(self):
+        square = Square(100, origin=Point(0, 0))
+        circle = Circle(40, origin=Point(50, 50))
+        other = Square(100, origin=Point(60, 0))
+        common = intersect_all([square, circle, other])
+        self.assertEqual(len(common), 1)
+        self.assertTrue(common[0].containsPoints([Point(35, 35)])[0])
+        self.assertFalse(common[0].containsPoints([Point(15, -40)])[0])
+        self.assertEqual(intersect_all([square, Circle(10, origin=Point(500, 0))]), [])
+
+        holes = difference([square], [Circle(10, origin=Point(0, 0)), circle])
+        probes = [Point(0, 0), Point(40, 40), Point(-40, -40), Point(40, -40)]
+        # The centre hole is a separate contour running the other way
+        self.assertEqual(len(holes), 2)
+        winding = [
+            sum(p.containmentIndex().windingNumber(pt) for p in holes) for pt in probes
+        ]
+        self.assertEqual([w != 0 for w in winding], [False, False, True, True])
+
+    def test_curves_preserved(self):
+        square = Square(100, origin=Point(0, 0))
+        circle = Circle(50, origin=Point(50, 50))
+        paths = square.union(circle)
+        self.assertEqual(len(paths), 1)
+        segs = paths[0].asSegments()
+        self.assertEqual([len(s) for s in segs].count(4), 3)
+        self.assertEqual(len(segs), 7)
+        for a, b in zip(segs, segs[1:] + segs[:1]):
+            self.assertLess(a.end.distanceFrom(b.start), 0.01)
+        # Three quarters of the circle survive unchanged
+        quarters = [s for s in circle.asSegments() if s in segs or s.reversed() in segs]
+        self.assertEqual(len(quarters), 3)
+        self.assertAlmostEqual(paths[0].area, 100 * 100 + circle.area * 0.75, delta=1)
+        flat = square.union(circle, flat=True)[0]
+        self.assertTrue(all(len(s) == 2 for s in flat.asSegments()))
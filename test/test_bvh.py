@@ -0,0 +1,52 @@
+import unittest
+from beziers.boundingbox import BoundingBox
+from beziers.line import Line
+from beziers.utils.bvh import BVH
+from beziers.path.geometricshapes import Rectangle, Circle
+from beziers.point import Point
+
+
+class BVHTests(unittest.TestCase):
+    def setUp(self):
+        self.paths = [Circle(50, origin=Point(x * 120, 0)) for x in range(0, 10)]
+        self.index = BVH.fromPaths(self.paths)
+
+    def test_overlapping(self):
+        box = BoundingBox()
+        box.extend(Point(100, -10))
+        box.extend(Point(140, 10))
+        expected = [s for s in self.index.segments if s.bounds().overlaps(box)]
+        found = self.index.overlapping(box)
+        self.assertEqual(len(found), 4)
+        self.assertEqual(set(map(id, found)), set(map(id, expected)))
+        self.assertEqual(set(self.index.pathOf(s) for s in found), {self.paths[1]})
+
+    def test_along_line(self):
+        ray = Line(Point(-100, 10), Point(180, 10))
+        hits = self.index.rayIntersections(ray)
+        self.assertEqual(len(hits), 4)
+        for i in hits:
+            self.assertAlmostEqual(i.point.y, 10)
+
+    def test_nearest(self):
+        seg, t, d = self.index.nearest(Point(360, 100))
+        self.assertAlmostEqual(d, 50, places=2)
+        self.assertIs(self.index.pathOf(seg), self.paths[3])
+        self.assertAlmostEqual(seg.pointAtTime(t).y, 50, places=2)
+        self.assertIsNone(BVH([]).nearest(Point(0, 0)))
+
+    def test_path_index_cache(self):
+        path = Rectangle(100, 100)
+        index = path.segmentIndex()
+        self.assertIs(path.segmentIndex(), index)
+        path.translate(Point(10, 0))
+        self.assertIsNot(path.segmentIndex(), index)
+        # As is an edit in place, once changed() is called
+        segs = path.asSegments()
+        segs[0][1] = segs[1][0] = Point(60, 200)
+        path.changed()
+        box = BoundingBox()
+        box.extend(Point(50, 190))
+        box.extend(Point(70, 210))
+        found = path.segmentIndex().overlapping(box)
+        self.assertEqual(set(map(id, found)), {id(segs[0]), id(segs[1])})
@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import unittest
+from beziers.cache import DiskCache, caching
+from beziers.path.geometricshapes import Circle, Rectangle
+from beziers.point import Point
+
+
+class CacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_fingerprint(self):
+        a = Rectangle(200, 100)
+        b = Rectangle(200, 100)
+        self.assertEqual(a.fingerprint(), b.fingerprint())
+        b.translate(Point(1, 0))
+        self.assertNotEqual(a.fingerprint(), b.fingerprint())
+        b.closed = False
+        b.translate(Point(-1, 0))
+        self.assertNotEqual(a.fingerprint(), b.fingerprint())
+        # Edits in place change the fingerprint once changed() is called
+        before = a.fingerprint()
+        a.asSegments()[0][0].x += 1
+        a.changed()
+        self.assertNotEqual(a.fingerprint(), before)
+
+    def test_cached_methods(self):
+        with caching(self.directory) as cache:
+            p = Rectangle(200, 100)
+            self.assertEqual(p.length, 600)
+            self.assertEqual(p.bounds().width, 200)
+            self.assertEqual(cache.misses, 2)
+            q = Rectangle(200, 100)
+            self.assertEqual(q.length, 600)
+            self.assertEqual(q.bounds().width, 200)
+            self.assertEqual(cache.hits, 2)
+            q.scale(2)
+            self.assertEqual(q.length, 1200)
+            self.assertEqual(cache.misses, 3)
+        # Entries persist once the cache is closed and reopened
+        with caching(self.directory) as cache:
+            self.assertEqual(Rectangle(200, 100).length, 600)
+            self.assertEqual(cache.hits, 1)
+        self.assertEqual(Rectangle(200, 100).length, 600)
+
+    def test_eviction(self):
+        cache = DiskCache(self.directory, maxSize=1000)
+        for i in range(0, 20):
+            cache.set("key%i" % i, b"x" * 100)
+        self.assertLessEqual(cache.size, 1000)
+        self.assertNotIn("key0", cache)
+        self.assertIn("key19", cache)
+        cache.get("key12")
+        for i in range(20, 25):
+            cache.set("key%i" % i, b"x" * 100)
+        self.assertIn("key12", cache)
+        self.assertNotIn("key13", cache)
+        cache.close()
+        # Use times of hits are written out when the cache is closed
+        cache = DiskCache(self.directory, maxSize=1000)
+        cache.get("key18")
+        cache.close()
+        cache = DiskCache(self.directory, maxSize=1000)
+        for i in range(25, 28):
+            cache.set("key%i" % i, b"x" * 100)
+        self.assertIn("key18", cache)
+        self.assertNotIn("key19", cache)
+        cache.close()
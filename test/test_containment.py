@@ -0,0 +1,60 @@
+import math
+import unittest
+import beziers.utils
+from beziers.line import Line
+from beziers.path import BezierPath
+from beziers.path.geometricshapes import Circle
+from beziers.point import Point
+
+
+def pentagram():
+    points = [
+        Point(math.sin(i * 4 * math.pi / 5) * 100, math.cos(i * 4 * math.pi / 5) * 100)
+        for i in range(0, 5)
+    ]
+    return BezierPath.fromSegments(
+        [Line(points[i - 1], points[i]) for i in range(0, 5)]
+    )
+
+
+class ContainmentTests(unittest.TestCase):
+    def tearDown(self):
+        beziers.utils._numpy = False
+
+    def test_rules(self):
+        star = pentagram()
+        pts = [Point(0, 0), Point(0, 70), Point(0, 150), Point(0, -90)]
+        self.assertEqual(
+            list(star.containmentIndex().windingNumbers(pts)), [-2, -1, 0, 0]
+        )
+        self.assertEqual(list(star.containsPoints(pts)), [True, True, False, False])
+        self.assertEqual(
+            list(star.containsPoints(pts, rule="evenodd")), [False, True, False, False]
+        )
+        self.assertTrue(star.pointIsInside(Point(0, 0), rule="nonzero"))
+        self.assertFalse(star.pointIsInside(Point(0, 0)))
+        with self.assertRaises(ValueError):
+            star.containsPoints(pts, rule="winding")
+
+    def test_curves(self):
+        circle = Circle(50, origin=Point(10, 10))
+        pts = [(x * 7.0 - 50, y * 7.0 - 50) for x in range(0, 20) for y in range(0, 20)]
+        expected = [math.hypot(x - 10, y - 10) < 49.9 for x, y in pts]
+        inside = circle.containsPoints(pts)
+        self.assertEqual(list(inside), expected)
+        # Points level with vertices are counted once
+        self.assertEqual(
+            list(circle.containsPoints([(0, 10), (70, 60)])), [True, False]
+        )
+        beziers.utils._numpy = None
+        self.assertEqual(circle.containsPoints(pts), expected)
+
+    def test_edited_in_place(self):
+        circle = Circle(50)
+        self.assertTrue(circle.pointIsInside(Point(0, 0)))
+        points = {id(pt): pt for seg in circle.asSegments() for pt in seg.points}
+        for pt in points.values():
+            pt.x += 200
+        circle.changed()
+        self.assertFalse(circle.pointIsInside(Point(0, 0)))
+        self.assertEqual(list(circle.containsPoints([(200, 0), (0, 0)])), [True, False])
@@ -20,7 +20,11 @@ class CubicMethods(unittest.TestCase):
         q = CubicBezier(
             Point(120, 160), Point(35, 200), Point(220, 260), Point(220, 40)
         )
-        self.assertAlmostEqual(q.length, 272.87003168)
+        # The true arc length; a single 24-point Gauss rule gave 272.87003168
+        self.assertAlmostEqual(q.length, 272.87002978)
+        # Lookups agree with the length exactly at the ends
+        self.assertEqual(q.lengthAtTime(1), q.length)
+        self.assertEqual(q.tAtLength(q.length), 1)
 
     def test_align(self):
         q = CubicBezier(
@@ -56,3 +60,56 @@ class CubicMethods(unittest.TestCase):
         p2 = q.pointAtTime(roots[1])
         self.assertTrue(q.hasLoop)
         self.assertEqual(p1, p2)
+
+    def test_derived_cache(self):
+        import beziers.segment
+
+        q = CubicBezier(
+            Point(120, 160), Point(35, 200), Point(220, 260), Point(220, 40)
+        )
+        self.assertIs(q.derivative(), q.derivative())
+        bounds = q.bounds()
+        left = bounds.left
+        bounds.addMargin(10)
+        self.assertEqual(q.bounds().left, left)
+        q[3].x = 320
+        self.assertAlmostEqual(q.bounds().right, 320)
+        q[3] = Point(220, 40)
+        self.assertAlmostEqual(q.bounds().right, 220)
+        self.assertAlmostEqual(q.length, 272.87002978)
+        q.round()
+        self.assertEqual(q.derivative()[0], Point(-255, 120))
+        beziers.segment.CACHE_DERIVED_GEOMETRY = False
+        try:
+            self.assertIsNot(q.derivative(), q.derivative())
+            self.assertAlmostEqual(q.length, 272.87002978)
+        finally:
+            beziers.segment.CACHE_DERIVED_GEOMETRY = True
+
+    def test_flatten_tolerance(self):
+        q = CubicBezier(
+            Point(120, 160), Point(35, 200), Point(220, 260), Point(220, 40)
+        )
+        for tolerance in [1, 0.1, 0.01]:
+            lines = q.flatten(tolerance=tolerance)
+            self.assertEqual(lines[0].start, q.start)
+            self.assertEqual(lines[-1].end, q.end)
+            self.assertEqual(lines[0]._tRange[0], 0)
+            self.assertEqual(lines[-1]._tRange[1], 1)
+            for line in lines:
+                self.assertIs(line._orig, q)
+                t0, t1 = line._tRange
+                self.assertEqual(q.pointAtTime(t1), line.end)
+                for i in range(1, 4):
+                    pt = q.pointAtTime(t0 + (t1 - t0) * i / 4.0)
+                    d = line.start.distanceFrom(line.end)
+                    v = line.end - line.start
+                    deviation = (
+                        abs(v.x * (pt.y - line.start.y) - v.y * (pt.x - line.start.x))
+                        / d
+                    )
+                    self.assertLessEqual(deviation, tolerance)
+        # A nearly straight curve needs very few lines
+        flat = CubicBezier(Point(0, 0), Point(100, 1), Point(200, -1), Point(300, 0))
+        self.assertLessEqual(len(flat.flatten(tolerance=0.5)), 2)
+        self.assertGreater(len(flat.flatten(8)), 2)
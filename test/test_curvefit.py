@@ -1,5 +1,8 @@
 import unittest
-from beziers.utils.curvefitter import CurveFit
+import math
+import random
+from beziers.utils.curvefitter import CurveFit, StreamingCurveFit
+from beziers.utils.curvefitter import fitLargeCurve, findCorners, simplifyPoints
 from beziers.path import BezierPath
 from beziers.point import Point
 
@@ -33,6 +36,93 @@ class CurveFitterMethods(unittest.TestCase):
         self.assertAlmostEqual(segs[1][1].x, 50)
         self.assertEqual(segs[1].end, Point(220.0, 50.0))
 
+    def test_numpy_backend(self):
+        try:
+            import numpy
+        except ImportError:
+            raise unittest.SkipTest("numpy not installed")
+        points = [Point(i, (i % 17) * 3 + (i % 5)) for i in range(0, 150)]
+        for error, cornerTolerance in ((50.0, 20.0), (1.0, 1.0)):
+            python = BezierPath.fromPoints(points, error, cornerTolerance, 200)
+            vectorized = BezierPath.fromPoints(
+                points, error, cornerTolerance, 200, backend="numpy"
+            )
+            segs = python.asSegments()
+            self.assertEqual(len(vectorized.asSegments()), len(segs))
+            for s1, s2 in zip(segs, vectorized.asSegments()):
+                for p1, p2 in zip(s1.points, s2.points):
+                    self.assertAlmostEqual(p1.x, p2.x, places=6)
+                    self.assertAlmostEqual(p1.y, p2.y, places=6)
+        with self.assertRaises(ValueError):
+            BezierPath.fromPoints(points, backend="fortran")
+        # The streaming fitter hands its points to either backend alike
+        streams = []
+        for backend in ("python", "numpy"):
+            fitter = StreamingCurveFit(error=4.0, window=60, backend=backend)
+            for p in points:
+                fitter.addPoint(p)
+            streams.append(fitter.path.asSegments())
+        self.assertEqual(len(streams[0]), len(streams[1]))
+        for s1, s2 in zip(*streams):
+            for p1, p2 in zip(s1.points, s2.points):
+                self.assertAlmostEqual(p1.x, p2.x, places=6)
+                self.assertAlmostEqual(p1.y, p2.y, places=6)
+
+    def test_streaming(self):
+        points = [
+            Point(i * 2, 100 * math.sin(i / 15.0) + (i % 3)) for i in range(0, 300)
+        ]
+        fitter = StreamingCurveFit(error=4.0, window=60)
+        for i, point in enumerate(points):
+            path = fitter.addPoint(point)
+            if i % 50 == 0:
+                fitter.addPoint(point)  # repeated points are ignored
+        segs = path.asSegments()
+        self.assertFalse(path.closed)
+        self.assertGreater(len(fitter.frozen), 0)
+        self.assertEqual(segs[0].start, points[0])
+        self.assertEqual(segs[-1].end, points[-1])
+        for s1, s2 in zip(segs, segs[1:]):
+            self.assertEqual(s1.end, s2.start)
+        # Every point is within the fitting tolerance of the path
+        index = path.segmentIndex()
+        for point in points:
+            self.assertLess(index.nearest(point)[2], 2.5)
+
+    def test_large(self):
+        # A noisy, wobbly square, as if scanned
+        rnd = random.Random(1)
+        corners = [Point(0, 0), Point(1000, 0), Point(1000, 1000), Point(0, 1000)]
+        points = []
+        for side in range(0, 4):
+            a, b = corners[side], corners[(side + 1) % 4]
+            normal = (b - a).toUnitVector()
+            normal = Point(-normal.y, normal.x)
+            for i in range(0, 2500):
+                f = i / 2500.0
+                p = a.lerp(b, f) + normal * (30 * math.sin(f * math.pi * 3))
+                points.append(Point(p.x + rnd.gauss(0, 0.3), p.y + rnd.gauss(0, 0.3)))
+        points.append(points[0])
+
+        kept = simplifyPoints(points, 1.0)
+        self.assertLess(len(kept), len(points) / 5)
+        reduced = [points[i] for i in kept]
+        found = [reduced[i] for i in findCorners(reduced, math.radians(70), 20)]
+        self.assertEqual(len(found), 3)
+        for corner, point in zip(corners[1:], found):
+            self.assertLess(corner.distanceFrom(point), 2)
+
+        segs = fitLargeCurve(points, error=4.0, chunkSize=100)
+        path = BezierPath.fromSegments(segs)
+        path.closed = False
+        self.assertEqual(segs[0].start, points[0])
+        self.assertEqual(segs[-1].end, points[-1])
+        for s1, s2 in zip(segs, segs[1:]):
+            self.assertEqual(s1.end, s2.start)
+        index = path.segmentIndex()
+        for point in points[::50]:
+            self.assertLess(index.nearest(point)[2], 3.0)
+
     def not_a_test_cf3(self):
         import matplotlib.pyplot as plt
         import math
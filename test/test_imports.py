@@ -0,0 +1,20 @@
+import subprocess
+import sys
+import unittest
+
+OPTIONAL = ["pyclipper", "numpy", "shapely", "scipy", "matplotlib", "fontTools"]
+
+
+class ImportTests(unittest.TestCase):
+    def test_no_optional_imports(self):
+        # Run in a fresh interpreter, as other tests will have loaded them
+        loaded = subprocess.check_output(
+            [
+                sys.executable,
+                "-c",
+                "import sys, beziers.path\n"
+                "print(','.join(m for m in %r if m in sys.modules))" % OPTIONAL,
+            ],
+            text=True,
+        ).strip()
+        self.assertEqual(loaded, "")
@@ -0,0 +1,40 @@
+import unittest
+from beziers.instrument import profile
+from beziers.cubicbezier import CubicBezier
+from beziers.path import BezierPath
+from beziers.path.geometricshapes import Circle
+from beziers.point import Point
+
+
+class InstrumentTests(unittest.TestCase):
+    def test_profile(self):
+        c1 = CubicBezier(
+            Point(100, 25), Point(10, 90), Point(110, 100), Point(132, 192)
+        )
+        c2 = CubicBezier(Point(5, 150), Point(180, 20), Point(80, 250), Point(210, 190))
+        original = CubicBezier.pointAtTime
+        with profile() as report:
+            for i in range(0, 10):
+                c1.pointAtTime(i / 10.0)
+            c1.intersections(c2)
+            c1.intersections(c2, method="bisection")
+            Circle(10).length
+        self.assertIs(CubicBezier.pointAtTime, original)
+        self.assertGreaterEqual(report.calls("CubicBezier.pointAtTime"), 10)
+        self.assertEqual(report.calls("IntersectionsMixin.intersections"), 2)
+        self.assertGreater(report["bezierclipping._intersect"].maxDepth, 1)
+        t = report["IntersectionsMixin._curve_curve_intersections_t"]
+        self.assertGreater(t.maxDepth, 5)
+        self.assertGreater(t.calls, t.maxDepth)
+        self.assertEqual(report.calls("BezierPath.length"), 1)
+        self.assertLessEqual(report["BezierPath.length"].time, report.elapsed)
+        self.assertIn("CubicBezier.pointAtTime", str(report))
+
+    def test_fitting(self):
+        points = [Point(i, (i % 17) * 3) for i in range(0, 100)]
+        with profile() as report:
+            BezierPath.fromPoints(points)
+            with self.assertRaises(RuntimeError):
+                with profile():
+                    pass
+        self.assertGreater(report.calls("CurveFit._fitCurve"), 0)
@@ -72,6 +72,30 @@ class IntersectionMethods(unittest.TestCase):
 
         # plt.show()
 
+    def test_cubic_cubic_methods(self):
+        q1 = CubicBezier(Point(10, 100), Point(90, 30), Point(40, 140), Point(220, 220))
+        q2 = CubicBezier(Point(5, 150), Point(180, 20), Point(80, 250), Point(210, 190))
+        clipped = q1.intersections(q2)
+        bisected = list(q1.intersections(q2, method="bisection"))
+        self.assertEqual(len(clipped), 3)
+        self.assertEqual(len(bisected), 3)
+        for c, b in zip(clipped, sorted(bisected, key=lambda i: i.t1)):
+            self.assertAlmostEqual(c.t1, b.t1, places=3)
+            self.assertAlmostEqual(c.t2, b.t2, places=3)
+            self.assertEqual(c.point, q2.pointAtTime(c.t2))
+        # Overlapping curves meet along a stretch, not at points
+        self.assertEqual(q1.intersections(q1.clone()), [])
+        self.assertEqual(q1.intersections(q1.reversed()), [])
+        q1.intersections(q1.splitAtTime(0.5)[0])  # terminates
+        # Curves which only touch at a shared end point
+        q3 = CubicBezier(q1.end, Point(250, 150), Point(300, 150), Point(350, 220))
+        self.assertEqual(q1.intersections(q3), [])
+        touching = q1.intersections(q3, limited=False)
+        self.assertEqual(len(touching), 1)
+        self.assertAlmostEqual(touching[0].t1, 1.0)
+        self.assertAlmostEqual(touching[0].t2, 0.0)
+        self.assertAlmostEqual(touching[0].point.distanceFrom(q1.end), 0, places=5)
+
     def test_cubic_line_2(self):
         s1 = (
             CubicBezier.fromRepr(
@@ -0,0 +1,35 @@
+import unittest
+from beziers.utils.linesweep import bbox_intersections, overlapping_pairs
+from beziers.path.geometricshapes import Rectangle, Circle
+from beziers.point import Point
+
+
+class LineSweepTests(unittest.TestCase):
+    def test_two_sets(self):
+        left = [
+            Rectangle(100, 70, origin=Point(50, 50)),
+            Rectangle(30, 100, origin=Point(80, 150)),
+            Rectangle(50, 50, origin=Point(200, 0)),
+        ]
+        right = [
+            Rectangle(100, 30, origin=Point(120, 0)),
+            Rectangle(50, 50, origin=Point(0, 0)),
+            Rectangle(100, 250, origin=Point(30, 200)),
+        ]
+        pairs = bbox_intersections(left, right)
+        expected = [
+            (a, b) for a in left for b in right if a.bounds().overlaps(b.bounds())
+        ]
+        self.assertEqual(len(pairs), 4)
+        self.assertEqual(pairs, expected)
+
+    def test_self(self):
+        segs = Circle(50).asSegments() + Circle(50, origin=Point(300, 0)).asSegments()
+        boxes = [s.bounds() for s in segs]
+        expected = [
+            (i, j)
+            for i in range(len(boxes))
+            for j in range(i + 1, len(boxes))
+            if boxes[i].overlaps(boxes[j])
+        ]
+        self.assertEqual(overlapping_pairs(boxes), expected)
@@ -6,6 +6,7 @@ from beziers.point import Point
 from beziers.cubicbezier import CubicBezier
 from beziers.line import Line
 from beziers.path import BezierPath
+from beziers.utils.bvh import BVH
 from dotmap import DotMap
 
 
@@ -49,3 +50,72 @@ class PathTests(unittest.TestCase):
         # o1.append(o2)
         # o1.plot(ax)
         plt.show()
+
+    def test_tillerhanson(self):
+        from beziers.path.geometricshapes import Circle, Rectangle
+
+        circle = Circle(100)
+        for distance in (10, -10):
+            offset = circle.offset(Point(distance, 0), method="tillerhanson")
+            self.assertTrue(offset.closed)
+            segs = offset.asSegments()
+            for s1, s2 in zip(segs, segs[1:] + segs[:1]):
+                self.assertEqual(s1.end, s2.start)
+            for seg in segs:
+                for t in (0, 0.3, 0.5, 0.8):
+                    r = seg.pointAtTime(t).distanceFrom(Point(0, 0))
+                    self.assertAlmostEqual(r, 100 + distance, delta=0.1)
+
+        # A vector with a part along the curve still converges quickly
+        offset = circle.offset(Point(10, 10), method="tillerhanson")
+        segs = offset.asSegments()
+        self.assertLessEqual(len(segs), 32)
+        for seg in segs:
+            for t in (0, 0.3, 0.5, 0.8):
+                r = seg.pointAtTime(t).distanceFrom(Point(0, 0))
+                self.assertAlmostEqual(r, (110**2 + 10**2) ** 0.5, delta=0.1)
+
+        # Lines are offset exactly, with corners joined by lines
+        rect = Rectangle(100, 50)
+        segs = rect.offset(Point(10, 0), method="tillerhanson").asSegments()
+        self.assertEqual(len(segs), 8)
+        self.assertTrue(all(isinstance(s, Line) for s in segs))
+        self.assertEqual(segs[0].start, Point(-50, 35))
+        self.assertEqual(segs[0].end, Point(50, 35))
+
+        # Neither needs splitting at the default tolerance
+        self.assertEqual(len(offset.asSegments()), 4)
+        offset = circle.offset(Point(-20, 0), method="tillerhanson")
+        self.assertEqual(len(offset.asSegments()), 4)
+
+        # A tighter tolerance splits the curves more finely
+        loose = circle.offset(Point(30, 0), method="tillerhanson", tolerance=1)
+        tight = circle.offset(Point(30, 0), method="tillerhanson", tolerance=0.001)
+        self.assertLess(len(loose.asSegments()), len(tight.asSegments()))
+        # The result stays within the tolerance of the true offset
+        index = BVH(tight.asSegments())
+        for seg in circle.asSegments():
+            for t in range(0, 21):
+                d = seg.derivative().pointAtTime(t / 20.0)
+                shift = Point(30, 0).rotated(Point(0, 0), Point(-d.y, d.x).angle)
+                target = seg.pointAtTime(t / 20.0) + shift
+                self.assertLess(index.nearest(target)[2], 0.00101)
+
+        # Pieces which meet smoothly are merged where one curve will do
+        halves = []
+        for seg in circle.asSegments():
+            halves.extend(seg.splitAtTime(0.5))
+        split = BezierPath.fromSegments(halves)
+        self.assertEqual(
+            len(split.offset(Point(10, 0), method="tillerhanson").asSegments()), 4
+        )
+
+        # Lines are offset the same way by either method
+        for vector in (Point(10, 0), Point(10, 10)):
+            fitted = rect.offset(vector).asSegments()
+            exact = rect.offset(vector, method="tillerhanson").asSegments()
+            self.assertEqual(fitted[0].start, exact[0].start)
+            self.assertEqual(fitted[0].end, exact[0].end)
+
+        with self.assertRaises(ValueError):
+            circle.offset(Point(10, 0), method="magic")
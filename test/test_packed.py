@@ -0,0 +1,38 @@
+import unittest
+from array import array
+from beziers.path import BezierPath
+from beziers.path.representations.Nodelist import Node
+from beziers.path.representations.Packed import PackedRepresentation
+from beziers.path.geometricshapes import Circle, Rectangle
+from beziers.cubicbezier import CubicBezier
+from beziers.line import Line
+
+
+class PackedTests(unittest.TestCase):
+    def test_roundtrip(self):
+        p = Circle(50)
+        segs = [s.clone() for s in p.asSegments()]
+        coords, verbs = p.asPacked()
+        self.assertIsInstance(p.activeRepresentation, PackedRepresentation)
+        self.assertEqual(list(verbs), [4, 4, 4, 4])
+        self.assertEqual(len(coords), 2 * 13)
+        self.assertEqual(p.asSegments(), segs)
+
+    def test_frompacked(self):
+        coords = array("d", [0, 0, 10, 0, 10, 10, 5, 15, 0, 10, 0, 0])
+        verbs = array("B", [2, 2, 3, 2])
+        p = BezierPath.fromPacked(coords, verbs)
+        self.assertIs(p.asPacked()[0], coords)
+        segs = p.asSegments()
+        self.assertEqual(len(segs), 4)
+        self.assertIsInstance(segs[0], Line)
+        self.assertEqual(len(segs[2]), 3)
+        self.assertEqual(segs[3].end, segs[0].start)
+
+    def test_nodelist(self):
+        p = Rectangle(200, 100)
+        nl = p.asNodelist()
+        p2 = BezierPath.fromNodelist(nl)
+        p2.asPacked()
+        self.assertEqual([n.type for n in p2.asNodelist()], [n.type for n in nl])
+        self.assertEqual(p2.area, 200 * 100)
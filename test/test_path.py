@@ -76,7 +76,8 @@ class PathTests(unittest.TestCase):
         p.closed = True
         i = p.getSelfIntersections()
         self.assertEqual(len(i), 1)
-        self.assertAlmostEqual(i[0].point.x, 377.71521068)
+        # Bezier clipping finds the exact crossing; bisection stopped at 377.71521068
+        self.assertAlmostEqual(i[0].point.x, 377.71429843)
 
         # import matplotlib.pyplot as plt
         # fig, ax = plt.subplots()
@@ -152,3 +153,115 @@ class PathTests(unittest.TestCase):
         p.reverse()
         self.assertEqual(p.signed_area, 200 * 100)
         self.assertEqual(p.direction, 1)
+
+    def test_moments(self):
+        p = Rectangle(200, 100, origin=Point(10, 20))
+        self.assertAlmostEqual(p.centroid.x, 10)
+        self.assertAlmostEqual(p.centroid.y, 20)
+        ixx, iyy, ixy = p.secondMomentsOfArea
+        self.assertAlmostEqual(ixx / (200 * 100**3 / 12.0), 1)
+        self.assertAlmostEqual(iyy / (100 * 200**3 / 12.0), 1)
+        self.assertAlmostEqual(ixy, 0)
+        # A quarter-circle arc closed through the origin
+        q = BezierPath.fromSegments(
+            [
+                Line(Point(0, 0), Point(100, 0)),
+                CubicBezier(
+                    Point(100, 0), Point(100, 55.2), Point(55.2, 100), Point(0, 100)
+                ),
+                Line(Point(0, 100), Point(0, 0)),
+            ]
+        )
+        arc = q.asSegments()[1]
+        poly = [Point(0, 0)] + [arc.pointAtTime(t / 1000.0) for t in range(0, 1001)]
+        shoelace = sum(
+            (a.x * b.y - b.x * a.y) / 2 for a, b in zip(poly, poly[1:] + poly[:1])
+        )
+        self.assertAlmostEqual(q.signed_area, shoelace, places=1)
+        self.assertAlmostEqual(q.centroid.x, 42.443, places=3)
+        p.translate(Point(5, 0))
+        self.assertAlmostEqual(p.centroid.x, 15)
+        # Edits in place are picked up once changed() is called
+        segs = p.asSegments()
+        segs[0][1] = segs[1][0] = Point(segs[1][0].x, segs[1][0].y + 100)
+        p.changed()
+        self.assertEqual(p.area, 200 * 100 + 200 * 100 / 2)
+        self.assertGreater(p.centroid.y, 20)
+
+    def test_flattened_coords(self):
+        p = BezierPath.fromNodelist(
+            [
+                Node(0, 0, "line"),
+                Node(100, 0, "line"),
+                Node(100, 55, "offcurve"),
+                Node(55, 100, "offcurve"),
+                Node(0, 100, "curve"),
+            ]
+        )
+        coords, owners, ts = p.flattenedCoords(0.1)
+        segs = p.asSegments()
+        self.assertEqual(len(coords), 2 * len(owners))
+        self.assertEqual(len(ts), len(owners))
+        for i in range(0, len(owners)):
+            pt = segs[owners[i]].pointAtTime(ts[i])
+            self.assertAlmostEqual(pt.x, coords[2 * i])
+            self.assertAlmostEqual(pt.y, coords[2 * i + 1])
+        self.assertEqual(list(owners).count(0), 2)
+        flat = p.flatten(tolerance=0.1)
+        self.assertEqual(len(flat.asSegments()), len(owners) - 1)
+
+    def test_length_index(self):
+        p = Rectangle(200, 100)
+        self.assertEqual(p.length, 600)
+        self.assertAlmostEqual(p.lengthAtTime(0.5), 300)
+        self.assertAlmostEqual(p.lengthAtTime(1.0), 600)
+        self.assertAlmostEqual(p.timeAtLength(250), 0.375)
+        self.assertEqual(p.pointAtLength(250), Point(100, 0))
+        self.assertEqual(p.pointAtLength(600), p.asSegments()[-1].end)
+        p.scale(2)
+        self.assertEqual(p.length, 1200)
+        self.assertEqual(p.pointAtLength(500), Point(200, 0))
+        # Edits in place are picked up once changed() is called
+        p = Rectangle(200, 100)
+        self.assertEqual(p.length, 600)
+        segs = p.asSegments()
+        segs[0][1] = segs[1][0] = Point(100, 200)
+        p.changed()
+        self.assertEqual(p.length, 800)
+        self.assertEqual(p.pointAtLength(0), segs[0][0])
+
+    def test_conversion_cache(self):
+        p = Rectangle(200, 100)
+        segs = p.asSegments()
+        nl = p.asNodelist()
+        hits = BezierPath.conversionStats["hits"]
+        misses = BezierPath.conversionStats["misses"]
+        for _ in range(3):
+            self.assertIs(p.asSegments(), segs)
+            self.assertIs(p.asNodelist(), nl)
+        self.assertEqual(BezierPath.conversionStats["hits"], hits + 6)
+        self.assertEqual(BezierPath.conversionStats["misses"], misses)
+        p.translate(Point(10, 10))
+        self.assertIsNot(p.asNodelist(), nl)
+        self.assertEqual(p.asNodelist()[0].x, segs[0][0].x + 10)
+        self.assertEqual(BezierPath.conversionStats["misses"], misses + 1)
+
+    def test_conversion_cache_edits(self):
+        q = BezierPath.fromSegments(
+            [
+                CubicBezier(Point(0, 0), Point(100, 50), Point(100, 50), Point(200, 0)),
+                CubicBezier(Point(200, 0), Point(100, 50), Point(50, 50), Point(0, 0)),
+            ]
+        )
+        q.asNodelist()
+        s = q.asSegments()
+        s[0][1] = s[1][1] = Point(100, 80)
+        self.assertEqual(q.asNodelist()[1].point, Point(100, 80))
+        s = q.asSegments()
+        s[0][2].x = 120
+        self.assertEqual(q.asPacked()[0][4], 120)
+        self.assertEqual(q.asNodelist()[2].point, Point(120, 50))
+        # The packed form was cached before the edit to the node list
+        q.asNodelist()[1].point = Point(90, 90)
+        self.assertEqual(q.asSegments()[0][1], Point(90, 90))
+        self.assertEqual(q.asPacked()[0][2:4].tolist(), [90, 90])
@@ -0,0 +1,59 @@
+import io
+import os
+import tempfile
+import unittest
+from beziers.pathfile import dump, dumps, load, loads, PathFile
+from beziers.path import BezierPath
+from beziers.path.geometricshapes import Circle, Rectangle
+from beziers.line import Line
+from beziers.point import Point
+
+
+class PathFileTests(unittest.TestCase):
+    def setUp(self):
+        self.paths = [Circle(10 + i, origin=Point(i, 0)) for i in range(5)]
+        self.paths.append(Rectangle(200, 100))
+        self.paths.append(BezierPath.fromSegments([Line(Point(0, 0), Point(0.1, 0.3))]))
+        self.paths[-1].closed = False
+
+    def assertSamePaths(self, paths, places=7):
+        self.assertEqual(len(paths), len(self.paths))
+        for a, b in zip(paths, self.paths):
+            self.assertEqual(a.closed, b.closed)
+            self.assertEqual(list(a.asPacked()[1]), list(b.asPacked()[1]))
+            for x, y in zip(a.asPacked()[0], b.asPacked()[0]):
+                self.assertAlmostEqual(x, y, places=places)
+
+    def test_roundtrip(self):
+        f = io.BytesIO()
+        dump(self.paths, f)
+        f.seek(0)
+        self.assertSamePaths(load(f))
+        self.assertSamePaths(loads(dumps(self.paths, precision="single")), 5)
+        self.assertLess(
+            len(dumps(self.paths, precision="single")), len(dumps(self.paths))
+        )
+        self.assertEqual(loads(dumps([])), [])
+        with self.assertRaises(ValueError):
+            loads(b"not a path file at all, no no no")
+
+    def test_mmap(self):
+        fd, filename = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                dump(self.paths, f)
+            with PathFile(filename) as pf:
+                self.assertEqual(len(pf), len(self.paths))
+                self.assertEqual(pf[5].length, 600)
+                self.assertAlmostEqual(pf[-1].length, self.paths[-1].length)
+                self.assertFalse(pf[-1].closed)
+                self.assertSamePaths(list(pf))
+                with self.assertRaises(IndexError):
+                    pf[len(self.paths)]
+                kept = pf[0]
+            # The file can be closed while paths read from it are still
+            # alive, and they can no longer be read
+            with self.assertRaises(ValueError):
+                kept.asPacked()[0][0]
+        finally:
+            os.remove(filename)
@@ -0,0 +1,39 @@
+import unittest
+import beziers.utils
+from beziers.cubicbezier import CubicBezier
+from beziers.quadraticbezier import QuadraticBezier
+from beziers.line import Line
+from beziers.point import Point
+from beziers.path.geometricshapes import Circle
+
+
+class PointsAtTimesTests(unittest.TestCase):
+    segs = [
+        Line(Point(0, 10), Point(20, 20.4)),
+        QuadraticBezier(Point(150, 40), Point(80, 30), Point(105, 150)),
+        CubicBezier(Point(100, 25), Point(10, 90), Point(110, 100), Point(132, 192)),
+    ]
+    ts = [0, 0.1, 0.25, 0.5, 0.9, 1.0]
+
+    def check(self):
+        for seg in self.segs:
+            coords = seg.pointsAtTimes(self.ts)
+            self.assertEqual(len(coords), len(self.ts))
+            for t, (x, y) in zip(self.ts, coords):
+                self.assertEqual(seg.pointAtTime(t), Point(x, y))
+        path = Circle(50)
+        coords = path.pointsAtTimes(self.ts)
+        for t, (x, y) in zip(self.ts, coords):
+            self.assertEqual(path.pointAtTime(t), Point(x, y))
+
+    def test_pointsAtTimes(self):
+        self.check()
+
+    def test_pointsAtTimes_pure_python(self):
+        saved = beziers.utils._numpy
+        beziers.utils._numpy = None
+        try:
+            self.assertIsInstance(self.segs[2].pointsAtTimes(self.ts), list)
+            self.check()
+        finally:
+            beziers.utils._numpy = saved
@@ -0,0 +1,48 @@
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from beziers.sharedpaths import SharedPaths
+from beziers.path.geometricshapes import Circle, Rectangle
+from beziers.point import Point
+
+
+def _length(shared, i):
+    return shared[i].length
+
+
+class SharedPathsTests(unittest.TestCase):
+    def setUp(self):
+        self.paths = [Circle(10 + i, origin=Point(i, 0)) for i in range(5)]
+        self.paths.append(Rectangle(200, 100))
+
+    def test_views(self):
+        with SharedPaths.create(self.paths) as shared:
+            self.assertEqual(len(shared), 6)
+            self.assertEqual(shared[-1].length, 600)
+            self.assertEqual(str(shared[2].bounds()), str(self.paths[2].bounds()))
+            coords, verbs = shared[0].asPacked()
+            with self.assertRaises(TypeError):
+                coords[0] = 0
+            path = shared[1]
+            path.translate(Point(10, 0))
+            self.assertAlmostEqual(path.bounds().left, self.paths[1].bounds().left + 10)
+            self.assertEqual(str(shared[1].bounds()), str(self.paths[1].bounds()))
+            kept = shared[3]
+            del coords, verbs, path
+        # The block can be closed while paths taken from it are still
+        # alive, and they can no longer be read
+        with self.assertRaises(ValueError):
+            kept.asPacked()[0][0]
+
+    def test_pickle(self):
+        with SharedPaths.create(self.paths) as shared:
+            data = pickle.dumps(shared)
+            self.assertLess(len(data), 200)
+            self.assertIs(pickle.loads(data), shared)
+
+    def test_workers(self):
+        with SharedPaths.create(self.paths) as shared:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                lengths = list(executor.map(_length, [shared] * 6, range(6)))
+            for path, length in zip(self.paths, lengths):
+                self.assertAlmostEqual(path.length, length)